@@ -0,0 +1,68 @@
+"""
+Startup-time benchmark based on `python -X importtime`.
+
+Imports server.py in fresh interpreters and reports the median cumulative
+import time of the server, the share spent in this package, and the slowest
+modules. Usage: python benchmarks/startup_importtime.py [--runs N] [--top N]
+"""
+from __future__ import annotations
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+OWN_PREFIXES = ("server", "mcp_db_analyzer")
+
+
+def run_importtime(code: str = "import server") -> List[Tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) for every import in a fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries: List[Tuple[str, int, int]] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def is_own_module(name: str) -> bool:
+    return any(name == prefix or name.startswith(prefix + ".") for prefix in OWN_PREFIXES)
+
+
+def summarize(entries: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    cumulative = {name: cum for name, _, cum in entries}
+    return {
+        "server_cumulative_us": cumulative.get("server", 0),
+        "own_self_us": sum(self_us for name, self_us, _ in entries if is_own_module(name)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [run_importtime() for _ in range(max(1, args.runs))]
+    summaries = [summarize(entries) for entries in runs]
+    for key in ("server_cumulative_us", "own_self_us"):
+        median_ms = statistics.median(s[key] for s in summaries) / 1000
+        print(f"{key[:-3]}: {median_ms:.1f} ms (median of {len(runs)})")
+
+    print("\nslowest modules by self time (last run):")
+    for name, self_us, _ in sorted(runs[-1], key=lambda e: e[1], reverse=True)[: args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,124 @@
 from __future__ import annotations
+import argparse
 from pathlib import Path
 import sys
+from typing import List, Optional
 SRC_ROOT = Path(__file__).resolve().parent / "src"
 # Allow running `python server.py` from repo root without PYTHONPATH.
 if str(SRC_ROOT) not in sys.path:
     sys.path.insert(0, str(SRC_ROOT))
 
 from mcp.server.fastmcp import FastMCP
+from mcp.server.transport_security import TransportSecuritySettings
+from mcp_db_analyzer.cache import SERVER_SNAPSHOT_TTL_S, SNAPSHOTS
 from mcp_db_analyzer.prompts.schema_prompts import register_prompts
 from mcp_db_analyzer.resources.schema_resources import register_resources
+from mcp_db_analyzer.resources.snapshot_resources import register_snapshot_resources
+from mcp_db_analyzer.scheduling import DEFAULT_WORKERS, SCHEDULER
 from mcp_db_analyzer.tools import register_tools
+from mcp_db_analyzer.watcher import WATCHER
 
 mcp = FastMCP("mcp-db-analyzer")
 register_prompts(mcp)
 register_resources(mcp)
+register_snapshot_resources(mcp)
 register_tools(mcp)
 
 
-def main() -> None:
-    mcp.run()
+_LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+_WILDCARD_HOSTS = ("0.0.0.0", "::", "")
+
+
+def transport_security(
+    host: str, allowed_hosts: Optional[List[str]] = None, disable_host_check: bool = False
+) -> TransportSecuritySettings:
+    """
+    DNS-rebinding protection for HTTP transports: only Host/Origin headers naming
+    loopback, the bound --host or an --allowed-host are accepted. A wildcard bind
+    (0.0.0.0, ::) does not name the server, so remote names must be listed.
+    """
+    if disable_host_check:
+        return TransportSecuritySettings(enable_dns_rebinding_protection=False)
+    names = list(_LOOPBACK_HOSTS)
+    if host not in _WILDCARD_HOSTS:
+        names.append(host)
+    names.extend(allowed_hosts or [])
+    hosts: List[str] = []
+    for name in dict.fromkeys(names):
+        name = f"[{name}]" if ":" in name and not name.startswith("[") else name
+        hosts.extend((name, f"{name}:*"))
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=hosts,
+        allowed_origins=[f"{scheme}://{h}" for h in hosts for scheme in ("http", "https")],
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="MCP database schema analyzer")
+    parser.add_argument(
+        "--transport",
+        choices=("stdio", "streamable-http", "sse"),
+        default="stdio",
+        help="stdio (default, one client) or streamable-http to serve many agents from one process",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="HTTP port (default 8000)")
+    parser.add_argument(
+        "--allowed-host",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="extra Host header name clients may use (repeatable); loopback and --host are always allowed",
+    )
+    parser.add_argument(
+        "--disable-host-check",
+        action="store_true",
+        help="accept any Host/Origin header; exposes the server to DNS rebinding (see docs/SECURITY.md)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"tool calls run concurrently across all clients (default {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--per-client-limit",
+        type=int,
+        default=None,
+        help="concurrent tool calls a single client may hold (default: half of --workers)",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=None,
+        help="seconds between catalog fingerprint probes that keep cached schemas warm "
+        "(default: MCP_DB_ANALYZER_WATCH_INTERVAL_S, off when unset)",
+    )
+    parser.add_argument(
+        "--watch-jitter",
+        type=float,
+        default=None,
+        help="random extra delay added to each poll (default: a tenth of the interval)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    SCHEDULER.configure(args.workers, args.per_client_limit)
+    if args.transport != "stdio":
+        mcp.settings.host = args.host
+        mcp.settings.port = args.port
+        # FastMCP pins allowed Host headers to localhost at construction.
+        mcp.settings.transport_security = transport_security(
+            args.host, args.allowed_host, args.disable_host_check
+        )
+    watching = WATCHER.start(args.watch_interval, args.watch_jitter)
+    if args.transport != "stdio" or watching:
+        # Shared or watched servers reuse snapshots; plain stdio always reflects fresh.
+        SNAPSHOTS.configure(SERVER_SNAPSHOT_TTL_S)
+    mcp.run(transport=args.transport)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,289 @@
+"""Process-wide cache of collected schema snapshots, shared by all clients."""
+from __future__ import annotations
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from mcp_db_analyzer.formats import project_fields
+
+SNAPSHOT_TTL_ENV = "MCP_DB_ANALYZER_SNAPSHOT_TTL_S"
+MAX_SNAPSHOTS_ENV = "MCP_DB_ANALYZER_MAX_SNAPSHOTS"
+# stdio serves one client that may be running DDL, so snapshots are not
+# reused unless the server runs over HTTP (see server.py) or the env var is set.
+DEFAULT_SNAPSHOT_TTL_S = 0.0
+SERVER_SNAPSHOT_TTL_S = 30.0
+DEFAULT_MAX_SNAPSHOTS = 256
+
+SnapshotKey = Tuple[Any, ...]
+
+logger = logging.getLogger(__name__)
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def snapshot_key(
+    connection_url: str,
+    schema: Optional[str],
+    include_tables: Optional[List[str]],
+    exclude_tables: Optional[List[str]],
+    include_stats: bool,
+) -> SnapshotKey:
+    return (
+        connection_url,
+        schema,
+        tuple(sorted(include_tables)) if include_tables else None,
+        tuple(sorted(exclude_tables)) if exclude_tables else None,
+        bool(include_stats),
+    )
+
+
+@dataclass
+class Snapshot:
+    fields: FrozenSet[str]
+    result: Dict[str, Any]
+    created_at: float = field(default_factory=time.monotonic)
+    # Catalog fingerprint probed just before reflecting (see watcher.py).
+    fingerprint: Optional[Any] = None
+    # Values computed from this snapshot (diagrams, insights), built on first use.
+    derived: Dict[str, Any] = field(default_factory=dict)
+
+    def derive(self, name: str, build: Callable[[Dict[str, Any]], Any]) -> Any:
+        if name not in self.derived:
+            self.derived[name] = build(self.result)
+        return self.derived[name]
+
+
+class SnapshotCache:
+    """
+    LRU + TTL cache of complete collect_schema results. A snapshot reflected with
+    more fields serves narrower requests by projection. Concurrent misses for
+    the same key are collapsed into one reflection (single flight). With a TTL
+    of 0 results are still stored, as the latest reflection that snapshot
+    resources read, but never reused for tool calls.
+    """
+
+    def __init__(self, ttl_s: Optional[float] = None, max_entries: Optional[int] = None) -> None:
+        self._ttl_s = ttl_s
+        self._default_ttl_s = DEFAULT_SNAPSHOT_TTL_S
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[SnapshotKey, Snapshot]" = OrderedDict()
+        self._inflight: Dict[SnapshotKey, Tuple[FrozenSet[str], threading.Event]] = {}
+        self._lock = threading.Lock()
+        # Set by the schema watcher: key -> catalog fingerprint, probed before reflecting.
+        self.fingerprinter: Optional[Callable[[SnapshotKey], Any]] = None
+        self._listeners: List[Callable[[SnapshotKey, Snapshot], None]] = []
+
+    def configure(self, default_ttl_s: float) -> None:
+        """Set the TTL used when neither ttl_s nor MCP_DB_ANALYZER_SNAPSHOT_TTL_S is given."""
+        self._default_ttl_s = default_ttl_s
+
+    @property
+    def ttl_s(self) -> float:
+        return self._ttl_s if self._ttl_s is not None else _env_number(SNAPSHOT_TTL_ENV, self._default_ttl_s)
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return self._max_entries
+        return max(1, int(_env_number(MAX_SNAPSHOTS_ENV, DEFAULT_MAX_SNAPSHOTS)))
+
+    def _fresh(self, key: SnapshotKey, fields: FrozenSet[str]) -> Optional[Snapshot]:
+        snapshot = self._entries.get(key)
+        if snapshot is None or self.ttl_s <= 0:
+            return None
+        if time.monotonic() - snapshot.created_at > self.ttl_s:
+            del self._entries[key]
+            return None
+        if not fields <= snapshot.fields:
+            return None
+        self._entries.move_to_end(key)
+        return snapshot
+
+    def _serve(self, snapshot: Snapshot, fields: FrozenSet[str]) -> Dict[str, Any]:
+        # Callers add top-level keys (insights, schema); hand out a copy.
+        if fields == snapshot.fields:
+            return dict(snapshot.result)
+        return project_fields(snapshot.result, fields)
+
+    def get_or_collect(
+        self,
+        key: SnapshotKey,
+        fields: FrozenSet[str],
+        collect: Callable[[], Dict[str, Any]],
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Return (result, served_from_cache). Errors and partial results are not stored."""
+        if self.ttl_s <= 0:
+            # Nothing is reused, so there is nothing to wait for; keep the result for resources.
+            return self._collect_and_store(key, fields, collect), False
+
+        while True:
+            with self._lock:
+                snapshot = self._fresh(key, fields)
+                if snapshot is not None:
+                    return self._serve(snapshot, fields), True
+                inflight = self._inflight.get(key)
+                if inflight is None or not fields <= inflight[0]:
+                    done = threading.Event()
+                    self._inflight[key] = (fields, done)
+                    break
+            # Someone is already reflecting a superset; wait and re-check.
+            inflight[1].wait()
+
+        try:
+            return self._collect_and_store(key, fields, collect), False
+        finally:
+            with self._lock:
+                if self._inflight.get(key, (None, None))[1] is done:
+                    del self._inflight[key]
+            done.set()
+
+    def _collect_and_store(
+        self,
+        key: SnapshotKey,
+        fields: FrozenSet[str],
+        collect: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        fingerprinter = self.fingerprinter
+        fingerprint = fingerprinter(key) if fingerprinter is not None else None
+        result = collect()
+        if result.get("error") or result.get("partial"):
+            return result
+        snapshot = Snapshot(fields=fields, result=result, fingerprint=fingerprint)
+        with self._lock:
+            self._entries[key] = snapshot
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._notify(key, snapshot)
+        return dict(result)
+
+    def add_listener(self, listener: Callable[[SnapshotKey, Snapshot], None]) -> None:
+        """Call listener(key, snapshot) on the storing thread whenever a snapshot is stored."""
+        self._listeners.append(listener)
+
+    def _notify(self, key: SnapshotKey, snapshot: Snapshot) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(key, snapshot)
+            except Exception:
+                logger.exception("Snapshot listener failed")
+
+    def lookup(self, key: SnapshotKey, fields: FrozenSet[str]) -> Optional[Snapshot]:
+        """The fresh snapshot for key covering fields, or None. Never reflects."""
+        with self._lock:
+            return self._fresh(key, fields)
+
+    def is_fresh(self, snapshot: Snapshot) -> bool:
+        return time.monotonic() - snapshot.created_at <= self.ttl_s
+
+    def is_readable(self, snapshot: Snapshot) -> bool:
+        """Whether resources may serve snapshot: fresh, or the latest reflection when reuse is off."""
+        return self.ttl_s <= 0 or self.is_fresh(snapshot)
+
+    def snapshots(self) -> List[Tuple[SnapshotKey, Snapshot]]:
+        with self._lock:
+            return list(self._entries.items())
+
+    def touch(self, key: SnapshotKey, snapshot: Snapshot) -> bool:
+        """Restart the TTL of a snapshot confirmed current; False if it was replaced or evicted."""
+        with self._lock:
+            if self._entries.get(key) is not snapshot:
+                return False
+            snapshot.created_at = time.monotonic()
+            return True
+
+    def discard(self, key: SnapshotKey, snapshot: Snapshot) -> bool:
+        """Drop a snapshot known to be stale, unless it was already replaced."""
+        with self._lock:
+            if self._entries.get(key) is not snapshot:
+                return False
+            del self._entries[key]
+            return True
+
+    def invalidate(self, connection_url: Optional[str] = None) -> int:
+        """Drop snapshots for one connection URL (or all). Returns how many were dropped."""
+        with self._lock:
+            keys = [k for k in self._entries if connection_url is None or k[0] == connection_url]
+            for k in keys:
+                del self._entries[k]
+            return len(keys)
+
+
+SNAPSHOTS = SnapshotCache()
+
+
+def cached_collect_schema(
+    connection_url: str,
+    schema: Optional[str] = None,
+    include_tables: Optional[List[str]] = None,
+    exclude_tables: Optional[List[str]] = None,
+    include_stats: bool = False,
+    timeout_s: Optional[float] = None,
+    fields: Optional[FrozenSet[str]] = None,
+    cache: Optional[SnapshotCache] = None,
+) -> Dict[str, Any]:
+    """collect_schema served from the shared snapshot cache (or cache) when possible."""
+    from mcp_db_analyzer.db import ALL_SCHEMA_FIELDS, collect_schema
+
+    requested = ALL_SCHEMA_FIELDS if fields is None else fields
+    key = snapshot_key(connection_url, schema, include_tables, exclude_tables, include_stats)
+    result, _ = (cache or SNAPSHOTS).get_or_collect(
+        key,
+        requested,
+        lambda: collect_schema(
+            connection_url=connection_url,
+            schema=schema,
+            include_tables=include_tables,
+            exclude_tables=exclude_tables,
+            include_stats=include_stats,
+            timeout_s=timeout_s,
+            fields=requested,
+        ),
+    )
+    return result
+
+
+def cached_derive(
+    name: str,
+    build: Callable[[Dict[str, Any]], Any],
+    connection_url: str,
+    schema: Optional[str] = None,
+    include_tables: Optional[List[str]] = None,
+    exclude_tables: Optional[List[str]] = None,
+    timeout_s: Optional[float] = None,
+    fields: Optional[FrozenSet[str]] = None,
+    cache: Optional[SnapshotCache] = None,
+) -> Tuple[Dict[str, Any], Any]:
+    """
+    cached_collect_schema plus build(result), computed once per stored snapshot
+    and kept with it (rebuilt every call when the result could not be cached).
+    The derived value is None when reflection failed.
+    """
+    from mcp_db_analyzer.db import ALL_SCHEMA_FIELDS
+
+    store = cache or SNAPSHOTS
+    requested = ALL_SCHEMA_FIELDS if fields is None else fields
+    result = cached_collect_schema(
+        connection_url=connection_url,
+        schema=schema,
+        include_tables=include_tables,
+        exclude_tables=exclude_tables,
+        timeout_s=timeout_s,
+        fields=requested,
+        cache=store,
+    )
+    if result.get("error"):
+        return result, None
+    snapshot = store.lookup(snapshot_key(connection_url, schema, include_tables, exclude_tables, False), requested)
+    if snapshot is None:
+        return result, build(result)
+    return result, snapshot.derive(name, build)
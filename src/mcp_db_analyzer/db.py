@@ -1,16 +1,89 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
 from sqlalchemy import create_engine, inspect, text
-from sqlalchemy.engine import Engine
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.engine import Connection, Dialect, Engine, make_url
+from sqlalchemy.exc import ArgumentError, SQLAlchemyError
+from mcp_db_analyzer.deadline import Deadline, deadline_guard
+
+
+MAX_ENGINES_ENV = "MCP_DB_ANALYZER_MAX_ENGINES"
+DEFAULT_MAX_ENGINES = 32
+
+_engines: "OrderedDict[str, Engine]" = OrderedDict()
+_engines_lock = threading.Lock()
 
 
 def open_engine(connection_url: str) -> Engine:
-    return create_engine(connection_url)
+    # Engines are long-lived and shared, so validate pooled connections on checkout.
+    return create_engine(connection_url, pool_pre_ping=True)
+
+
+def database_id(connection_url: str) -> str:
+    """
+    Stable, credential-free identifier for a connection URL. The password is
+    masked before hashing, so the id cannot be used to test password guesses.
+    """
+    return hashlib.sha256(redact_connection_url(connection_url).encode("utf-8")).hexdigest()[:16]
+
 
+def get_shared_engine(connection_url: str) -> Engine:
+    """
+    Return the process-wide engine for connection_url, creating it on first use.
+    Connection pools are shared by every tool call and client; the least recently
+    used engine is disposed once more than MCP_DB_ANALYZER_MAX_ENGINES are open.
+    """
+    with _engines_lock:
+        engine = _engines.get(connection_url)
+        if engine is not None:
+            _engines.move_to_end(connection_url)
+            return engine
+
+    engine = open_engine(connection_url)
+    try:
+        max_engines = max(1, int(os.environ.get(MAX_ENGINES_ENV, DEFAULT_MAX_ENGINES)))
+    except ValueError:
+        max_engines = DEFAULT_MAX_ENGINES
+
+    evicted: List[Engine] = []
+    with _engines_lock:
+        existing = _engines.get(connection_url)
+        if existing is not None:
+            # Another thread won the race; keep its engine.
+            evicted.append(engine)
+            engine = existing
+        else:
+            _engines[connection_url] = engine
+            while len(_engines) > max_engines:
+                evicted.append(_engines.popitem(last=False)[1])
+    for stale in evicted:
+        stale.dispose()
+    return engine
+
+
+def dispose_shared_engines() -> None:
+    with _engines_lock:
+        engines = list(_engines.values())
+        _engines.clear()
+    for engine in engines:
+        engine.dispose()
+
+
+def redact_connection_url(connection_url: str) -> str:
+    """Render a connection URL with its password masked, safe for logs and files."""
+    try:
+        return make_url(connection_url).render_as_string(hide_password=True)
+    except (ArgumentError, ValueError):
+        return "<unparseable connection url>"
 
-def get_schema_inspector(engine: Engine):
-    return inspect(engine)
+
+def get_schema_inspector(bind: Union[Engine, Connection]):
+    return inspect(bind)
 
 
 def split_schema_and_table(name: str) -> Tuple[Optional[str], str]:
@@ -45,12 +118,13 @@ def _normalize_filter_names(names: Optional[List[str]]) -> Tuple[set[str], set[s
     return bare, qualified
 
 
-def _filter_tables(
+def filter_tables(
     tables: List[str],
     schema: Optional[str],
     include_tables: Optional[List[str]],
     exclude_tables: Optional[List[str]],
 ) -> List[str]:
+    """Tables of schema kept by the include/exclude filters (bare or schema-qualified names)."""
     if not include_tables and not exclude_tables:
         return tables
 
@@ -70,17 +144,27 @@ def _filter_tables(
     return filtered
 
 
-def _count_rows(engine: Engine, schema: Optional[str], table: str) -> Optional[int]:
+def quote_table_name(dialect: Dialect, schema: Optional[str], table: str) -> str:
+    """Schema-qualified table name quoted for dialect, safe to splice into SQL."""
+    preparer = dialect.identifier_preparer
+    quoted_table = preparer.quote(table)
+    return f"{preparer.quote(schema)}.{quoted_table}" if schema else quoted_table
+
+
+def _count_rows(
+    engine: Engine,
+    schema: Optional[str],
+    table: str,
+    deadline: Optional[Deadline] = None,
+) -> Optional[int]:
     """
     Exact row counts can be expensive on large tables (Postgres/MySQL).
     This is optional and guarded by _should_count_rows.
     """
-    preparer = engine.dialect.identifier_preparer
-    quoted_table = preparer.quote(table)
-    qualified = f"{preparer.quote(schema)}.{quoted_table}" if schema else quoted_table
+    qualified = quote_table_name(engine.dialect, schema, table)
 
     try:
-        with engine.connect() as conn:
+        with engine.connect() as conn, deadline_guard(conn, deadline or Deadline()):
             result = conn.execute(text(f"SELECT COUNT(*) AS count FROM {qualified}"))
             return int(result.scalar() or 0)
     except SQLAlchemyError:
@@ -101,26 +185,217 @@ def _should_count_rows(
     return bool(schema or include_tables)
 
 
+# Parts of a table entry that can be projected away (and then are not reflected).
+ALL_SCHEMA_FIELDS: FrozenSet[str] = frozenset(
+    ("columns", "defaults", "primary_key", "foreign_keys", "indexes", "unique_constraints")
+)
+
+# Opt-in parts: only reflected when named in fields.
+OPTIONAL_SCHEMA_FIELDS: FrozenSet[str] = frozenset(("storage",))
+
+
+def normalize_fields(fields: Optional[List[str]]) -> FrozenSet[str]:
+    """
+    Validate a fields projection; None means every default part (opt-in parts
+    such as "storage" must be named). "defaults" only has an effect together
+    with "columns". Raises ValueError on unknown names.
+    """
+    if fields is None:
+        return ALL_SCHEMA_FIELDS
+    requested = frozenset(f.strip().lower() for f in fields if f and f.strip())
+    known = ALL_SCHEMA_FIELDS | OPTIONAL_SCHEMA_FIELDS
+    unknown = requested - known
+    if unknown:
+        raise ValueError(f"Unknown fields: {sorted(unknown)}. Choose from {sorted(known)}.")
+    return requested
+
+
+_SYSTEM_SCHEMAS = {"information_schema", "pg_catalog", "pg_toast", "mysql", "performance_schema", "sys"}
+MAX_SCHEMA_WORKERS = 8
+
+
+def _is_system_schema(name: str) -> bool:
+    lowered = name.lower()
+    return lowered in _SYSTEM_SCHEMAS or lowered.startswith(("pg_temp_", "pg_toast_temp_"))
+
+
+def _resolve_referred_table(
+    fk: Dict[str, Any],
+    schema: Optional[str],
+    fallback_schema: Optional[str],
+) -> Tuple[Optional[str], str]:
+    referred_schema = fk.get("referred_schema")
+    referred_table = fk.get("referred_table") or ""
+    split_schema, split_table = split_schema_and_table(referred_table)
+    if split_table:
+        referred_table = split_table
+        if split_schema:
+            referred_schema = split_schema
+        elif schema and not referred_schema:
+            referred_schema = fallback_schema
+    elif schema and not referred_schema:
+        referred_schema = fallback_schema
+    return referred_schema, referred_table
+
+
+def _reflect_schema(
+    engine: Engine,
+    inspector: Any,
+    schema: Optional[str],
+    include_tables: Optional[List[str]],
+    exclude_tables: Optional[List[str]],
+    count_rows: bool,
+    fk_fallback_schema: Optional[str],
+    deadline: Deadline,
+    fields: FrozenSet[str] = ALL_SCHEMA_FIELDS,
+) -> Dict[str, Any]:
+    """
+    Reflect one schema. Foreign keys are returned unfiltered as
+    (referred_schema, referred_table, fk) so callers decide which targets are in scope.
+    Once the deadline passes, the remaining tables are returned as skipped_tables.
+    Parts not listed in fields are neither reflected nor returned.
+    """
+    tables: List[str] = inspector.get_table_names(schema=schema)
+    views: List[str] = inspector.get_view_names(schema=schema)
+
+    tables = filter_tables(tables, schema, include_tables, exclude_tables)
+    views = filter_tables(views, schema, include_tables, exclude_tables)
+
+    table_details: List[Dict[str, Any]] = []
+    fk_candidates: List[Tuple[Optional[str], str, Dict[str, Any]]] = []
+    skipped_tables: List[str] = []
+    with_defaults = "defaults" in fields
+    storage: Dict[str, Any] = {}
+    if "storage" in fields and tables:
+        from mcp_db_analyzer.storage import table_storage
+
+        storage, _ = table_storage(inspector.bind, schema)
+
+    for position, table in enumerate(tables):
+        if deadline.expired():
+            skipped_tables = [format_table_name(schema, t) for t in tables[position:]]
+            break
+        try:
+            columns = inspector.get_columns(table, schema=schema) if "columns" in fields else None
+            pk = inspector.get_pk_constraint(table, schema=schema) if "primary_key" in fields else None
+            fks = inspector.get_foreign_keys(table, schema=schema) if "foreign_keys" in fields else None
+            indexes = inspector.get_indexes(table, schema=schema) if "indexes" in fields else None
+            uniques = (
+                inspector.get_unique_constraints(table, schema=schema)
+                if "unique_constraints" in fields
+                else None
+            )
+        except SQLAlchemyError:
+            # A statement cancelled by the deadline watchdog surfaces as a DB error.
+            if not deadline.expired():
+                raise
+            skipped_tables = [format_table_name(schema, t) for t in tables[position:]]
+            break
+
+        entry: Dict[str, Any] = {"table": format_table_name(schema, table)}
+        if "columns" in fields:
+            entry["columns"] = [
+                {
+                    "name": col.get("name"),
+                    "type": str(col.get("type")),
+                    "nullable": bool(col.get("nullable")),
+                    **({"default": col.get("default")} if with_defaults else {}),
+                }
+                for col in (columns or [])
+            ]
+        if "primary_key" in fields:
+            entry["primary_key"] = (pk or {}).get("constrained_columns", []) or []
+        if "indexes" in fields:
+            entry["indexes"] = [
+                {
+                    "name": idx.get("name"),
+                    "columns": idx.get("column_names", []) or [],
+                    "unique": bool(idx.get("unique")),
+                }
+                for idx in (indexes or [])
+            ]
+        if "unique_constraints" in fields:
+            entry["unique_constraints"] = [
+                {
+                    "name": uc.get("name"),
+                    "columns": uc.get("column_names", []) or [],
+                }
+                for uc in (uniques or [])
+            ]
+        if "storage" in fields:
+            entry["storage"] = storage.get(table)
+        entry["row_count"] = (
+            _count_rows(engine, schema, table, deadline)
+            if count_rows and not deadline.expired()
+            else None
+        )
+        table_details.append(entry)
+
+        for fk in (fks or []):
+            referred_schema, referred_table = _resolve_referred_table(fk, schema, fk_fallback_schema)
+            fk_candidates.append(
+                (
+                    referred_schema,
+                    referred_table,
+                    {
+                        "table": format_table_name(schema, table),
+                        "constrained_columns": fk.get("constrained_columns", []) or [],
+                        "referred_table": format_table_name(referred_schema, referred_table),
+                        "referred_columns": fk.get("referred_columns", []) or [],
+                    },
+                )
+            )
+
+    return {
+        "table_names": tables,
+        "tables": table_details,
+        "fk_candidates": fk_candidates,
+        "views": views,
+        "skipped_tables": skipped_tables,
+    }
+
+
+def _deadline_warning(deadline: Deadline) -> str:
+    return f"Deadline of {deadline.timeout_s:g}s reached; result is partial."
+
+
+def _filter_foreign_keys(
+    fk_candidates: List[Tuple[Optional[str], str, Dict[str, Any]]],
+    allowed_tables_qualified: set[str],
+    allowed_tables_bare: set[str],
+) -> List[Dict[str, Any]]:
+    fk_details: List[Dict[str, Any]] = []
+    for referred_schema, referred_table, fk in fk_candidates:
+        if referred_table:
+            normalized_referred = _normalize_table_name(referred_schema, referred_table)
+            if (
+                normalized_referred not in allowed_tables_qualified
+                and referred_table.lower() not in allowed_tables_bare
+            ):
+                continue
+        fk_details.append(fk)
+    return fk_details
+
+
 def collect_schema(
     connection_url: str,
     schema: Optional[str] = None,
     include_tables: Optional[List[str]] = None,
     exclude_tables: Optional[List[str]] = None,
     include_stats: bool = False,
+    timeout_s: Optional[float] = None,
+    fields: FrozenSet[str] = ALL_SCHEMA_FIELDS,
 ) -> Dict[str, Any]:
+    """
+    Reflect one schema. With timeout_s, statements are bounded by driver timeouts
+    and cancelled at the deadline; tables not reached are listed in skipped_tables
+    and the result is marked partial instead of failing. fields (see
+    normalize_fields) limits which parts of each table are reflected.
+    """
     engine: Optional[Engine] = None
+    deadline = Deadline(timeout_s)
     try:
-        engine = open_engine(connection_url)
-        inspector = get_schema_inspector(engine)
-
-        tables: List[str] = inspector.get_table_names(schema=schema)
-        views: List[str] = inspector.get_view_names(schema=schema)
-
-        tables = _filter_tables(tables, schema, include_tables, exclude_tables)
-        views = _filter_tables(views, schema, include_tables, exclude_tables)
-
-        allowed_tables_qualified = {_normalize_table_name(schema, table) for table in tables}
-        allowed_tables_bare = {table.lower() for table in tables}
+        engine = get_shared_engine(connection_url)
 
         count_rows = _should_count_rows(include_stats, engine, schema, include_tables)
         warnings: List[str] = []
@@ -129,95 +404,236 @@ def collect_schema(
                 "Row counts skipped unless schema or include_tables is provided for non-SQLite."
             )
 
-        table_details: List[Dict[str, Any]] = []
-        fk_details: List[Dict[str, Any]] = []
+        with engine.connect() as conn, deadline_guard(conn, deadline):
+            reflected = _reflect_schema(
+                engine,
+                get_schema_inspector(conn),
+                schema,
+                include_tables,
+                exclude_tables,
+                count_rows,
+                schema,
+                deadline,
+                fields,
+            )
+        tables = reflected["table_names"]
+        partial = bool(reflected["skipped_tables"])
+        if partial:
+            warnings.append(_deadline_warning(deadline))
 
-        for table in tables:
-            columns = inspector.get_columns(table, schema=schema)
-            pk = inspector.get_pk_constraint(table, schema=schema)
-            fks = inspector.get_foreign_keys(table, schema=schema)
-            indexes = inspector.get_indexes(table, schema=schema)
-            uniques = inspector.get_unique_constraints(table, schema=schema)
+        allowed_tables_qualified = {_normalize_table_name(schema, table) for table in tables}
+        allowed_tables_bare = {table.lower() for table in tables}
 
-            table_details.append(
-                {
-                    "table": format_table_name(schema, table),
-                    "columns": [
-                        {
-                            "name": col.get("name"),
-                            "type": str(col.get("type")),
-                            "nullable": bool(col.get("nullable")),
-                            "default": col.get("default"),
-                        }
-                        for col in (columns or [])
-                    ],
-                    "primary_key": (pk or {}).get("constrained_columns", []) or [],
-                    "indexes": [
-                        {
-                            "name": idx.get("name"),
-                            "columns": idx.get("column_names", []) or [],
-                            "unique": bool(idx.get("unique")),
-                        }
-                        for idx in (indexes or [])
-                    ],
-                    "unique_constraints": [
-                        {
-                            "name": uc.get("name"),
-                            "columns": uc.get("column_names", []) or [],
-                        }
-                        for uc in (uniques or [])
-                    ],
-                    "row_count": _count_rows(engine, schema, table) if count_rows else None,
-                }
-            )
+        return {
+            "schema": schema,
+            "tables": reflected["tables"],
+            "foreign_keys": _filter_foreign_keys(
+                reflected["fk_candidates"], allowed_tables_qualified, allowed_tables_bare
+            ),
+            "views": reflected["views"],
+            "dialect": engine.dialect.name,
+            "warnings": warnings,
+            "partial": partial,
+            "skipped_tables": reflected["skipped_tables"],
+        }
 
-            for fk in (fks or []):
-                referred_schema = fk.get("referred_schema")
-                referred_table = fk.get("referred_table") or ""
-                split_schema, split_table = split_schema_and_table(referred_table)
-                if split_table:
-                    referred_table = split_table
-                    if split_schema:
-                        referred_schema = split_schema
-                    elif schema and not referred_schema:
-                        referred_schema = schema
-                elif schema and not referred_schema:
-                    referred_schema = schema
-
-                if referred_table:
-                    normalized_referred = _normalize_table_name(referred_schema, referred_table)
-                    if (
-                        normalized_referred not in allowed_tables_qualified
-                        and referred_table.lower() not in allowed_tables_bare
-                    ):
-                        continue
-
-                fk_details.append(
-                    {
-                        "table": format_table_name(schema, table),
-                        "constrained_columns": fk.get("constrained_columns", []) or [],
-                        "referred_table": format_table_name(referred_schema, referred_table),
-                        "referred_columns": fk.get("referred_columns", []) or [],
-                    }
+    except SQLAlchemyError as exc:
+        if deadline.expired() and engine is not None:
+            # Cancelled before the table list was read: nothing to return yet.
+            return {
+                "schema": schema,
+                "tables": [],
+                "foreign_keys": [],
+                "views": [],
+                "dialect": engine.dialect.name,
+                "warnings": [_deadline_warning(deadline)],
+                "partial": True,
+                "skipped_tables": [],
+            }
+        return {
+            "schema": schema,
+            "error": str(exc),
+            "tables": [],
+            "foreign_keys": [],
+            "views": [],
+        }
+
+
+def _reflect_schema_timed(
+    engine: Engine,
+    schema: str,
+    include_tables: Optional[List[str]],
+    exclude_tables: Optional[List[str]],
+    count_rows: bool,
+    fk_fallback_schema: Optional[str],
+    deadline: Deadline,
+    fields: FrozenSet[str],
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    empty: Dict[str, Any] = {
+        "table_names": [],
+        "tables": [],
+        "fk_candidates": [],
+        "views": [],
+        "skipped_tables": [],
+        "error": None,
+    }
+    if deadline.expired():
+        reflected = dict(empty, schema_skipped=True)
+    else:
+        try:
+            # One pooled connection per schema; Inspector instances are not shared across threads.
+            with engine.connect() as conn, deadline_guard(conn, deadline):
+                reflected = _reflect_schema(
+                    engine,
+                    get_schema_inspector(conn),
+                    schema,
+                    include_tables,
+                    exclude_tables,
+                    count_rows,
+                    fk_fallback_schema or schema,
+                    deadline,
+                    fields,
+                )
+            reflected["error"] = None
+        except SQLAlchemyError as exc:
+            if deadline.expired():
+                reflected = dict(empty, schema_skipped=True)
+            else:
+                reflected = dict(empty, error=str(exc))
+    reflected["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return reflected
+
+
+def collect_all_schemas(
+    connection_url: str,
+    schemas: Optional[List[str]] = None,
+    include_tables: Optional[List[str]] = None,
+    exclude_tables: Optional[List[str]] = None,
+    include_stats: bool = False,
+    max_workers: int = 4,
+    timeout_s: Optional[float] = None,
+    fields: FrozenSet[str] = ALL_SCHEMA_FIELDS,
+) -> Dict[str, Any]:
+    """
+    Reflect many schemas concurrently over one engine and merge the results.
+    Table names are always schema-qualified and foreign keys are kept when the
+    referred table lives in any of the reflected schemas. timeout_s is one
+    deadline shared by all schemas; see collect_schema for partial results.
+    """
+    engine: Optional[Engine] = None
+    deadline = Deadline(timeout_s)
+    started = time.perf_counter()
+    try:
+        engine = get_shared_engine(connection_url)
+        inspector = get_schema_inspector(engine)
+
+        if schemas:
+            schema_names = list(schemas)
+        else:
+            with engine.connect() as conn, deadline_guard(conn, deadline):
+                schema_names = [
+                    name
+                    for name in get_schema_inspector(conn).get_schema_names()
+                    if not _is_system_schema(name)
+                ]
+
+        # Scope is "every schema", so non-SQLite counts need an explicit include_tables.
+        count_rows = _should_count_rows(include_stats, engine, None, include_tables)
+        warnings: List[str] = []
+        if include_stats and not count_rows:
+            warnings.append("Row counts skipped unless include_tables is provided for non-SQLite.")
+
+        # PostgreSQL omits referred_schema for tables found via search_path;
+        # other dialects omit it for references within the same schema.
+        fk_fallback_schema = (
+            inspector.default_schema_name if engine.dialect.name == "postgresql" else None
+        )
+
+        workers = max(1, min(max_workers, MAX_SCHEMA_WORKERS, len(schema_names) or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="schema-reflect") as pool:
+            reflected_list = list(
+                pool.map(
+                    lambda name: _reflect_schema_timed(
+                        engine,
+                        name,
+                        include_tables,
+                        exclude_tables,
+                        count_rows,
+                        fk_fallback_schema,
+                        deadline,
+                        fields,
+                    ),
+                    schema_names,
                 )
+            )
+
+        allowed_tables_qualified = {
+            _normalize_table_name(name, table)
+            for name, reflected in zip(schema_names, reflected_list)
+            for table in reflected["table_names"]
+        }
+
+        tables: List[Dict[str, Any]] = []
+        fk_details: List[Dict[str, Any]] = []
+        views: List[str] = []
+        timings: List[Dict[str, Any]] = []
+        skipped_tables: List[str] = []
+        skipped_schemas: List[str] = []
+        for name, reflected in zip(schema_names, reflected_list):
+            tables.extend(reflected["tables"])
+            skipped_tables.extend(reflected["skipped_tables"])
+            if reflected.get("schema_skipped"):
+                skipped_schemas.append(name)
+            fk_details.extend(
+                _filter_foreign_keys(reflected["fk_candidates"], allowed_tables_qualified, set())
+            )
+            views.extend(format_table_name(name, view) for view in reflected["views"])
+            timing: Dict[str, Any] = {
+                "schema": name,
+                "elapsed_ms": reflected["elapsed_ms"],
+                "tables_count": len(reflected["tables"]),
+            }
+            if reflected["error"]:
+                timing["error"] = reflected["error"]
+                warnings.append(f"Schema {name} could not be reflected: {reflected['error']}")
+            timings.append(timing)
+
+        partial = bool(skipped_tables or skipped_schemas)
+        if partial:
+            warnings.append(_deadline_warning(deadline))
 
         return {
-            "schema": schema,
-            "tables": table_details,
+            "schemas": schema_names,
+            "tables": tables,
             "foreign_keys": fk_details,
             "views": views,
             "dialect": engine.dialect.name,
             "warnings": warnings,
+            "timings": timings,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+            "partial": partial,
+            "skipped_tables": skipped_tables,
+            "skipped_schemas": skipped_schemas,
         }
 
     except SQLAlchemyError as exc:
+        if deadline.expired() and engine is not None:
+            return {
+                "schemas": schemas or [],
+                "tables": [],
+                "foreign_keys": [],
+                "views": [],
+                "dialect": engine.dialect.name,
+                "warnings": [_deadline_warning(deadline)],
+                "partial": True,
+                "skipped_tables": [],
+                "skipped_schemas": schemas or [],
+            }
         return {
-            "schema": schema,
+            "schemas": schemas or [],
             "error": str(exc),
             "tables": [],
             "foreign_keys": [],
             "views": [],
         }
-    finally:
-        if engine is not None:
-            engine.dispose()
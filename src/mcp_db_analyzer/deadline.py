@@ -0,0 +1,107 @@
+"""Per-call deadlines: driver statement timeouts plus a cancelling watchdog."""
+from __future__ import annotations
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+# Driver timeouts fire slightly after the watchdog, so a resulting error is
+# always observed with the deadline already expired.
+_DRIVER_TIMEOUT_GRACE_S = 0.1
+
+
+class Deadline:
+    """A monotonic point in time after which work should stop. None means no limit."""
+
+    def __init__(self, timeout_s: Optional[float] = None) -> None:
+        self.timeout_s = timeout_s if timeout_s and timeout_s > 0 else None
+        self._expires_at = time.monotonic() + self.timeout_s if self.timeout_s else None
+
+    def remaining(self) -> Optional[float]:
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self._expires_at is not None and time.monotonic() >= self._expires_at
+
+
+def _scalar(conn: Connection, sql: str) -> Any:
+    return conn.exec_driver_sql(sql).scalar()
+
+
+def _apply_statement_timeout(conn: Connection, timeout_s: float) -> Callable[[], None]:
+    """
+    Set a driver/server-side statement timeout on conn and return a callable that
+    restores the previous setting, so pooled connections are handed back unchanged.
+    Dialects without a supported setting are left alone.
+    """
+    dialect = conn.dialect.name
+    ms = max(1, int((timeout_s + _DRIVER_TIMEOUT_GRACE_S) * 1000))
+
+    if dialect == "postgresql":
+        # SET LOCAL reverts when the connection's transaction ends.
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {ms}")
+        return lambda: None
+
+    if dialect == "sqlite":
+        # A locked database waits in the busy handler; bound that wait.
+        previous = _scalar(conn, "PRAGMA busy_timeout")
+        conn.exec_driver_sql(f"PRAGMA busy_timeout = {ms}")
+        return lambda: conn.exec_driver_sql(f"PRAGMA busy_timeout = {int(previous or 0)}")
+
+    if dialect in ("mysql", "mariadb"):
+        if getattr(conn.dialect, "is_mariadb", False):
+            previous = _scalar(conn, "SELECT @@SESSION.max_statement_time")
+            conn.exec_driver_sql(f"SET SESSION max_statement_time = {ms / 1000:.3f}")
+            return lambda: conn.exec_driver_sql(f"SET SESSION max_statement_time = {previous or 0}")
+        previous = _scalar(conn, "SELECT @@SESSION.max_execution_time")
+        conn.exec_driver_sql(f"SET SESSION max_execution_time = {ms}")
+        return lambda: conn.exec_driver_sql(f"SET SESSION max_execution_time = {int(previous or 0)}")
+
+    return lambda: None
+
+
+def _cancel_dbapi_connection(dbapi_connection: Any) -> None:
+    """Abort whatever the connection is running: sqlite3.interrupt(), psycopg cancel()."""
+    for method in ("interrupt", "cancel"):
+        cancel = getattr(dbapi_connection, method, None)
+        if callable(cancel):
+            try:
+                cancel()
+            except Exception:
+                pass
+            return
+
+
+@contextmanager
+def deadline_guard(conn: Connection, deadline: Deadline) -> Iterator[None]:
+    """
+    Bound the work done on conn by deadline: statement timeouts where the dialect
+    supports them, and a watchdog that cancels the in-flight statement when the
+    deadline passes (for drivers that can be cancelled from another thread).
+    """
+    remaining = deadline.remaining()
+    if remaining is None:
+        yield
+        return
+
+    try:
+        restore = _apply_statement_timeout(conn, remaining)
+    except SQLAlchemyError:
+        restore = lambda: None  # noqa: E731 - unsupported server version; watchdog still applies
+
+    dbapi_connection = conn.connection.dbapi_connection
+    watchdog = threading.Timer(remaining, _cancel_dbapi_connection, args=(dbapi_connection,))
+    watchdog.daemon = True
+    watchdog.start()
+    try:
+        yield
+    finally:
+        watchdog.cancel()
+        try:
+            restore()
+        except SQLAlchemyError:
+            pass
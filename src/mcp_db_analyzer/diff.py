@@ -0,0 +1,174 @@
+"""Digest-driven comparison of two collected schemas."""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+
+from mcp_db_analyzer.digest import schema_digest, table_digests
+from mcp_db_analyzer.formats import SCHEMA_PARTS, present_fields, project_fields
+
+_COLUMN_ATTRS = ("type", "nullable", "default")
+
+
+def _named_entries(entries: List[Dict[str, Any]]) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
+    """Key indexes/uniques by name, falling back to their column list when unnamed."""
+    keyed: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for entry in entries or []:
+        name = entry.get("name")
+        key = ("name", name) if name else ("columns", tuple(entry.get("columns", []) or []))
+        keyed[key] = entry
+    return keyed
+
+
+def _diff_named(left: List[Dict[str, Any]], right: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    left_map = _named_entries(left)
+    right_map = _named_entries(right)
+    return {
+        "added": [right_map[k] for k in right_map if k not in left_map],
+        "removed": [left_map[k] for k in left_map if k not in right_map],
+        "altered": [
+            {"name": right_map[k].get("name"), "before": left_map[k], "after": right_map[k]}
+            for k in right_map
+            if k in left_map and left_map[k] != right_map[k]
+        ],
+    }
+
+
+def _fk_key(fk: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        tuple(fk.get("constrained_columns", []) or []),
+        fk.get("referred_table"),
+        tuple(fk.get("referred_columns", []) or []),
+    )
+
+
+def _diff_table(
+    left: Dict[str, Any],
+    right: Dict[str, Any],
+    left_fks: List[Dict[str, Any]],
+    right_fks: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    left_cols = {c.get("name"): c for c in left.get("columns", []) or []}
+    right_cols = {c.get("name"): c for c in right.get("columns", []) or []}
+
+    altered_columns: List[Dict[str, Any]] = []
+    for name in right_cols:
+        if name not in left_cols:
+            continue
+        changes = {
+            attr: {"before": left_cols[name].get(attr), "after": right_cols[name].get(attr)}
+            for attr in _COLUMN_ATTRS
+            if left_cols[name].get(attr) != right_cols[name].get(attr)
+        }
+        if changes:
+            altered_columns.append({"column": name, "changes": changes})
+
+    left_fk_map = {_fk_key(fk): fk for fk in left_fks}
+    right_fk_map = {_fk_key(fk): fk for fk in right_fks}
+
+    details: Dict[str, Any] = {
+        "table": right.get("table"),
+        "added_columns": [n for n in right_cols if n not in left_cols],
+        "removed_columns": [n for n in left_cols if n not in right_cols],
+        "altered_columns": altered_columns,
+        "indexes": _diff_named(left.get("indexes", []), right.get("indexes", [])),
+        "unique_constraints": _diff_named(
+            left.get("unique_constraints", []), right.get("unique_constraints", [])
+        ),
+        "foreign_keys": {
+            "added": [fk for k, fk in right_fk_map.items() if k not in left_fk_map],
+            "removed": [fk for k, fk in left_fk_map.items() if k not in right_fk_map],
+        },
+    }
+
+    left_pk = list(left.get("primary_key", []) or [])
+    right_pk = list(right.get("primary_key", []) or [])
+    if left_pk != right_pk:
+        details["primary_key"] = {"before": left_pk, "after": right_pk}
+
+    left_names = [c.get("name") for c in left.get("columns", []) or []]
+    right_names = [c.get("name") for c in right.get("columns", []) or []]
+    common = set(left_names) & set(right_names)
+    if [n for n in left_names if n in common] != [n for n in right_names if n in common]:
+        details["column_order_changed"] = True
+
+    return details
+
+
+def _fks_by_table(result: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for fk in result.get("foreign_keys", []) or []:
+        grouped.setdefault(str(fk.get("table")), []).append(fk)
+    return grouped
+
+
+def diff_schemas(
+    left: Dict[str, Any],
+    right: Dict[str, Any],
+    left_digests: Optional[Dict[str, str]] = None,
+    right_digests: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Compare two collect_schema results. Merkle roots are compared first; when
+    they differ only tables whose digests differ are diffed field by field.
+    Parts missing from either side (a fields projection) are left out of the
+    comparison on both sides and listed in "not_compared".
+    """
+    compared = present_fields(left) & present_fields(right)
+    if compared != present_fields(left):
+        left, left_digests = project_fields(left, compared), None
+    if compared != present_fields(right):
+        right, right_digests = project_fields(right, compared), None
+    not_compared = [part for part in SCHEMA_PARTS if part not in compared]
+
+    left_digests = left_digests if left_digests is not None else table_digests(left)
+    right_digests = right_digests if right_digests is not None else table_digests(right)
+    left_root = schema_digest(left, left_digests)
+    right_root = schema_digest(right, right_digests)
+
+    result: Dict[str, Any] = {
+        "identical": left_root == right_root,
+        "left_root": left_root,
+        "right_root": right_root,
+        "added_tables": [],
+        "removed_tables": [],
+        "altered_tables": [],
+        "added_views": [],
+        "removed_views": [],
+        "unchanged_tables_count": 0,
+        "not_compared": not_compared,
+    }
+    if result["identical"]:
+        result["unchanged_tables_count"] = len(left_digests)
+        return result
+
+    result["added_tables"] = sorted(name for name in right_digests if name not in left_digests)
+    result["removed_tables"] = sorted(name for name in left_digests if name not in right_digests)
+
+    changed = sorted(
+        name
+        for name, digest in left_digests.items()
+        if name in right_digests and right_digests[name] != digest
+    )
+    result["unchanged_tables_count"] = sum(
+        1 for name, digest in left_digests.items() if right_digests.get(name) == digest
+    )
+
+    if changed:
+        left_tables = {t.get("table"): t for t in left.get("tables", []) or []}
+        right_tables = {t.get("table"): t for t in right.get("tables", []) or []}
+        left_fks = _fks_by_table(left)
+        right_fks = _fks_by_table(right)
+        result["altered_tables"] = [
+            _diff_table(
+                left_tables[name],
+                right_tables[name],
+                left_fks.get(name, []),
+                right_fks.get(name, []),
+            )
+            for name in changed
+        ]
+
+    left_views = {str(v) for v in left.get("views", []) or []}
+    right_views = {str(v) for v in right.get("views", []) or []}
+    result["added_views"] = sorted(right_views - left_views)
+    result["removed_views"] = sorted(left_views - right_views)
+    return result
@@ -0,0 +1,123 @@
+"""Content hashing of collected schemas."""
+from __future__ import annotations
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+
+def _canonical_table(table: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shape-only view of a table entry: volatile data (row counts) is dropped and
+    unordered collections are sorted. Column order is kept, it is part of the schema.
+    """
+    return {
+        "table": table.get("table"),
+        "columns": [
+            {
+                "name": col.get("name"),
+                "type": col.get("type"),
+                "nullable": col.get("nullable"),
+                "default": col.get("default"),
+            }
+            for col in table.get("columns", []) or []
+        ],
+        "primary_key": list(table.get("primary_key", []) or []),
+        "indexes": sorted(
+            (
+                {
+                    "name": idx.get("name"),
+                    "columns": list(idx.get("columns", []) or []),
+                    "unique": bool(idx.get("unique")),
+                }
+                for idx in table.get("indexes", []) or []
+            ),
+            key=lambda idx: (str(idx["name"]), idx["columns"]),
+        ),
+        "unique_constraints": sorted(
+            (
+                {"name": uc.get("name"), "columns": list(uc.get("columns", []) or [])}
+                for uc in table.get("unique_constraints", []) or []
+            ),
+            key=lambda uc: (str(uc["name"]), uc["columns"]),
+        ),
+    }
+
+
+def _canonical_fks(fks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(
+        (
+            {
+                "table": fk.get("table"),
+                "constrained_columns": list(fk.get("constrained_columns", []) or []),
+                "referred_table": fk.get("referred_table"),
+                "referred_columns": list(fk.get("referred_columns", []) or []),
+            }
+            for fk in fks
+        ),
+        key=lambda fk: json.dumps(fk, sort_keys=True, default=str),
+    )
+
+
+def _hash(payload: Any) -> str:
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def table_digests(result: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Per-table SHA-256 over columns, PK, indexes, unique constraints and the
+    table's outgoing foreign keys.
+    """
+    fks_by_table: Dict[str, List[Dict[str, Any]]] = {}
+    for fk in result.get("foreign_keys", []) or []:
+        fks_by_table.setdefault(str(fk.get("table")), []).append(fk)
+
+    digests: Dict[str, str] = {}
+    for table in result.get("tables", []) or []:
+        name = table.get("table")
+        if not name:
+            continue
+        digests[name] = _hash(
+            {
+                "table": _canonical_table(table),
+                "foreign_keys": _canonical_fks(fks_by_table.get(name, [])),
+            }
+        )
+    return digests
+
+
+def merkle_root(leaves: Dict[str, str]) -> str:
+    """
+    Binary Merkle root over (name, digest) leaves sorted by name. An odd node
+    at any level is promoted unchanged. The empty tree hashes to sha256("").
+    """
+    level = [
+        hashlib.sha256(f"{name}\0{digest}".encode("utf-8")).hexdigest()
+        for name, digest in sorted(leaves.items())
+    ]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        paired: List[str] = []
+        for i in range(0, len(level) - 1, 2):
+            paired.append(hashlib.sha256(f"{level[i]}{level[i + 1]}".encode("utf-8")).hexdigest())
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+def _views_digest(result: Dict[str, Any]) -> str:
+    return _hash(sorted(str(v) for v in result.get("views", []) or []))
+
+
+def schema_digest(result: Dict[str, Any], digests: Optional[Dict[str, str]] = None) -> str:
+    """
+    Merkle root of a collect_schema result: one leaf per table plus one for the
+    view list. Equal roots mean identical schema shape. Pass precomputed
+    table_digests to avoid hashing twice.
+    """
+    leaves = dict(digests if digests is not None else table_digests(result))
+    # NUL cannot appear in a reflected table name, so this leaf never collides.
+    leaves["\0views"] = _views_digest(result)
+    return merkle_root(leaves)
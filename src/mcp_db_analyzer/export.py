@@ -0,0 +1,262 @@
+"""Columnar (Parquet / Arrow IPC) export of the schema catalog, one file per entity."""
+from __future__ import annotations
+import os
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+
+EXPORT_DIR_ENV = "MCP_DB_ANALYZER_EXPORT_DIR"
+EXPORT_FORMATS = ("parquet", "arrow")
+# Rows buffered per entity before a batch is written.
+DEFAULT_BATCH_ROWS = 10_000
+
+_EXTENSIONS = {"parquet": "parquet", "arrow": "arrows"}
+
+
+def resolve_output_dir(output_dir: str) -> str:
+    """
+    output_dir resolved inside the export root (MCP_DB_ANALYZER_EXPORT_DIR),
+    so clients cannot write elsewhere on the server. Raises ValueError when
+    exports are disabled or the path leaves the root.
+    """
+    root = os.environ.get(EXPORT_DIR_ENV, "").strip()
+    if not root:
+        raise ValueError(f"Exports are disabled; set {EXPORT_DIR_ENV} to the directory exports may be written to.")
+    root = os.path.realpath(root)
+    target = os.path.realpath(os.path.join(root, output_dir or "."))
+    if os.path.commonpath([root, target]) != root:
+        raise ValueError(f"output_dir must stay inside {EXPORT_DIR_ENV} ({root}).")
+    return target
+
+
+def _entity_schemas(pa: Any) -> Dict[str, Any]:
+    # Names and types repeat across rows, so they are dictionary-encoded.
+    name = pa.dictionary(pa.int32(), pa.string())
+    names = pa.list_(pa.string())
+    common = [("database", name), ("schema", name), ("table", name)]
+    return {
+        "tables": pa.schema(common + [("kind", name), ("column_count", pa.int32()), ("primary_key", names)]),
+        "columns": pa.schema(
+            common
+            + [
+                ("name", name),
+                ("position", pa.int32()),
+                ("type", name),
+                ("nullable", pa.bool_()),
+                ("primary_key", pa.bool_()),
+                ("default", pa.string()),
+            ]
+        ),
+        "foreign_keys": pa.schema(
+            common
+            + [
+                ("name", name),
+                ("constrained_columns", names),
+                ("referred_schema", name),
+                ("referred_table", name),
+                ("referred_columns", names),
+            ]
+        ),
+        "indexes": pa.schema(common + [("name", name), ("columns", names), ("unique", pa.bool_())]),
+    }
+
+
+class _EntityWriter:
+    """Buffers rows of one entity and writes them as record batches of batch_rows."""
+
+    def __init__(self, pa: Any, path: str, schema: Any, format: str, batch_rows: int) -> None:
+        self.pa = pa
+        self.path = path
+        self.schema = schema
+        self.batch_rows = batch_rows
+        self.rows: List[Dict[str, Any]] = []
+        self.written = 0
+        if format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(path, schema)
+            self._write = lambda batch: self._writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            # The stream format allows a new dictionary per batch; the file format does not.
+            self._writer = pa.ipc.new_stream(path, schema)
+            self._write = self._writer.write_batch
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        batch = self.pa.RecordBatch.from_pylist(self.rows, schema=self.schema)
+        self._write(batch)
+        self.written += len(self.rows)
+        self.rows = []
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._writer.close()
+
+
+def _export_table(
+    inspector: Any,
+    writers: Dict[str, _EntityWriter],
+    database: str,
+    schema: Optional[str],
+    table: str,
+) -> None:
+    columns = inspector.get_columns(table, schema=schema)
+    pk = inspector.get_pk_constraint(table, schema=schema).get("constrained_columns", []) or []
+    fks = inspector.get_foreign_keys(table, schema=schema)
+    indexes = inspector.get_indexes(table, schema=schema)
+
+    key = {"database": database, "schema": schema, "table": table}
+    writers["tables"].add({**key, "kind": "table", "column_count": len(columns), "primary_key": pk})
+    for position, col in enumerate(columns, start=1):
+        default = col.get("default")
+        writers["columns"].add(
+            {
+                **key,
+                "name": col.get("name"),
+                "position": position,
+                "type": str(col.get("type")),
+                "nullable": bool(col.get("nullable")),
+                "primary_key": col.get("name") in pk,
+                "default": None if default is None else str(default),
+            }
+        )
+    for fk in fks:
+        writers["foreign_keys"].add(
+            {
+                **key,
+                "name": fk.get("name"),
+                "constrained_columns": fk.get("constrained_columns", []) or [],
+                "referred_schema": fk.get("referred_schema") or schema,
+                "referred_table": fk.get("referred_table"),
+                "referred_columns": fk.get("referred_columns", []) or [],
+            }
+        )
+    for idx in indexes:
+        writers["indexes"].add(
+            {
+                **key,
+                "name": idx.get("name"),
+                "columns": idx.get("column_names", []) or [],
+                "unique": bool(idx.get("unique")),
+            }
+        )
+
+
+def export_schema_catalog(
+    connection_url: str,
+    output_dir: str,
+    schema: Optional[str] = None,
+    include_tables: Optional[List[str]] = None,
+    exclude_tables: Optional[List[str]] = None,
+    format: str = "parquet",
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    timeout_s: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Write tables, columns, foreign keys and indexes of one schema to
+    output_dir (relative to the export root, see resolve_output_dir) as
+    tables/columns/foreign_keys/indexes.<ext>, with
+    dictionary-encoded name and type columns. Tables are reflected and written
+    one at a time, so memory is bounded by batch_rows per entity rather than
+    by the size of the schema. Views are listed in the tables file with
+    kind "view". Tables not reached before timeout_s are listed as skipped.
+    """
+    from mcp_db_analyzer.db import (
+        filter_tables,
+        get_schema_inspector,
+        get_shared_engine,
+        redact_connection_url,
+    )
+    from mcp_db_analyzer.deadline import Deadline, deadline_guard
+
+    if format not in EXPORT_FORMATS:
+        return {"error": f"Unknown format {format!r}. Choose from {list(EXPORT_FORMATS)}."}
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401  (registers pa.ipc)
+    except ImportError:
+        return {"error": "pyarrow is required for export_schema_catalog (pip install pyarrow)."}
+
+    try:
+        output_dir = resolve_output_dir(output_dir)
+    except ValueError as exc:
+        return {"error": str(exc)}
+
+    deadline = Deadline(timeout_s)
+    database = redact_connection_url(connection_url)
+    batch_rows = max(1, int(batch_rows or DEFAULT_BATCH_ROWS))
+    os.makedirs(output_dir, exist_ok=True)
+    extension = _EXTENSIONS[format]
+    files = {
+        entity: os.path.join(output_dir, f"{entity}.{extension}")
+        for entity in ("tables", "columns", "foreign_keys", "indexes")
+    }
+
+    writers: Dict[str, _EntityWriter] = {}
+    skipped_tables: List[str] = []
+    exported = 0
+    try:
+        engine = get_shared_engine(connection_url)
+        for entity, entity_schema in _entity_schemas(pa).items():
+            writers[entity] = _EntityWriter(pa, files[entity], entity_schema, format, batch_rows)
+        with engine.connect() as conn, deadline_guard(conn, deadline):
+            inspector = get_schema_inspector(conn)
+            tables = filter_tables(
+                inspector.get_table_names(schema=schema), schema, include_tables, exclude_tables
+            )
+            views = filter_tables(inspector.get_view_names(schema=schema), schema, include_tables, exclude_tables)
+            for position, table in enumerate(tables):
+                if deadline.expired():
+                    skipped_tables = tables[position:]
+                    break
+                try:
+                    _export_table(inspector, writers, database, schema, table)
+                except SQLAlchemyError:
+                    # A statement cancelled by the deadline watchdog surfaces as a DB error.
+                    if not deadline.expired():
+                        raise
+                    skipped_tables = tables[position:]
+                    break
+                finally:
+                    # The inspector caches every reflected table; drop them so memory stays flat.
+                    inspector.info_cache.clear()
+                exported += 1
+            for view in views:
+                writers["tables"].add(
+                    {
+                        "database": database,
+                        "schema": schema,
+                        "table": view,
+                        "kind": "view",
+                        "column_count": None,
+                        "primary_key": [],
+                    }
+                )
+    except (SQLAlchemyError, OSError) as exc:
+        return {"schema": schema, "error": str(exc)}
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    warnings: List[str] = []
+    if skipped_tables:
+        warnings.append(f"Deadline of {timeout_s:g}s reached; export is partial.")
+    return {
+        "schema": schema,
+        "format": format,
+        "files": files,
+        "rows": {entity: writer.written for entity, writer in writers.items()},
+        "tables_exported": exported,
+        "views_exported": len(views),
+        "partial": bool(skipped_tables),
+        "skipped_tables": skipped_tables,
+        "warnings": warnings,
+    }
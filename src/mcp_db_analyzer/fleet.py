@@ -0,0 +1,201 @@
+"""Fan-out schema analysis across many databases with identical layouts."""
+from __future__ import annotations
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from mcp_db_analyzer.db import collect_schema, redact_connection_url
+from mcp_db_analyzer.digest import schema_digest
+from mcp_db_analyzer.graph import build_mermaid_er
+from mcp_db_analyzer.insights import build_insights
+
+MAX_FLEET_CONCURRENCY = 32
+# Extra time a target gets to return its partial result before it is abandoned.
+_ABANDON_GRACE_S = 1.0
+
+
+def _reflect_target(
+    index: int,
+    connection_url: str,
+    schema: Optional[str],
+    include_tables: Optional[List[str]],
+    exclude_tables: Optional[List[str]],
+    timeout_s: float,
+    results: "queue.Queue[Tuple[int, Dict[str, Any]]]",
+) -> None:
+    try:
+        result = collect_schema(
+            connection_url=connection_url,
+            schema=schema,
+            include_tables=include_tables,
+            exclude_tables=exclude_tables,
+            timeout_s=timeout_s,
+        )
+    except Exception as exc:  # driver import errors, bad URLs, ...
+        result = {"error": str(exc), "tables": [], "foreign_keys": [], "views": []}
+    results.put((index, result))
+
+
+def _run_bounded(
+    connection_urls: List[str],
+    schema: Optional[str],
+    include_tables: Optional[List[str]],
+    exclude_tables: Optional[List[str]],
+    max_concurrency: int,
+    timeout_s: float,
+) -> Dict[int, Tuple[str, Dict[str, Any], float]]:
+    """
+    Reflect targets with at most max_concurrency in flight. Each target gets
+    timeout_s as its collect_schema deadline and returns a partial result when it
+    expires. A target still running after a short grace period (e.g. a driver that
+    cannot be cancelled) is reported as timed out, but its daemon thread keeps its
+    slot until it really finishes, so max_concurrency is a hard cap on open
+    connections. If every slot stays held by abandoned threads for another
+    timeout, the targets not yet started are reported as timed out too.
+    """
+    abandon_after_s = timeout_s + _ABANDON_GRACE_S
+    results: "queue.Queue[Tuple[int, Dict[str, Any]]]" = queue.Queue()
+    running: Dict[int, float] = {}
+    abandoned: set = set()
+    outcomes: Dict[int, Tuple[str, Dict[str, Any], float]] = {}
+    next_index = 0
+    blocked_since: Optional[float] = None
+
+    while next_index < len(connection_urls) or running:
+        while len(running) + len(abandoned) < max_concurrency and next_index < len(connection_urls):
+            thread = threading.Thread(
+                target=_reflect_target,
+                args=(
+                    next_index,
+                    connection_urls[next_index],
+                    schema,
+                    include_tables,
+                    exclude_tables,
+                    timeout_s,
+                    results,
+                ),
+                name=f"fleet-reflect-{next_index}",
+                daemon=True,
+            )
+            running[next_index] = time.monotonic()
+            thread.start()
+            next_index += 1
+
+        if running:
+            blocked_since = None
+            wait_until = min(started + abandon_after_s for started in running.values())
+        else:
+            # Every slot is held by an abandoned thread; wait for one to finish.
+            blocked_since = blocked_since if blocked_since is not None else time.monotonic()
+            wait_until = blocked_since + abandon_after_s
+        try:
+            index, result = results.get(timeout=max(0.0, wait_until - time.monotonic()))
+            started = running.pop(index, None)
+            if started is not None:
+                status = "error" if result.get("error") else "partial" if result.get("partial") else "ok"
+                outcomes[index] = (status, result, time.monotonic() - started)
+            else:
+                abandoned.discard(index)
+        except queue.Empty:
+            pass
+
+        now = time.monotonic()
+        for index, started in list(running.items()):
+            if now - started >= abandon_after_s:
+                del running[index]
+                abandoned.add(index)
+                outcomes[index] = ("timeout", {"error": f"timed out after {timeout_s:g}s"}, now - started)
+        if not running and blocked_since is not None and now - blocked_since >= abandon_after_s:
+            error = f"not started: all {max_concurrency} slots held by timed-out targets"
+            for index in range(next_index, len(connection_urls)):
+                outcomes[index] = ("timeout", {"error": error}, 0.0)
+            break
+
+    return outcomes
+
+
+def analyze_fleet(
+    connection_urls: List[str],
+    schema: Optional[str] = None,
+    include_tables: Optional[List[str]] = None,
+    exclude_tables: Optional[List[str]] = None,
+    max_concurrency: int = 8,
+    timeout_s: float = 30.0,
+    include_diagrams: bool = True,
+) -> Dict[str, Any]:
+    """
+    Reflect every target concurrently, group targets by schema digest and compute
+    insights/diagrams once per distinct schema. The most common digest is the
+    baseline; targets with any other digest are reported as drifted.
+    """
+    concurrency = max(1, min(max_concurrency, MAX_FLEET_CONCURRENCY))
+    timeout_s = max(float(timeout_s), 0.001)
+    outcomes = _run_bounded(
+        connection_urls, schema, include_tables, exclude_tables, concurrency, timeout_s
+    )
+
+    targets: List[Dict[str, Any]] = []
+    groups: Dict[str, Dict[str, Any]] = {}
+
+    for index, url in enumerate(connection_urls):
+        status, result, elapsed_s = outcomes[index]
+        label = redact_connection_url(url)
+        entry: Dict[str, Any] = {
+            "index": index,
+            "target": label,
+            "status": status,
+            "elapsed_ms": round(elapsed_s * 1000, 3),
+        }
+        if status == "partial":
+            # An incomplete schema would hash as drift; report it without grouping.
+            entry["skipped_tables"] = result.get("skipped_tables", [])
+            targets.append(entry)
+            continue
+        if status != "ok":
+            entry["error"] = result.get("error")
+            targets.append(entry)
+            continue
+
+        digest = schema_digest(result)
+        entry["digest"] = digest
+        entry["tables_count"] = len(result.get("tables", []))
+        targets.append(entry)
+
+        group = groups.get(digest)
+        if group is None:
+            groups[digest] = {"digest": digest, "targets": [label], "result": result}
+        else:
+            group["targets"].append(label)
+
+    distinct_schemas: List[Dict[str, Any]] = []
+    for digest, group in groups.items():
+        result = group["result"]
+        tables = result.get("tables", [])
+        fks = result.get("foreign_keys", [])
+        summary: Dict[str, Any] = {
+            "digest": digest,
+            "targets": group["targets"],
+            "dialect": result.get("dialect"),
+            "tables_count": len(tables),
+            "foreign_keys_count": len(fks),
+            "insights": build_insights(tables, fks),
+        }
+        if include_diagrams:
+            summary["mermaid"] = build_mermaid_er(tables=tables, fks=fks).get("mermaid")
+        distinct_schemas.append(summary)
+
+    # Most shards wins; ties go to the digest seen first (dict order follows target order).
+    baseline = max(distinct_schemas, key=lambda s: len(s["targets"]), default=None)
+    baseline_digest = baseline["digest"] if baseline else None
+
+    return {
+        "schema": schema,
+        "targets": targets,
+        "distinct_schemas": distinct_schemas,
+        "baseline_digest": baseline_digest,
+        "drifted": [
+            t["target"] for t in targets if t["status"] == "ok" and t["digest"] != baseline_digest
+        ],
+        "failed": [t["target"] for t in targets if t["status"] != "ok"],
+    }
@@ -0,0 +1,112 @@
+"""Response layouts for collected schemas."""
+from __future__ import annotations
+from typing import Any, Dict, FrozenSet, List
+
+RESPONSE_FORMATS = ("full", "compact")
+# Table parts a fields projection can select, in the order they are documented.
+SCHEMA_PARTS = ("columns", "defaults", "primary_key", "foreign_keys", "indexes", "unique_constraints")
+
+
+def project_fields(result: Dict[str, Any], fields: FrozenSet[str]) -> Dict[str, Any]:
+    """
+    Drop table parts not in fields from an already collected result. Used when
+    more was reflected than requested (e.g. insights need indexes).
+    """
+    tables: List[Dict[str, Any]] = []
+    for table in result.get("tables", []) or []:
+        projected = {
+            key: value
+            for key, value in table.items()
+            if key in ("table", "row_count") or key in fields
+        }
+        if "columns" in projected and "defaults" not in fields:
+            projected["columns"] = [
+                {k: v for k, v in col.items() if k != "default"} for col in projected["columns"]
+            ]
+        tables.append(projected)
+
+    projected_result = dict(result, tables=tables)
+    if "foreign_keys" not in fields:
+        projected_result.pop("foreign_keys", None)
+    return projected_result
+
+
+def present_fields(result: Dict[str, Any]) -> FrozenSet[str]:
+    """
+    Parts a full-format result carries, the inverse of project_fields. A table
+    part counts only when every table has it, defaults only when every column does.
+    """
+    tables = result.get("tables", []) or []
+    present = {
+        part
+        for part in ("columns", "primary_key", "indexes", "unique_constraints")
+        if all(part in table for table in tables)
+    }
+    if "columns" in present and all(
+        "default" in col for table in tables for col in table.get("columns") or []
+    ):
+        present.add("defaults")
+    if "foreign_keys" in result:
+        present.add("foreign_keys")
+    return frozenset(present)
+
+
+def _columnar(entries: List[Dict[str, Any]], keys: List[str]) -> Dict[str, List[Any]]:
+    return {key: [entry.get(key) for entry in entries] for key in keys}
+
+
+def to_compact(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Columnar layout: per table, column attributes become parallel arrays and
+    column types are indexes into one deduplicated top-level "types" list.
+    Indexes, unique constraints and foreign keys are columnar too. Keys absent
+    from the input (projected away) stay absent.
+    """
+    types: List[str] = []
+    type_ids: Dict[str, int] = {}
+
+    def type_id(type_text: Any) -> int:
+        key = str(type_text)
+        if key not in type_ids:
+            type_ids[key] = len(types)
+            types.append(key)
+        return type_ids[key]
+
+    tables: List[Dict[str, Any]] = []
+    for table in result.get("tables", []) or []:
+        compact: Dict[str, Any] = {"table": table.get("table")}
+        if "columns" in table:
+            columns = table.get("columns") or []
+            compact["columns"] = {
+                "name": [col.get("name") for col in columns],
+                "type": [type_id(col.get("type")) for col in columns],
+                "nullable": [col.get("nullable") for col in columns],
+            }
+            if any("default" in col for col in columns):
+                compact["columns"]["default"] = [col.get("default") for col in columns]
+        if "primary_key" in table:
+            compact["primary_key"] = table["primary_key"]
+        if "indexes" in table:
+            compact["indexes"] = _columnar(table["indexes"] or [], ["name", "columns", "unique"])
+        if "unique_constraints" in table:
+            compact["unique_constraints"] = _columnar(
+                table["unique_constraints"] or [], ["name", "columns"]
+            )
+        if table.get("row_count") is not None:
+            compact["row_count"] = table["row_count"]
+        if "storage" in table:
+            compact["storage"] = table["storage"]
+        tables.append(compact)
+
+    compact_result = {
+        key: value for key, value in result.items() if key not in ("tables", "foreign_keys")
+    }
+    compact_result["format"] = "compact"
+    compact_result["types"] = types
+    compact_result["tables"] = tables
+    if "foreign_keys" in result:
+        compact_result["foreign_keys"] = _columnar(
+            result.get("foreign_keys") or [],
+            ["table", "constrained_columns", "referred_table", "referred_columns"],
+        )
+    return compact_result
@@ -1,14 +1,20 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import re
 
 
-def build_dot(tables: List[Dict[str, Any]], fks: List[Dict[str, Any]]) -> str:
+def build_dot(
+    tables: List[Dict[str, Any]],
+    fks: List[Dict[str, Any]],
+    view_edges: Optional[List[Dict[str, Any]]] = None,
+) -> str:
     """
     Build a Graphviz DOT diagram for DB schema:
     - One node per table
     - One directed edge per FK (child -> parent)
     - Optional labels include fk columns mapping (constrained -> referred)
+    - Inferred FKs (inferred=True) are drawn dashed
+    - Optional view dependency edges (view -> table/view), views as ellipses
     """
     lines: List[str] = [
         "digraph db_schema {",
@@ -50,18 +56,36 @@ def build_dot(tables: List[Dict[str, Any]], fks: List[Dict[str, Any]]) -> str:
             label_text = f"{src_label} -> {dst_label}"
             # DOT label escaping
             label_text = label_text.replace("\\", "\\\\").replace('"', '\\"')
-            label = f' [label="{label_text}"]'
-
-        lines.append(f'  "{src}" -> "{dst}"{label};')
+            label = f'label="{label_text}"'
+
+        attrs = [label] if label else []
+        if fk.get("inferred"):
+            attrs.append("style=dashed")
+        suffix = f" [{', '.join(attrs)}]" if attrs else ""
+        lines.append(f'  "{src}" -> "{dst}"{suffix};')
+
+    # Views and what they read
+    for edge in view_edges or []:
+        for name in (edge["view"], edge["references"]):
+            if name not in seen_nodes:
+                seen_nodes.add(name)
+                shape = "ellipse" if name == edge["view"] or edge["kind"] == "view" else "box"
+                lines.append(f'  "{name}" [shape={shape}];')
+        lines.append(f'  "{edge["view"]}" -> "{edge["references"]}" [style=dotted, label="reads"];')
 
     lines.append("}")
     return "\n".join(lines)
 
 
 
-def build_mermaid_er(tables: List[Dict[str, Any]], fks: List[Dict[str, Any]]) -> Dict[str, Any]:
+def build_mermaid_er(
+    tables: List[Dict[str, Any]],
+    fks: List[Dict[str, Any]],
+    view_edges: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
     """
     Build a Mermaid ER diagram from schema data (tables + fks), with strong dedupe.
+    Optional view dependency edges are drawn as dashed "reads" relationships.
 
     Returns:
       {"mermaid": "..."} or {"error": "...", "mermaid": None}
@@ -116,8 +140,12 @@ def build_mermaid_er(tables: List[Dict[str, Any]], fks: List[Dict[str, Any]]) ->
                 label = f"{', '.join(src_cols)} -> {', '.join(dst_cols)}"
                 label = _m_label(label)
 
-            # child }o--|| parent : ...
-            lines.append(f"  {_m_id(src)} }}o--|| {_m_id(dst)} : {label}")
+            # child }o--|| parent : ...; inferred edges are drawn dashed (}o..||)
+            line = ".." if fk.get("inferred") else "--"
+            lines.append(f"  {_m_id(src)} }}o{line}|| {_m_id(dst)} : {label}")
+
+        for edge in view_edges or []:
+            lines.append(f"  {_m_id(edge['view'])} }}o..o{{ {_m_id(edge['references'])} : reads")
 
         return {"mermaid": "\n".join(lines)}
     except Exception as exc:
@@ -0,0 +1,347 @@
+"""Implicit foreign keys: naming/type candidates verified by sampled containment."""
+from __future__ import annotations
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from mcp_db_analyzer.deadline import Deadline, deadline_guard
+from mcp_db_analyzer.db import get_shared_engine, quote_table_name
+from mcp_db_analyzer.sampling import sample_batches, stream_batches
+from mcp_db_analyzer.sketches import BloomFilter
+
+# Reflection parts the candidate search needs.
+INFERENCE_FIELDS = frozenset(("columns", "primary_key", "foreign_keys"))
+DEFAULT_SAMPLE_ROWS = 2_000
+DEFAULT_BUDGET_S = 5.0
+DEFAULT_MIN_CONFIDENCE = 0.8
+MAX_PARENT_KEYS = 200_000
+# Fewer distinct child values than this make containment weak evidence.
+MIN_DISTINCT_VALUES = 5
+
+_NAME_SCORES = {"name_pattern": 1.0, "same_name_as_pk": 0.8, "role_prefix": 0.6}
+_TYPE_FAMILIES = (
+    ("int", "integer"),
+    ("serial", "integer"),
+    ("uuid", "uuid"),
+    ("char", "string"),
+    ("text", "string"),
+    ("string", "string"),
+    ("clob", "string"),
+    ("numeric", "integer"),  # NUMBER/NUMERIC keys are usually whole numbers
+    ("decimal", "integer"),
+    ("number", "integer"),
+    ("blob", "binary"),
+    ("binary", "binary"),
+    ("bytea", "binary"),
+)
+
+
+def _type_family(type_text: Any) -> str:
+    lowered = str(type_text or "").lower()
+    for marker, family in _TYPE_FAMILIES:
+        if marker in lowered:
+            return family
+    return re.split(r"[\s(]", lowered, 1)[0]
+
+
+def _singular(word: str) -> str:
+    if word.endswith("ies") and len(word) > 3:
+        return word[:-3] + "y"
+    if word.endswith(("ses", "xes", "zes", "ches", "shes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def _local_name(schema: Optional[str], table: str) -> str:
+    prefix = f"{schema}."
+    return table[len(prefix) :] if schema and table.startswith(prefix) else table
+
+
+def _expected_names(
+    parents: List[Tuple[str, str, str]],
+) -> Tuple[Dict[str, List[Tuple[int, str]]], Dict[str, List[int]]]:
+    """
+    Lookup tables built once per call: full column name -> [(parent position,
+    match)] for name_pattern and same_name_as_pk, and "_{stem}_{key}" suffix
+    -> [parent position] for role_prefix.
+    """
+    exact: Dict[str, List[Tuple[int, str]]] = {}
+    suffixes: Dict[str, List[int]] = {}
+    for position, (parent, key, _) in enumerate(parents):
+        key = key.lower()
+        bare = parent.lower().rsplit(".", 1)[-1]
+        stems = {bare, _singular(bare)}
+        for name in sorted({f"{stem}_{key}" for stem in stems} | {f"{stem}{key}" for stem in stems}):
+            exact.setdefault(name, []).append((position, "name_pattern"))
+        if key != "id":
+            exact.setdefault(key, []).append((position, "same_name_as_pk"))
+        for stem in stems:
+            suffixes.setdefault(f"_{stem}_{key}", []).append(position)
+    return exact, suffixes
+
+
+def _name_matches(
+    column: str,
+    exact: Dict[str, List[Tuple[int, str]]],
+    suffixes: Dict[str, List[int]],
+) -> Dict[int, str]:
+    """Parent position -> best naming match for one column (see _NAME_SCORES)."""
+    column = column.lower()
+    found: Dict[int, str] = {}
+    for position, match in exact.get(column, ()):
+        if _NAME_SCORES[match] > _NAME_SCORES.get(found.get(position, ""), 0.0):
+            found[position] = match
+    start = column.find("_")
+    while start != -1:
+        for position in suffixes.get(column[start:], ()):
+            found.setdefault(position, "role_prefix")
+        start = column.find("_", start + 1)
+    return found
+
+
+def propose_fk_candidates(
+    tables: List[Dict[str, Any]],
+    fks: List[Dict[str, Any]],
+    deadline: Optional[Deadline] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Column pairs that look like undeclared foreign keys: the child column name
+    follows the parent's name and single-column primary key (orders.customer_id
+    -> customers.id, or a shared non-generic key name) and the types match.
+    Columns already covered by a declared foreign key are skipped. Each column
+    is looked up by name rather than compared with every parent; tables not
+    reached before the deadline propose nothing.
+    """
+    deadline = deadline or Deadline()
+    declared = {
+        (fk.get("table"), column.lower())
+        for fk in fks
+        for column in fk.get("constrained_columns") or []
+    }
+    parents: List[Tuple[str, str, str]] = []
+    for table in tables:
+        pk = table.get("primary_key") or []
+        if len(pk) != 1:
+            continue
+        types = {col.get("name"): col.get("type") for col in table.get("columns") or []}
+        parents.append((table["table"], pk[0], _type_family(types.get(pk[0]))))
+    exact, suffixes = _expected_names(parents)
+
+    candidates: List[Dict[str, Any]] = []
+    for table in tables:
+        if deadline.expired():
+            break
+        name = table.get("table")
+        for column in table.get("columns") or []:
+            column_name = column.get("name") or ""
+            if (name, column_name.lower()) in declared:
+                continue
+            matches = _name_matches(column_name, exact, suffixes)
+            if not matches:
+                continue
+            family = _type_family(column.get("type"))
+            for position in sorted(matches):
+                parent, key, key_family = parents[position]
+                if (parent == name and column_name == key) or family != key_family:
+                    continue
+                candidates.append(
+                    {
+                        "table": name,
+                        "column": column_name,
+                        "referred_table": parent,
+                        "referred_column": key,
+                        "match": matches[position],
+                    }
+                )
+    return candidates
+
+
+def _parent_filter(
+    conn: Any,
+    schema: Optional[str],
+    table: str,
+    key: str,
+    max_keys: int,
+    deadline: Deadline,
+) -> Tuple[BloomFilter, bool]:
+    """Bloom filter over the parent key column; True when the key column was cut at max_keys."""
+    quoted_key = conn.dialect.identifier_preparer.quote(key)
+    sql = (
+        f"SELECT {quoted_key} FROM {quote_table_name(conn.dialect, schema, table)} "
+        f"WHERE {quoted_key} IS NOT NULL LIMIT :limit"
+    )
+    bloom = BloomFilter(max_keys)
+    for batch in stream_batches(conn, sql, {"limit": max_keys}, deadline):
+        for (value,) in batch:
+            bloom.add(value)
+    return bloom, bloom.count >= max_keys
+
+
+def _child_values(
+    conn: Any,
+    schema: Optional[str],
+    table: str,
+    column: str,
+    sample_rows: int,
+    deadline: Deadline,
+) -> set:
+    batches, _, _ = sample_batches(conn, schema, table, [column], sample_rows, deadline)
+    values: set = set()
+    for batch in batches:
+        values.update(value for (value,) in batch if value is not None)
+    return {bytes(value) if isinstance(value, memoryview) else value for value in values}
+
+
+def _confidence(match: str, containment: float, distinct: int) -> float:
+    score = containment * (0.6 + 0.4 * _NAME_SCORES[match])
+    if distinct < MIN_DISTINCT_VALUES:
+        score *= 0.8
+    return round(score, 3)
+
+
+def verify_fk_candidates(
+    conn: Any,
+    schema: Optional[str],
+    candidates: List[Dict[str, Any]],
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    budget_s: float = DEFAULT_BUDGET_S,
+    max_parent_keys: int = MAX_PARENT_KEYS,
+    deadline: Optional[Deadline] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Sample each candidate's child column and test the distinct values against a
+    Bloom filter of the parent keys (built once per parent). Every candidate
+    gets at most budget_s seconds, including building its parent's filter;
+    candidates that run out, or that find no values, are reported unverified.
+    """
+    deadline = deadline or Deadline()
+    parents: Dict[Tuple[str, str], Tuple[BloomFilter, bool]] = {}
+    checked: List[Dict[str, Any]] = []
+    unverified: List[Dict[str, Any]] = []
+    for candidate in candidates:
+        remaining = deadline.remaining()
+        if deadline.expired():
+            unverified.append({**candidate, "reason": "timeout"})
+            continue
+        budget = Deadline(min(budget_s, remaining) if remaining is not None else budget_s)
+        parent_key = (candidate["referred_table"], candidate["referred_column"])
+        try:
+            with deadline_guard(conn, budget):
+                if parent_key not in parents:
+                    parent_filter = _parent_filter(
+                        conn,
+                        schema,
+                        _local_name(schema, parent_key[0]),
+                        parent_key[1],
+                        max_parent_keys,
+                        budget,
+                    )
+                    if budget.expired():
+                        unverified.append({**candidate, "reason": "budget exceeded reading parent keys"})
+                        continue
+                    parents[parent_key] = parent_filter
+                values = _child_values(
+                    conn, schema, _local_name(schema, candidate["table"]), candidate["column"], sample_rows, budget
+                )
+        except SQLAlchemyError as exc:
+            conn.rollback()
+            reason = "budget exceeded" if budget.expired() else str(exc)
+            unverified.append({**candidate, "reason": reason})
+            continue
+        if not values:
+            unverified.append({**candidate, "reason": "no non-null values sampled"})
+            continue
+
+        bloom, parent_truncated = parents[parent_key]
+        contained = sum(1 for value in values if value in bloom)
+        containment = contained / len(values)
+        checked.append(
+            {
+                "table": candidate["table"],
+                "constrained_columns": [candidate["column"]],
+                "referred_table": candidate["referred_table"],
+                "referred_columns": [candidate["referred_column"]],
+                "inferred": True,
+                "match": candidate["match"],
+                "confidence": _confidence(candidate["match"], containment, len(values)),
+                "containment": round(containment, 4),
+                "sampled_values": len(values),
+                "parent_truncated": parent_truncated,
+                "partial_sample": budget.expired(),
+            }
+        )
+    return {"checked": checked, "unverified": unverified}
+
+
+def infer_foreign_keys(
+    connection_url: str,
+    schema: Optional[str] = None,
+    include_tables: Optional[List[str]] = None,
+    exclude_tables: Optional[List[str]] = None,
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+    budget_s: float = DEFAULT_BUDGET_S,
+    timeout_s: Optional[float] = None,
+    cache: Any = None,
+) -> Dict[str, Any]:
+    """
+    Propose undeclared foreign keys from names and types, verify them by
+    sampled containment and return edges shaped like declared foreign keys
+    (plus inferred, confidence and evidence), best first.
+    """
+    from mcp_db_analyzer.cache import cached_collect_schema
+
+    deadline = Deadline(timeout_s)
+    result = cached_collect_schema(
+        connection_url=connection_url,
+        schema=schema,
+        include_tables=include_tables,
+        exclude_tables=exclude_tables,
+        timeout_s=timeout_s,
+        fields=INFERENCE_FIELDS,
+        cache=cache,
+    )
+    if result.get("error"):
+        return result
+
+    candidates = propose_fk_candidates(result.get("tables", []), result.get("foreign_keys", []) or [], deadline)
+    proposal_cut = deadline.expired()
+    try:
+        engine = get_shared_engine(connection_url)
+        with engine.connect() as conn:
+            verified = verify_fk_candidates(
+                conn,
+                schema,
+                candidates,
+                sample_rows=max(1, int(sample_rows or DEFAULT_SAMPLE_ROWS)),
+                budget_s=budget_s if budget_s and budget_s > 0 else DEFAULT_BUDGET_S,
+                deadline=deadline,
+            )
+    except SQLAlchemyError as exc:
+        return {"schema": schema, "error": str(exc)}
+
+    checked = sorted(verified["checked"], key=lambda edge: -edge["confidence"])
+    inferred = [edge for edge in checked if edge["confidence"] >= min_confidence]
+    rejected = [edge for edge in checked if edge["confidence"] < min_confidence]
+    warnings: List[str] = []
+    if result.get("partial"):
+        warnings.append("Schema reflection was partial; candidates cover the reflected tables only.")
+    if proposal_cut:
+        warnings.append("Deadline reached while proposing candidates; later tables were not considered.")
+    return {
+        "schema": schema,
+        "dialect": result.get("dialect"),
+        "inferred": inferred,
+        "rejected": rejected,
+        "unverified": verified["unverified"],
+        "summary": {
+            "candidates": len(candidates),
+            "inferred": len(inferred),
+            "rejected": len(rejected),
+            "unverified": len(verified["unverified"]),
+        },
+        "warnings": warnings,
+    }
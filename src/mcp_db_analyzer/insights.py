@@ -1,31 +1,52 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Set
+import re
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
+from mcp_db_analyzer.sketches import MinHasher, jaccard_estimate, lsh_candidate_pairs
 
-def _table_index_lists(table: Dict[str, Any]) -> List[List[str]]:
+# Table parts the heuristics read; callers projecting fields must still reflect these.
+INSIGHT_FIELDS: FrozenSet[str] = frozenset(
+    ("columns", "primary_key", "foreign_keys", "indexes", "unique_constraints")
+)
+
+
+def _table_index_entries(table: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
-    Return a list of index column lists that "cover" lookups:
-    - PK columns
-    - Regular indexes
-    - Unique constraints
+    Named lookup structures of a table, in order: PK, regular indexes, unique
+    constraints. A unique constraint reported again as an index of the same name
+    (MySQL) is listed once.
     """
-    indexes: List[List[str]] = []
+    entries: List[Dict[str, Any]] = []
 
     pk_cols = list(table.get("primary_key", []) or [])
     if pk_cols:
-        indexes.append(pk_cols)
+        entries.append({"name": "PRIMARY KEY", "kind": "primary_key", "columns": pk_cols, "unique": True})
 
+    index_names = set()
     for idx in table.get("indexes", []) or []:
         cols = list(idx.get("columns", []) or [])
         if cols:
-            indexes.append(cols)
+            entries.append(
+                {"name": idx.get("name"), "kind": "index", "columns": cols, "unique": bool(idx.get("unique"))}
+            )
+            index_names.add(idx.get("name"))
 
     for uc in table.get("unique_constraints", []) or []:
         cols = list(uc.get("columns", []) or [])
-        if cols:
-            indexes.append(cols)
+        if cols and (uc.get("name") is None or uc.get("name") not in index_names):
+            entries.append({"name": uc.get("name"), "kind": "unique_constraint", "columns": cols, "unique": True})
 
-    return indexes
+    return entries
+
+
+def table_index_lists(table: Dict[str, Any]) -> List[List[str]]:
+    """
+    Return a list of index column lists that "cover" lookups:
+    - PK columns
+    - Regular indexes
+    - Unique constraints
+    """
+    return [entry["columns"] for entry in _table_index_entries(table)]
 
 
 def find_orphan_tables(tables: List[Dict[str, Any]], fks: List[Dict[str, Any]]) -> List[str]:
@@ -88,7 +109,7 @@ def find_missing_fk_indexes(
             continue
 
         table = table_map.get(table_name, {}) or {}
-        indexed_lists = _table_index_lists(table)
+        indexed_lists = table_index_lists(table)
 
         # Best: prefix match
         if any(_is_index_prefix(cols, fk_cols) for cols in indexed_lists):
@@ -173,9 +194,208 @@ def find_many_to_many(tables: List[Dict[str, Any]], fks: List[Dict[str, Any]]) -
     return findings
 
 
+# Which of several identical indexes to keep: constraints first, then unique.
+_KEEP_RANK = {"primary_key": 0, "unique_constraint": 1, "index": 2}
+
+
+def _entry_rank(entry: Dict[str, Any]) -> tuple:
+    return (_KEEP_RANK[entry["kind"]], not entry["unique"])
+
+
+def _shadowed(table_name: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {"table": table_name, "name": entry["name"], "kind": entry["kind"], "columns": entry["columns"]}
+
+
+def _redundant_in_table(
+    table_name: str,
+    entries: List[Dict[str, Any]],
+    findings: Dict[str, List[Dict[str, Any]]],
+) -> None:
+    # Prefix trie over lowercased column lists; node = [children, entries ending here].
+    root: List[Any] = [{}, []]
+    for entry in entries:
+        node = root
+        for col in entry["columns"]:
+            node = node[0].setdefault(col.lower(), [{}, []])
+        node[1].append(entry)
+
+    pk = next((entry for entry in entries if entry["kind"] == "primary_key"), None)
+
+    def visit(node: List[Any]) -> Optional[Dict[str, Any]]:
+        """Report this node's entries; return one entry ending at or below it."""
+        below: Optional[Dict[str, Any]] = None
+        for child in node[0].values():
+            found = visit(child)
+            below = below or found
+        ending = sorted(node[1], key=_entry_rank)
+        if not ending:
+            return below
+
+        keep, extra = ending[0], ending[1:]
+        if keep["kind"] == "primary_key":
+            for entry in [e for e in extra if e["unique"]]:
+                findings["shadowed_by_pk"].append(_shadowed(table_name, entry))
+            extra = [entry for entry in extra if not entry["unique"]]
+        if extra:
+            findings["duplicates"].append(
+                {
+                    "table": table_name,
+                    "columns": keep["columns"],
+                    "keep": keep["name"],
+                    "duplicates": [entry["name"] for entry in extra],
+                }
+            )
+        if below is not None and not keep["unique"]:
+            findings["prefix_redundant"].append(
+                {
+                    "table": table_name,
+                    "index": keep["name"],
+                    "columns": keep["columns"],
+                    "covered_by": below["name"],
+                    "covered_by_columns": below["columns"],
+                }
+            )
+        return keep
+
+    visit(root)
+
+    if pk is None:
+        return
+    pk_list = [col.lower() for col in pk["columns"]]
+    for entry in entries:
+        # Same columns as the PK in another order: the trie keeps them apart.
+        cols = [col.lower() for col in entry["columns"]]
+        if entry["unique"] and entry is not pk and cols != pk_list and set(cols) == set(pk_list):
+            findings["shadowed_by_pk"].append(_shadowed(table_name, entry))
+
+
+def find_redundant_indexes(tables: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Per table, build a prefix trie over the PK, index and unique column lists
+    (linear in the total number of index columns) and report:
+      {
+        "duplicates": [...],        # identical column lists; keep one
+        "prefix_redundant": [...],  # non-unique index that is a left prefix of another
+        "shadowed_by_pk": [...]     # unique constraint/index over exactly the PK columns
+      }
+    """
+    findings: Dict[str, List[Dict[str, Any]]] = {
+        "duplicates": [],
+        "prefix_redundant": [],
+        "shadowed_by_pk": [],
+    }
+    for table in tables:
+        name = table.get("table")
+        if name:
+            _redundant_in_table(name, _table_index_entries(table), findings)
+    return findings
+
+
+# 128 MinHash rows in 16 bands of 8: pairs above ~0.7 Jaccard collide in some band.
+_MINHASH_PERMUTATIONS = 128
+_LSH_BANDS = 16
+SIMILAR_TABLE_JACCARD = 0.8
+_MIN_SIMILARITY_COLUMNS = 3
+# Copy suffixes: orders_2021, orders_202103, orders_v2, orders_backup, orders_old ...
+_PARTITION_SUFFIX = re.compile(r"_?(?:\d{4}(?:_?\d{2}){0,2}|p?\d+|q[1-4]|v\d+)$", re.IGNORECASE)
+_COPY_SUFFIX = re.compile(r"_?(?:backup|bak|old|new|copy|tmp|temp|archive|orig)\d*$", re.IGNORECASE)
+
+
+def _column_tokens(table: Dict[str, Any]) -> Set[str]:
+    return {
+        f"{(col.get('name') or '').lower()}:{' '.join(str(col.get('type') or '').upper().split())}"
+        for col in table.get("columns", []) or []
+        if col.get("name")
+    }
+
+
+def _table_stem(name: str) -> Tuple[str, Optional[str]]:
+    """Name without a date/number or copy suffix, and which kind of suffix it had."""
+    bare = name.rsplit(".", 1)[-1]
+    if _COPY_SUFFIX.search(bare):
+        return _COPY_SUFFIX.sub("", bare).lower(), "copy"
+    if _PARTITION_SUFFIX.search(bare):
+        return _PARTITION_SUFFIX.sub("", bare).lower(), "partition"
+    return bare.lower(), None
+
+
+def _cluster_suggestion(names: List[str]) -> Dict[str, str]:
+    stems = [_table_stem(name) for name in names]
+    kinds = [kind for _, kind in stems]
+    if len({stem for stem, _ in stems}) == 1 and kinds.count("partition") >= 2 and "copy" not in kinds:
+        return {
+            "suggestion": "partition",
+            "reason": "Same columns split by a date/number suffix; consider one partitioned table.",
+        }
+    return {
+        "suggestion": "merge",
+        "reason": "Near-identical column sets; consider merging the tables or dropping stale copies.",
+    }
+
+
+def find_similar_tables(
+    tables: List[Dict[str, Any]],
+    min_jaccard: float = SIMILAR_TABLE_JACCARD,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Near-duplicate tables by their (column name, type) sets. MinHash signatures
+    are bucketed by LSH bands, so only colliding pairs are compared instead of
+    every pair of tables. Returns
+      {
+        "pairs": [...],     # table pair, jaccard_estimate, exact jaccard
+        "clusters": [...]   # connected pairs, with a partition/merge suggestion
+      }
+    """
+    token_sets = {
+        table["table"]: tokens
+        for table in tables
+        if table.get("table") and len(tokens := _column_tokens(table)) >= _MIN_SIMILARITY_COLUMNS
+    }
+    hasher = MinHasher(_MINHASH_PERMUTATIONS)
+    signatures = {name: hasher.signature(tokens) for name, tokens in token_sets.items()}
+
+    pairs: List[Dict[str, Any]] = []
+    parent: Dict[str, str] = {}
+
+    def root(name: str) -> str:
+        while parent.get(name, name) != name:
+            name = parent[name]
+        return name
+
+    for left, right in sorted(lsh_candidate_pairs(signatures, _LSH_BANDS)):
+        estimate = jaccard_estimate(signatures[left], signatures[right])
+        if estimate < min_jaccard:
+            continue
+        a, b = token_sets[left], token_sets[right]
+        pairs.append(
+            {
+                "tables": [left, right],
+                "jaccard_estimate": round(estimate, 3),
+                "jaccard": round(len(a & b) / len(a | b), 3),
+                "identical": a == b,
+            }
+        )
+        parent.setdefault(left, left)
+        parent.setdefault(right, right)
+        parent[root(right)] = root(left)
+
+    groups: Dict[str, List[str]] = {}
+    for name in sorted(parent):
+        groups.setdefault(root(name), []).append(name)
+    clusters: List[Dict[str, Any]] = []
+    for members in groups.values():
+        member_set = set(members)
+        scores = [pair["jaccard_estimate"] for pair in pairs if pair["tables"][0] in member_set]
+        clusters.append({"tables": members, "min_jaccard_estimate": min(scores), **_cluster_suggestion(members)})
+    clusters.sort(key=lambda cluster: (-len(cluster["tables"]), cluster["tables"]))
+    return {"pairs": pairs, "clusters": clusters}
+
+
 def build_insights(tables: List[Dict[str, Any]], fks: List[Dict[str, Any]]) -> Dict[str, Any]:
     return {
         "orphan_tables": find_orphan_tables(tables, fks),
         "many_to_many": find_many_to_many(tables, fks),
         "missing_fk_indexes": find_missing_fk_indexes(tables, fks),
+        "redundant_indexes": find_redundant_indexes(tables),
+        "similar_tables": find_similar_tables(tables),
     }
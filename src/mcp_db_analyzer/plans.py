@@ -0,0 +1,515 @@
+"""EXPLAIN-based query plan analysis: run, normalize into one tree, flag costly steps."""
+from __future__ import annotations
+import json
+import re
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+from mcp_db_analyzer.cache import cached_collect_schema
+from mcp_db_analyzer.db import get_shared_engine, split_schema_and_table
+from mcp_db_analyzer.deadline import Deadline, deadline_guard
+from mcp_db_analyzer.insights import table_index_lists
+
+# Normalized access kinds shared by every dialect.
+FULL_SCAN = "full_scan"
+INDEX_SCAN = "index_scan"
+INDEX_LOOKUP = "index_lookup"
+PK_LOOKUP = "pk_lookup"
+AUTO_INDEX = "auto_index"
+TEMP_BTREE = "temp_btree"
+
+_TABLE_ACCESS = (FULL_SCAN, INDEX_SCAN, INDEX_LOOKUP, PK_LOOKUP, AUTO_INDEX)
+_EXPLAIN_PREFIX = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN (FORMAT JSON) ",
+    "mysql": "EXPLAIN FORMAT=JSON ",
+    "mariadb": "EXPLAIN FORMAT=JSON ",
+}
+PLAN_FIELDS = frozenset(("columns", "primary_key", "indexes", "unique_constraints"))
+
+PlanNode = Dict[str, Any]
+
+
+def _node(
+    op: str,
+    access: Optional[str] = None,
+    table: Optional[str] = None,
+    alias: Optional[str] = None,
+    index: Optional[str] = None,
+    rows: Optional[float] = None,
+    condition: Optional[str] = None,
+    detail: Optional[str] = None,
+) -> PlanNode:
+    return {
+        "op": op,
+        "access": access,
+        "table": table,
+        "alias": alias,
+        "index": index,
+        "rows": rows,
+        "condition": condition,
+        "detail": detail or op,
+        "children": [],
+    }
+
+
+def single_statement(sql: str) -> Optional[str]:
+    """
+    Return sql without a trailing semicolon, or None when it holds more than one
+    statement. Quoted strings, quoted identifiers and comments are skipped.
+    """
+    i, n = 0, len(sql)
+    while i < n:
+        ch = sql[i]
+        if ch in ("'", '"', "`"):
+            end = sql.find(ch, i + 1)
+            while end != -1 and end + 1 < n and sql[end + 1] == ch:
+                end = sql.find(ch, end + 2)
+            if end == -1:
+                return sql.strip()
+            i = end + 1
+            continue
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = n if end == -1 else end + 1
+            continue
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        if ch == ";":
+            rest = re.sub(r"--[^\n]*|/\*.*?\*/", "", sql[i + 1 :], flags=re.S)
+            return sql[:i].strip() if not rest.strip() else None
+        i += 1
+    return sql.strip()
+
+
+_SQL_KEYWORDS = {
+    "where", "join", "inner", "left", "right", "full", "cross", "outer", "natural", "on",
+    "using", "group", "order", "limit", "having", "union", "except", "intersect", "window",
+    "set", "values", "as", "and", "or", "not", "select", "from", "offset", "straight_join",
+}
+_FROM_ITEM = re.compile(
+    r"(?:\bFROM|\bJOIN|\bUPDATE|\bINTO|,)\s+([A-Za-z_][\w$]*(?:\.[A-Za-z_][\w$]*)?)"
+    r"(?:\s+(?:AS\s+)?([A-Za-z_][\w$]*))?",
+    re.I,
+)
+
+
+def strip_quotes(sql: str) -> str:
+    """Blank out string literals and drop identifier quotes, so names match plain text."""
+    sql = re.sub(r"'(?:[^']|'')*'", "''", sql)
+    return re.sub(r"[`\"\[\]]", "", sql)
+
+
+def sql_aliases(sql: str) -> Dict[str, str]:
+    """Map aliases (and bare table names) in FROM/JOIN clauses to table names, lowercased."""
+    aliases: Dict[str, str] = {}
+    for table, alias in _FROM_ITEM.findall(strip_quotes(sql)):
+        table = table.split(".")[-1].lower()
+        if table in _SQL_KEYWORDS:
+            continue
+        aliases.setdefault(table, table)
+        if alias and alias.lower() not in _SQL_KEYWORDS:
+            aliases[alias.lower()] = table
+    return aliases
+
+
+_COMPARISON = r"(?:=|<>|!=|<=|>=|<|>|\bIN\b|\bLIKE\b|\bIS\b|\bBETWEEN\b)"
+_PREDICATE_LHS = re.compile(
+    r"(?<![\w$])(?:([A-Za-z_][\w$]*)\.)?([A-Za-z_][\w$]*)\s*" + _COMPARISON, re.I
+)
+_PREDICATE_RHS = re.compile(r"(?:=|<>|!=|<=|>=|<|>)\s*(?:([A-Za-z_][\w$]*)\.)?([A-Za-z_][\w$]*)")
+
+
+def predicate_columns(condition: str, names: Set[str], columns: List[str]) -> List[str]:
+    """
+    Columns of one table compared in condition. names holds the table's name and
+    alias (lowercase); qualified references to other tables are ignored.
+    """
+    by_lower = {col.lower(): col for col in columns}
+    condition = strip_quotes(condition)
+    found: List[str] = []
+    for pattern in (_PREDICATE_LHS, _PREDICATE_RHS):
+        for qualifier, column in pattern.findall(condition):
+            if qualifier and qualifier.lower() not in names:
+                continue
+            match = by_lower.get(column.lower())
+            if match and match not in found:
+                found.append(match)
+    return found
+
+
+# --- SQLite -----------------------------------------------------------------
+
+_SQLITE_ACCESS = re.compile(r"^(SCAN|SEARCH)\s+(?:TABLE\s+)?(\S+)(?:\s+AS\s+(\S+))?(.*)$")
+
+
+def _sqlite_node(detail: str, aliases: Dict[str, str]) -> PlanNode:
+    if detail.startswith("USE TEMP B-TREE"):
+        return _node("USE TEMP B-TREE", TEMP_BTREE, detail=detail)
+    match = _SQLITE_ACCESS.match(detail)
+    if not match or match.group(2) == "CONSTANT":
+        return _node(detail.split(" ")[0], detail=detail)
+
+    verb, name, alias, rest = match.groups()
+    table = aliases.get(name.lower(), name) if alias is None else name
+    alias = alias or (name if name.lower() != table.lower() else None)
+    index = re.search(r"USING (?:COVERING )?INDEX (\S+)", rest)
+    condition = re.search(r"\((.*)\)\s*$", rest)
+    if "AUTOMATIC" in rest:
+        access = AUTO_INDEX
+    elif "PRIMARY KEY" in rest:
+        access = PK_LOOKUP
+    elif verb == "SEARCH":
+        access = INDEX_LOOKUP
+    elif index:
+        access = INDEX_SCAN
+    else:
+        access = FULL_SCAN
+    return _node(
+        verb,
+        access,
+        table=table,
+        alias=alias,
+        index=index.group(1) if index and "AUTOMATIC" not in rest else None,
+        condition=condition.group(1) if condition else None,
+        detail=detail,
+    )
+
+
+def _group_sqlite_loops(children: List[PlanNode]) -> List[PlanNode]:
+    """
+    SQLite lists the loops of a join as siblings, outermost first. Wrap them in
+    a Nested Loop node so the tree has the same shape as other dialects.
+    """
+    for child in children:
+        child["children"] = _group_sqlite_loops(child["children"])
+    loops = [child for child in children if child["access"] in _TABLE_ACCESS]
+    if len(loops) < 2:
+        return children
+    grouped: List[PlanNode] = []
+    nested = _node("Nested Loop")
+    nested["children"] = loops
+    for child in children:
+        if child is loops[0]:
+            grouped.append(nested)
+        elif child not in loops:
+            grouped.append(child)
+    return grouped
+
+
+def normalize_sqlite_plan(rows: List[Any], sql: str) -> List[PlanNode]:
+    aliases = sql_aliases(sql)
+    nodes: Dict[int, PlanNode] = {}
+    roots: List[PlanNode] = []
+    for row in rows:
+        node_id, parent, _notused, detail = row[0], row[1], row[2], str(row[3])
+        node = nodes[node_id] = _sqlite_node(detail, aliases)
+        (nodes[parent]["children"] if parent in nodes else roots).append(node)
+    return _group_sqlite_loops(roots)
+
+
+# --- PostgreSQL -------------------------------------------------------------
+
+_PG_ACCESS = {
+    "Seq Scan": FULL_SCAN,
+    "Index Scan": INDEX_LOOKUP,
+    "Index Only Scan": INDEX_LOOKUP,
+    "Bitmap Heap Scan": INDEX_LOOKUP,
+    "Bitmap Index Scan": INDEX_LOOKUP,
+    "Sort": TEMP_BTREE,
+    "Incremental Sort": TEMP_BTREE,
+}
+_PG_CONDITIONS = ("Index Cond", "Recheck Cond", "Filter", "Join Filter", "Hash Cond", "Merge Cond")
+
+
+def _pg_node(plan: Dict[str, Any]) -> PlanNode:
+    op = str(plan.get("Node Type"))
+    access = _PG_ACCESS.get(op)
+    if op in ("Index Scan", "Index Only Scan") and not plan.get("Index Cond"):
+        access = INDEX_SCAN
+    condition = " AND ".join(str(plan[key]) for key in _PG_CONDITIONS if plan.get(key))
+    if not condition and plan.get("Sort Key"):
+        condition = ", ".join(str(key) for key in plan["Sort Key"])
+    node = _node(
+        op,
+        access,
+        table=plan.get("Relation Name"),
+        alias=plan.get("Alias"),
+        index=plan.get("Index Name"),
+        rows=plan.get("Plan Rows"),
+        condition=condition or None,
+    )
+    node["children"] = [_pg_node(child) for child in plan.get("Plans", []) or []]
+    return node
+
+
+def normalize_postgresql_plan(raw: Any) -> List[PlanNode]:
+    if isinstance(raw, str):
+        raw = json.loads(raw)
+    return [_pg_node(entry["Plan"]) for entry in raw or [] if "Plan" in entry]
+
+
+# --- MySQL ------------------------------------------------------------------
+
+_MYSQL_ACCESS = {
+    "ALL": FULL_SCAN,
+    "index": INDEX_SCAN,
+    "range": INDEX_LOOKUP,
+    "ref": INDEX_LOOKUP,
+    "eq_ref": INDEX_LOOKUP,
+    "ref_or_null": INDEX_LOOKUP,
+    "index_merge": INDEX_LOOKUP,
+    "fulltext": INDEX_LOOKUP,
+    "unique_subquery": INDEX_LOOKUP,
+    "index_subquery": INDEX_LOOKUP,
+    "const": PK_LOOKUP,
+    "system": PK_LOOKUP,
+}
+_MYSQL_OPERATIONS = ("ordering_operation", "grouping_operation", "duplicates_removal")
+
+
+def _mysql_nodes(block: Dict[str, Any]) -> List[PlanNode]:
+    nodes: List[PlanNode] = []
+    for key, value in block.items():
+        if key == "table" and isinstance(value, dict):
+            nodes.append(_mysql_table(value))
+        elif key == "nested_loop" and isinstance(value, list):
+            loop = _node("Nested Loop")
+            loop["children"] = [node for entry in value for node in _mysql_nodes(entry)]
+            nodes.append(loop)
+        elif key in _MYSQL_OPERATIONS and isinstance(value, dict):
+            sorts = value.get("using_filesort") or value.get("using_temporary_table")
+            operation = _node(key, TEMP_BTREE if sorts else None)
+            operation["children"] = _mysql_nodes(value)
+            nodes.append(operation)
+        elif isinstance(value, dict):
+            nodes.extend(_mysql_nodes(value))
+        elif isinstance(value, list):
+            for entry in value:
+                if isinstance(entry, dict):
+                    nodes.extend(_mysql_nodes(entry))
+    return nodes
+
+
+def _mysql_table(table: Dict[str, Any]) -> PlanNode:
+    access_type = str(table.get("access_type", ""))
+    node = _node(
+        "Table",
+        _MYSQL_ACCESS.get(access_type),
+        table=table.get("table_name"),
+        index=table.get("key"),
+        rows=table.get("rows_examined_per_scan"),
+        condition=table.get("attached_condition"),
+        detail=" ".join(filter(None, [access_type, table.get("using_join_buffer")])) or None,
+    )
+    node["children"] = _mysql_nodes({k: v for k, v in table.items() if isinstance(v, (dict, list))})
+    return node
+
+
+def normalize_mysql_plan(raw: Any) -> List[PlanNode]:
+    if isinstance(raw, str):
+        raw = json.loads(raw)
+    return _mysql_nodes(raw or {})
+
+
+# --- Flags ------------------------------------------------------------------
+
+
+def walk_plan(nodes: List[PlanNode]) -> Iterator[PlanNode]:
+    """Every node of a normalized plan tree, parents before children."""
+    for node in nodes:
+        yield node
+        yield from walk_plan(node["children"])
+
+
+def _first_table_node(node: PlanNode) -> Optional[PlanNode]:
+    """Descend through wrappers (Materialize, Hash, ...) to the node reading a table."""
+    while node is not None:
+        if node["table"]:
+            return node
+        node = node["children"][0] if len(node["children"]) == 1 else None
+    return None
+
+
+def find_plan_flags(tree: List[PlanNode]) -> List[Dict[str, Any]]:
+    """
+    Flag full table scans, temp B-trees/sorts, and inner loops of nested-loop
+    joins that scan (or, on SQLite, build an automatic index) for lack of an index.
+    """
+    flags: List[Dict[str, Any]] = []
+    inner: Set[int] = set()
+    for node in walk_plan(tree):
+        if node["op"] != "Nested Loop":
+            continue
+        for child in node["children"][1:]:
+            target = _first_table_node(child)
+            if target is not None and target["access"] in (FULL_SCAN, AUTO_INDEX):
+                inner.add(id(target))
+                flags.append({"kind": "nested_loop_unindexed", "node": target})
+
+    for node in walk_plan(tree):
+        if id(node) in inner:
+            continue
+        if node["access"] in (FULL_SCAN, AUTO_INDEX) and node["table"]:
+            kind = "full_scan" if node["access"] == FULL_SCAN else "nested_loop_unindexed"
+            flags.append({"kind": kind, "node": node})
+        elif node["access"] == TEMP_BTREE:
+            flags.append({"kind": "temp_btree", "node": node})
+    return flags
+
+
+def _cross_reference(
+    flag: Dict[str, Any],
+    tables: Dict[str, Dict[str, Any]],
+    sql: str,
+) -> Dict[str, Any]:
+    node = flag["node"]
+    result: Dict[str, Any] = {
+        "kind": flag["kind"],
+        "table": node["table"],
+        "alias": node["alias"],
+        "detail": node["detail"],
+        "condition": node["condition"],
+    }
+    table = tables.get(str(node["table"]).lower()) if node["table"] else None
+    if table is None:
+        return result
+
+    names = {str(node["table"]).lower()}
+    if node["alias"]:
+        names.add(str(node["alias"]).lower())
+    columns = [col["name"] for col in table.get("columns", []) or []]
+    # SQLite plans carry no filter text for scans; fall back to the query itself.
+    predicate = predicate_columns(node["condition"] or sql, names, columns)
+    leading = {cols[0].lower() for cols in table_index_lists(table)}
+    indexed = [col for col in predicate if col.lower() in leading]
+    unindexed = [col for col in predicate if col.lower() not in leading]
+
+    result.update(
+        columns=predicate,
+        indexed_columns=indexed,
+        unindexed_columns=unindexed,
+        existing_indexes=[
+            {"name": idx.get("name"), "columns": idx.get("columns", [])}
+            for idx in table.get("indexes", []) or []
+        ],
+    )
+    if flag["kind"] != "temp_btree" and unindexed:
+        result["suggested_indexes"] = [
+            {"table": node["table"], "columns": [col]} for col in unindexed
+        ]
+    return result
+
+
+@contextmanager
+def read_only(conn: Connection) -> Iterator[None]:
+    """Run the block with conn unable to write (PRAGMA query_only or a read-only transaction)."""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        previous = conn.exec_driver_sql("PRAGMA query_only").scalar()
+        conn.exec_driver_sql("PRAGMA query_only = ON")
+        try:
+            yield
+        finally:
+            conn.exec_driver_sql(f"PRAGMA query_only = {int(previous or 0)}")
+        return
+    if dialect == "postgresql":
+        conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+    elif dialect in ("mysql", "mariadb"):
+        conn.exec_driver_sql("START TRANSACTION READ ONLY")
+    try:
+        yield
+    finally:
+        conn.rollback()
+
+
+def run_explain(
+    conn: Connection,
+    sql: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> List[PlanNode]:
+    """EXPLAIN sql on conn (read-only) and return the normalized plan tree."""
+    dialect = conn.dialect.name
+    statement = _EXPLAIN_PREFIX[dialect] + sql
+    with read_only(conn):
+        if params:
+            rows = conn.execute(text(statement), params).fetchall()
+        else:
+            rows = conn.exec_driver_sql(statement).fetchall()
+    if dialect == "sqlite":
+        return normalize_sqlite_plan(rows, sql)
+    if dialect == "postgresql":
+        return normalize_postgresql_plan(rows[0][0] if rows else [])
+    return normalize_mysql_plan(rows[0][0] if rows else {})
+
+
+def analyze_query(
+    connection_url: str,
+    sql: str,
+    params: Optional[Dict[str, Any]] = None,
+    schema: Optional[str] = None,
+    timeout_s: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    EXPLAIN one statement without executing it, normalize the plan, flag
+    costly steps and check the flagged columns against the reflected indexes.
+    """
+    statement = single_statement(sql or "")
+    if not statement:
+        return {"error": "Provide exactly one SQL statement."}
+    if re.match(r"^\s*EXPLAIN\b", statement, re.I):
+        return {"error": "Pass the statement without EXPLAIN; analyze_query adds it."}
+
+    deadline = Deadline(timeout_s)
+    try:
+        engine = get_shared_engine(connection_url)
+        dialect = engine.dialect.name
+        if dialect not in _EXPLAIN_PREFIX:
+            return {"error": f"analyze_query supports sqlite, postgresql and mysql, not {dialect}."}
+        with engine.connect() as conn:
+            if schema and dialect == "postgresql":
+                conn.exec_driver_sql(f"SET LOCAL search_path TO {engine.dialect.identifier_preparer.quote(schema)}")
+            with deadline_guard(conn, deadline):
+                tree = run_explain(conn, statement, params)
+    except SQLAlchemyError as exc:
+        if deadline.expired():
+            return {"error": f"EXPLAIN did not finish within timeout_s={deadline.timeout_s}", "partial": True}
+        return {"error": str(exc)}
+
+    flags = find_plan_flags(tree)
+    flagged_tables = sorted({str(flag["node"]["table"]) for flag in flags if flag["node"]["table"]})
+    tables: Dict[str, Dict[str, Any]] = {}
+    warnings: List[str] = []
+    if flagged_tables:
+        reflected = cached_collect_schema(
+            connection_url=connection_url,
+            schema=schema,
+            include_tables=flagged_tables,
+            timeout_s=deadline.remaining() if deadline.timeout_s else None,
+            fields=PLAN_FIELDS,
+        )
+        if reflected.get("error"):
+            warnings.append(f"Indexes could not be reflected: {reflected['error']}")
+        # With a schema, reflected names are "schema.table"; plan nodes carry the bare name.
+        tables = {
+            split_schema_and_table(str(t.get("table")))[1].lower(): t
+            for t in reflected.get("tables", []) or []
+        }
+
+    summary: Dict[str, int] = {}
+    for flag in flags:
+        summary[flag["kind"]] = summary.get(flag["kind"], 0) + 1
+
+    return {
+        "dialect": dialect,
+        "plan": tree,
+        "flags": [_cross_reference(flag, tables, statement) for flag in flags],
+        "summary": summary,
+        "warnings": warnings,
+    }
@@ -0,0 +1,159 @@
+"""Opt-in cProfile capture for slow tool calls."""
+from __future__ import annotations
+import cProfile
+import functools
+import inspect
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import uuid
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+PROFILE_DIR_ENV = "MCP_DB_ANALYZER_PROFILE_DIR"
+PROFILE_THRESHOLD_ENV = "MCP_DB_ANALYZER_PROFILE_THRESHOLD_MS"
+DEFAULT_THRESHOLD_MS = 1000.0
+_TOP_FUNCTIONS = 30
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+logger = logging.getLogger(__name__)
+_state = threading.local()
+
+
+def _profile_settings() -> Optional[Tuple[Path, float]]:
+    """
+    Read profiling settings from the environment on every call, so profiling
+    can be toggled without restarting the server. Disabled unless a directory is set.
+    """
+    profile_dir = os.environ.get(PROFILE_DIR_ENV, "").strip()
+    if not profile_dir:
+        return None
+
+    raw_threshold = os.environ.get(PROFILE_THRESHOLD_ENV, "").strip()
+    try:
+        threshold_ms = float(raw_threshold) if raw_threshold else DEFAULT_THRESHOLD_MS
+    except ValueError:
+        threshold_ms = DEFAULT_THRESHOLD_MS
+
+    return Path(profile_dir), max(threshold_ms, 0.0)
+
+
+def _redact_value(key: str, value: Any) -> Any:
+    if "url" not in key.lower():
+        return value
+    # Only reached when a profile is written; keeps SQLAlchemy out of startup.
+    from mcp_db_analyzer.db import redact_connection_url
+
+    if isinstance(value, str):
+        return redact_connection_url(value)
+    if isinstance(value, (list, tuple)):
+        return [redact_connection_url(v) if isinstance(v, str) else v for v in value]
+    return value
+
+
+def redact_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Mask credentials in any argument whose name mentions a URL."""
+    return {key: _redact_value(key, value) for key, value in arguments.items()}
+
+
+def _bound_arguments(fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return dict(inspect.signature(fn).bind_partial(*args, **kwargs).arguments)
+    except (TypeError, ValueError):
+        return {"args": list(args), **kwargs}
+
+
+def _top_functions(profiler: cProfile.Profile) -> str:
+    stream = StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_TOP_FUNCTIONS)
+    return stream.getvalue()
+
+
+def _write_profile(
+    profile_dir: Path,
+    tool_name: str,
+    arguments: Dict[str, Any],
+    elapsed_ms: float,
+    threshold_ms: float,
+    profiler: cProfile.Profile,
+) -> Path:
+    """
+    Write <tool>-<timestamp>-<id>.prof (loadable with pstats/snakeviz) and a
+    .json sidecar with the redacted arguments and a cumulative-time summary.
+    """
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    base = profile_dir / f"{tool_name}-{stamp}-{uuid.uuid4().hex[:8]}"
+
+    prof_path = base.with_suffix(".prof")
+    profiler.dump_stats(str(prof_path))
+
+    metadata = {
+        "tool": tool_name,
+        "arguments": redact_arguments(arguments),
+        "elapsed_ms": round(elapsed_ms, 3),
+        "threshold_ms": threshold_ms,
+        "pid": os.getpid(),
+        "profile": prof_path.name,
+        "top_cumulative": _top_functions(profiler),
+    }
+    base.with_suffix(".json").write_text(json.dumps(metadata, indent=2, default=str), encoding="utf-8")
+    return prof_path
+
+
+def profile_slow_calls(tool_name: str) -> Callable[[F], F]:
+    """
+    Decorator for tool functions. When MCP_DB_ANALYZER_PROFILE_DIR is set, every
+    call runs under cProfile and the profile is kept only if the call took at
+    least MCP_DB_ANALYZER_PROFILE_THRESHOLD_MS. Nested tool calls are profiled
+    as part of the outermost call. cProfile only sees the calling thread, so
+    for tools that fan out to worker threads (inspect_all_schemas,
+    fleet_schema_analysis) the profile shows time spent waiting on futures,
+    not the reflection done by the workers.
+    """
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            settings = _profile_settings()
+            if settings is None or getattr(_state, "active", False):
+                return fn(*args, **kwargs)
+
+            profile_dir, threshold_ms = settings
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler owns the interpreter hook (e.g. Python 3.12+ monitoring).
+                return fn(*args, **kwargs)
+
+            _state.active = True
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.disable()
+                _state.active = False
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if elapsed_ms >= threshold_ms:
+                    try:
+                        _write_profile(
+                            profile_dir,
+                            tool_name,
+                            _bound_arguments(fn, args, kwargs),
+                            elapsed_ms,
+                            threshold_ms,
+                            profiler,
+                        )
+                    except OSError as exc:
+                        logger.warning("Could not write profile for %s: %s", tool_name, exc)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from mcp.server.fastmcp import FastMCP
+
+from mcp_db_analyzer.cache import SNAPSHOTS, Snapshot, SnapshotCache, SnapshotKey
+
+RESOURCE_PREFIX = "resource://mcp-db-analyzer"
+SNAPSHOTS_URI = f"{RESOURCE_PREFIX}/snapshots"
+DEFAULT_SCHEMA = "_default"
+_VIEWS = ("schema", "mermaid", "insights")
+
+
+def _database_id(connection_url: str) -> str:
+    from mcp_db_analyzer.db import database_id
+
+    return database_id(connection_url)
+
+
+def snapshot_uris(db_id: str, schema: Optional[str]) -> List[str]:
+    """URIs of the resources backed by the snapshot of one (database, schema)."""
+    schema_part = schema or DEFAULT_SCHEMA
+    return [f"{RESOURCE_PREFIX}/{view}/{db_id}/{schema_part}" for view in _VIEWS]
+
+
+def _is_whole_schema(key: SnapshotKey) -> bool:
+    # Snapshots filtered by include/exclude_tables do not describe the schema.
+    return key[2] is None and key[3] is None
+
+
+def find_snapshot(cache: SnapshotCache, db_id: str, schema: str) -> Optional[Snapshot]:
+    """The freshest unfiltered snapshot with the most fields, or None. Never reflects."""
+    wanted_schema = None if schema == DEFAULT_SCHEMA else schema
+    candidates = [
+        snapshot
+        for key, snapshot in cache.snapshots()
+        if key[1] == wanted_schema
+        and _is_whole_schema(key)
+        and cache.is_readable(snapshot)
+        and _database_id(key[0]) == db_id
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda s: (len(s.fields), s.created_at))
+
+
+def _missing(db_id: str, schema: str, needs: str = "") -> str:
+    hint = f" reflected with {needs}" if needs else ""
+    return json.dumps(
+        {
+            "error": f"No cached snapshot{hint} for {db_id}/{schema}. "
+            "Call inspect_schema (without include/exclude_tables) to populate it.",
+        },
+        indent=2,
+    )
+
+
+class SnapshotSubscriptions:
+    """
+    Tracks resources/subscribe requests per session and sends
+    notifications/resources/updated when a stored snapshot's digest changes.
+    Snapshots are stored on worker and watcher threads, so notifications are
+    handed to the session's event loop.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[str, Dict[Any, asyncio.AbstractEventLoop]] = {}
+        self._digests: Dict[Tuple[str, Optional[str]], str] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, uri: str, session: Any, loop: asyncio.AbstractEventLoop) -> None:
+        with self._lock:
+            self._subscribers.setdefault(uri, {})[session] = loop
+
+    def unsubscribe(self, uri: str, session: Any) -> None:
+        with self._lock:
+            sessions = self._subscribers.get(uri, {})
+            sessions.pop(session, None)
+            if not sessions:
+                self._subscribers.pop(uri, None)
+
+    def remember(self, db_id: str, schema: Optional[str], snapshot: Snapshot) -> None:
+        """Record the digest a new subscriber has seen, so only later changes notify."""
+        from mcp_db_analyzer.digest import schema_digest
+
+        digest = snapshot.derive("digest", schema_digest)
+        with self._lock:
+            self._digests.setdefault((db_id, schema), digest)
+
+    def on_snapshot_stored(self, key: SnapshotKey, snapshot: Snapshot) -> None:
+        if not _is_whole_schema(key):
+            return
+        with self._lock:
+            if not self._subscribers:
+                return
+        from mcp_db_analyzer.digest import schema_digest
+
+        db_id = _database_id(key[0])
+        uris = snapshot_uris(db_id, key[1])
+        digest = snapshot.derive("digest", schema_digest)
+        with self._lock:
+            if self._digests.get((db_id, key[1])) == digest:
+                return
+            self._digests[(db_id, key[1])] = digest
+            targets = [
+                (uri, session, loop)
+                for uri in uris + [SNAPSHOTS_URI]
+                for session, loop in self._subscribers.get(uri, {}).items()
+            ]
+        for uri, session, loop in targets:
+            self._send(uri, session, loop)
+
+    def _send(self, uri: str, session: Any, loop: asyncio.AbstractEventLoop) -> None:
+        from pydantic import AnyUrl
+
+        def done(future: "asyncio.Future[Any]") -> None:
+            if future.cancelled() or future.exception() is not None:
+                # The session went away; stop notifying it.
+                self.unsubscribe(uri, session)
+
+        try:
+            future = asyncio.run_coroutine_threadsafe(session.send_resource_updated(AnyUrl(uri)), loop)
+        except RuntimeError:  # loop closed
+            self.unsubscribe(uri, session)
+            return
+        future.add_done_callback(done)
+
+
+SUBSCRIPTIONS = SnapshotSubscriptions()
+SNAPSHOTS.add_listener(SUBSCRIPTIONS.on_snapshot_stored)
+
+
+def register_snapshot_resources(mcp: FastMCP, cache: SnapshotCache = SNAPSHOTS) -> None:
+    @mcp.resource(
+        SNAPSHOTS_URI,
+        name="schema_snapshots",
+        title="Cached Schema Snapshots",
+        description="Index of cached schema snapshots and the resource URIs that serve them.",
+        mime_type="application/json",
+    )
+    def list_snapshots() -> str:
+        from mcp_db_analyzer.db import redact_connection_url
+
+        entries: List[Dict[str, Any]] = []
+        seen: Set[Tuple[str, Optional[str]]] = set()
+        for key, snapshot in cache.snapshots():
+            if not _is_whole_schema(key) or not cache.is_readable(snapshot):
+                continue
+            db_id = _database_id(key[0])
+            if (db_id, key[1]) in seen:
+                continue
+            seen.add((db_id, key[1]))
+            entries.append(
+                {
+                    "db_id": db_id,
+                    "schema": key[1],
+                    "database": redact_connection_url(key[0]),
+                    "dialect": snapshot.result.get("dialect"),
+                    "tables_count": len(snapshot.result.get("tables", []) or []),
+                    "uris": snapshot_uris(db_id, key[1]),
+                }
+            )
+        return json.dumps({"snapshots": entries}, indent=2)
+
+    @mcp.resource(
+        f"{RESOURCE_PREFIX}/schema/{{db_id}}/{{schema}}",
+        name="schema_snapshot",
+        title="Schema Snapshot",
+        description=f"Cached inspect_schema result. Use {DEFAULT_SCHEMA} for the default schema.",
+        mime_type="application/json",
+    )
+    def schema_snapshot(db_id: str, schema: str) -> str:
+        snapshot = find_snapshot(cache, db_id, schema)
+        if snapshot is None:
+            return _missing(db_id, schema)
+        return json.dumps(snapshot.result, indent=2, default=str)
+
+    @mcp.resource(
+        f"{RESOURCE_PREFIX}/mermaid/{{db_id}}/{{schema}}",
+        name="schema_mermaid",
+        title="Schema Mermaid ER Diagram",
+        description="Mermaid ER diagram built from the cached schema snapshot.",
+        mime_type="text/plain",
+    )
+    def schema_mermaid(db_id: str, schema: str) -> str:
+        from mcp_db_analyzer.graph import build_mermaid_er
+
+        snapshot = find_snapshot(cache, db_id, schema)
+        if snapshot is None or "columns" not in snapshot.fields:
+            return _missing(db_id, schema, "columns")
+        diagram = snapshot.derive(
+            "mermaid",
+            lambda result: build_mermaid_er(result.get("tables", []), result.get("foreign_keys", []) or []),
+        )
+        return diagram.get("mermaid") or json.dumps(diagram, indent=2)
+
+    @mcp.resource(
+        f"{RESOURCE_PREFIX}/insights/{{db_id}}/{{schema}}",
+        name="schema_insights",
+        title="Schema Insights",
+        description="Heuristic insights computed from the cached schema snapshot.",
+        mime_type="application/json",
+    )
+    def schema_insights(db_id: str, schema: str) -> str:
+        from mcp_db_analyzer.insights import INSIGHT_FIELDS, build_insights
+
+        snapshot = find_snapshot(cache, db_id, schema)
+        if snapshot is None or not INSIGHT_FIELDS <= snapshot.fields:
+            return _missing(db_id, schema, "columns, keys and indexes")
+        insights = snapshot.derive(
+            "insights",
+            lambda result: build_insights(result.get("tables", []), result.get("foreign_keys", []) or []),
+        )
+        return json.dumps(insights, indent=2)
+
+    server = mcp._mcp_server
+
+    @server.subscribe_resource()
+    async def subscribe(uri: Any) -> None:
+        from mcp.server.lowlevel.server import request_ctx
+
+        uri = str(uri)
+        SUBSCRIPTIONS.subscribe(uri, request_ctx.get().session, asyncio.get_running_loop())
+        parts = uri[len(RESOURCE_PREFIX) + 1 :].split("/") if uri.startswith(RESOURCE_PREFIX) else []
+        if len(parts) == 3 and parts[0] in _VIEWS:
+            snapshot = find_snapshot(cache, parts[1], parts[2])
+            if snapshot is not None:
+                SUBSCRIPTIONS.remember(parts[1], None if parts[2] == DEFAULT_SCHEMA else parts[2], snapshot)
+
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri: Any) -> None:
+        from mcp.server.lowlevel.server import request_ctx
+
+        SUBSCRIPTIONS.unsubscribe(str(uri), request_ctx.get().session)
@@ -0,0 +1,366 @@
+"""Bounded-cost row sampling and per-column statistics over the sample."""
+from __future__ import annotations
+import json
+import random
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+from mcp_db_analyzer.db import format_table_name, get_shared_engine, quote_table_name
+from mcp_db_analyzer.deadline import Deadline, deadline_guard
+from mcp_db_analyzer.plans import read_only
+from mcp_db_analyzer.sketches import HyperLogLog
+
+DEFAULT_SAMPLE_ROWS = 10_000
+MAX_SAMPLE_ROWS = 1_000_000
+DEFAULT_TIMEOUT_S = 30.0
+BATCH_SIZE = 1_000
+# SQLite rowid ranges read per sample; more ranges spread the sample wider.
+RANGE_ROWS = 250
+MAX_VALUE_CHARS = 200
+# Fewest pages a Postgres TABLESAMPLE should expect to read.
+MIN_SAMPLE_PAGES = 8
+
+Batch = List[Tuple[Any, ...]]
+
+
+def table_columns(conn: Connection, qualified: str) -> List[str]:
+    """Column names of a table, read from an empty result rather than reflection."""
+    return list(conn.exec_driver_sql(f"SELECT * FROM {qualified} WHERE 1 = 0").keys())
+
+
+def stream_batches(conn: Connection, sql: str, params: Dict[str, Any], deadline: Deadline) -> Iterator[Batch]:
+    """Run sql with a server-side cursor and yield rows in batches until the deadline."""
+    result = conn.execute(text(sql).execution_options(stream_results=True), params)
+    try:
+        while not deadline.expired():
+            rows = result.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            yield [tuple(row) for row in rows]
+    finally:
+        result.close()
+
+
+def _sqlite_ranges(
+    conn: Connection,
+    qualified: str,
+    column_sql: str,
+    max_rows: int,
+    deadline: Deadline,
+    info: Dict[str, Any],
+) -> Iterator[Batch]:
+    """Read short runs of consecutive rowids from random starting points."""
+    low, high = conn.exec_driver_sql(f"SELECT MIN(rowid), MAX(rowid) FROM {qualified}").fetchone()
+    if low is None:
+        info["method"] = "full"
+        return
+    span = high - low + 1
+    info["rows_estimate"] = span
+    if span <= max_rows:
+        info["method"] = "full"
+        yield from stream_batches(conn, f"SELECT {column_sql} FROM {qualified}", {}, deadline)
+        return
+
+    info["method"] = "rowid_ranges"
+    # One random start per equal slice of the rowid span, so runs do not overlap.
+    ranges = -(-max_rows // RANGE_ROWS)
+    stride = span / ranges
+    starts = [
+        low + int(i * stride) + random.randrange(max(1, int(stride) - RANGE_ROWS + 1)) for i in range(ranges)
+    ]
+    sql = f"SELECT rowid, {column_sql} FROM {qualified} WHERE rowid >= :start ORDER BY rowid LIMIT :limit"
+    remaining = max_rows
+    next_rowid = low
+    # Gaps in the rowids can leave runs short; top up from after the last run.
+    for start, limit in [(start, RANGE_ROWS) for start in starts] + [(None, max_rows)]:
+        if remaining <= 0 or deadline.expired():
+            break
+        params = {"start": next_rowid if start is None else max(start, next_rowid), "limit": min(limit, remaining)}
+        for batch in stream_batches(conn, sql, params, deadline):
+            next_rowid = batch[-1][0] + 1
+            remaining -= len(batch)
+            yield [row[1:] for row in batch]
+
+
+def _postgres_tablesample(
+    conn: Connection,
+    qualified: str,
+    column_sql: str,
+    max_rows: int,
+    deadline: Deadline,
+    info: Dict[str, Any],
+) -> Iterator[Batch]:
+    """TABLESAMPLE SYSTEM reads whole random pages, sized from pg_class.reltuples."""
+    row = conn.execute(
+        text("SELECT reltuples, relpages FROM pg_class WHERE oid = to_regclass(:name)"), {"name": qualified}
+    ).fetchone()
+    reltuples, relpages = row if row is not None else (None, None)
+    if reltuples is None or reltuples <= 0 or reltuples <= max_rows:
+        # Never analyzed (reltuples -1) or small enough to read in full.
+        info["method"] = "first_rows"
+        sql = f"SELECT {column_sql} FROM {qualified} LIMIT :limit"
+    else:
+        info["method"] = "tablesample_system"
+        info["rows_estimate"] = int(reltuples)
+        # Oversample a little: page-level sampling returns a variable row count.
+        percent = 120.0 * max_rows / reltuples
+        if relpages:
+            # Small samples of big tables would often pick no page at all.
+            percent = max(percent, 100.0 * MIN_SAMPLE_PAGES / relpages)
+        percent = min(100.0, percent)
+        sql = f"SELECT {column_sql} FROM {qualified} TABLESAMPLE SYSTEM ({percent:.6f}) LIMIT :limit"
+    yield from stream_batches(conn, sql, {"limit": max_rows}, deadline)
+
+
+def sample_batches(
+    conn: Connection,
+    schema: Optional[str],
+    table: str,
+    columns: Sequence[str],
+    max_rows: int,
+    deadline: Deadline,
+) -> Tuple[Iterator[Batch], Dict[str, Any], List[str]]:
+    """
+    Stream up to max_rows rows of the given columns in fetchmany batches:
+    TABLESAMPLE on Postgres, random rowid ranges on SQLite and the first rows
+    elsewhere (and for SQLite WITHOUT ROWID tables). Reading stops when the
+    deadline passes. Returns the batches, sampling info (method and, when
+    known, rows_estimate; filled in as the batches are read) and warnings.
+    """
+    preparer = conn.dialect.identifier_preparer
+    qualified = quote_table_name(conn.dialect, schema, table)
+    column_sql = ", ".join(preparer.quote(column) for column in columns)
+    info: Dict[str, Any] = {"method": "first_rows"}
+    warnings: List[str] = []
+    dialect = conn.dialect.name
+
+    if dialect == "sqlite":
+        try:
+            conn.exec_driver_sql(f"SELECT rowid FROM {qualified} LIMIT 0")
+        except SQLAlchemyError:
+            warnings.append("WITHOUT ROWID table: sampled the first rows instead of rowid ranges.")
+        else:
+            return _sqlite_ranges(conn, qualified, column_sql, max_rows, deadline, info), info, warnings
+    elif dialect == "postgresql":
+        return _postgres_tablesample(conn, qualified, column_sql, max_rows, deadline, info), info, warnings
+    else:
+        warnings.append(f"{dialect} has no TABLESAMPLE; sampled the first rows, which may not be representative.")
+
+    sql = f"SELECT {column_sql} FROM {qualified} LIMIT :limit"
+    return stream_batches(conn, sql, {"limit": max_rows}, deadline), info, warnings
+
+
+def _counter_key(value: Any) -> Any:
+    return bytes(value) if isinstance(value, (bytearray, memoryview)) else value
+
+
+def _display_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, bytes):
+        return f"<{len(value)} bytes>"
+    rendered = str(value)
+    return rendered if len(rendered) <= MAX_VALUE_CHARS else rendered[:MAX_VALUE_CHARS] + "..."
+
+
+class ColumnSummary:
+    """Null count, HyperLogLog distinct estimate and heavy hitters for one column."""
+
+    def __init__(self, name: str, top_k: int) -> None:
+        self.name = name
+        self.top_k = top_k
+        # Keep a bounded candidate set; rare values are pruned between batches.
+        self.capacity = max(64, 8 * top_k)
+        self.rows = 0
+        self.nulls = 0
+        self.hll = HyperLogLog()
+        self.counts: Counter = Counter()
+
+    def add_batch(self, values: Sequence[Any]) -> None:
+        self.rows += len(values)
+        present = [_counter_key(value) for value in values if value is not None]
+        self.nulls += len(values) - len(present)
+        self.hll.add_many(present)
+        if self.top_k:
+            self.counts.update(present)
+            if len(self.counts) > self.capacity:
+                self.counts = Counter(dict(self.counts.most_common(self.capacity)))
+
+    def result(self) -> Dict[str, Any]:
+        present = self.rows - self.nulls
+        distinct = min(self.hll.estimate(), present)
+        return {
+            "column": self.name,
+            "nulls": self.nulls,
+            "null_fraction": round(self.nulls / self.rows, 4) if self.rows else None,
+            "distinct_estimate": distinct,
+            "distinct_fraction": round(distinct / present, 4) if present else None,
+            "top_values": [
+                {"value": _display_value(value), "count": count}
+                for value, count in self.counts.most_common(self.top_k)
+                if count > 1
+            ],
+        }
+
+
+def collect_column_stats(
+    connection_url: str,
+    table: str,
+    schema: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    max_rows: int = DEFAULT_SAMPLE_ROWS,
+    top_k: int = 5,
+    timeout_s: Optional[float] = DEFAULT_TIMEOUT_S,
+) -> Dict[str, Any]:
+    """
+    Sample at most max_rows rows of one table within timeout_s and summarize
+    each column: null fraction, distinct estimate and most common values.
+    """
+    max_rows = max(1, min(int(max_rows or DEFAULT_SAMPLE_ROWS), MAX_SAMPLE_ROWS))
+    top_k = max(0, int(top_k or 0))
+    deadline = Deadline(timeout_s)
+    summaries: List[ColumnSummary] = []
+    sampled = 0
+    truncated = False
+    info: Dict[str, Any] = {}
+    warnings: List[str] = []
+    try:
+        engine = get_shared_engine(connection_url)
+    except SQLAlchemyError as exc:
+        return {"table": format_table_name(schema, table), "error": str(exc)}
+    try:
+        with engine.connect() as conn, deadline_guard(conn, deadline):
+            available = table_columns(conn, quote_table_name(conn.dialect, schema, table))
+            wanted = list(columns) if columns else available
+            unknown = [column for column in wanted if column not in available]
+            if unknown:
+                return {"table": format_table_name(schema, table), "error": f"Unknown columns: {unknown}"}
+            summaries = [ColumnSummary(column, top_k) for column in wanted]
+            batches, info, warnings = sample_batches(conn, schema, table, wanted, max_rows, deadline)
+            for batch in batches:
+                sampled += len(batch)
+                for summary, values in zip(summaries, zip(*batch)):
+                    summary.add_batch(values)
+    except SQLAlchemyError as exc:
+        if not deadline.expired():
+            return {"table": format_table_name(schema, table), "error": str(exc)}
+        truncated = True
+    if deadline.expired():
+        truncated = True
+        warnings.append(f"Stopped sampling at timeout_s={deadline.timeout_s}; statistics cover the rows read.")
+
+    return {
+        "table": format_table_name(schema, table),
+        "dialect": engine.dialect.name,
+        "method": info.get("method"),
+        "rows_estimate": info.get("rows_estimate"),
+        "sampled_rows": sampled,
+        "max_rows": max_rows,
+        "truncated": truncated,
+        "columns": [summary.result() for summary in summaries],
+        "warnings": warnings,
+    }
+
+
+DEFAULT_PEEK_ROWS = 10
+MAX_PEEK_ROWS = 1_000
+DEFAULT_PEEK_BYTES = 64 * 1024
+MAX_PEEK_BYTES = 1024 * 1024
+
+
+def _peek_value(value: Any, max_chars: int) -> Tuple[Any, bool]:
+    """JSON-friendly value, cut to max_chars (BLOBs to max_chars hex digits); True if cut."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value, False
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        shown = data[: max(1, max_chars // 2)]
+        return "0x" + shown.hex() + ("..." if len(shown) < len(data) else ""), len(shown) < len(data)
+    rendered = str(value)
+    if len(rendered) > max_chars:
+        return rendered[:max_chars] + "...", True
+    return rendered, False
+
+
+def sample_table_rows(
+    connection_url: str,
+    tables: List[str],
+    schema: Optional[str] = None,
+    rows_per_table: int = DEFAULT_PEEK_ROWS,
+    max_value_chars: int = MAX_VALUE_CHARS,
+    max_bytes: int = DEFAULT_PEEK_BYTES,
+    timeout_s: Optional[float] = DEFAULT_TIMEOUT_S,
+) -> Dict[str, Any]:
+    """
+    A few rows per table, read-only and streamed, so agents can see real value
+    formats. Long values are cut and the whole response stays under max_bytes
+    (measured as JSON); tables past the byte or time budget are skipped.
+    """
+    if not tables:
+        return {"error": "Provide at least one table."}
+    rows_per_table = max(1, min(int(rows_per_table or DEFAULT_PEEK_ROWS), MAX_PEEK_ROWS))
+    max_value_chars = max(16, int(max_value_chars or MAX_VALUE_CHARS))
+    max_bytes = max(1024, min(int(max_bytes or DEFAULT_PEEK_BYTES), MAX_PEEK_BYTES))
+    deadline = Deadline(timeout_s)
+    try:
+        engine = get_shared_engine(connection_url)
+    except SQLAlchemyError as exc:
+        return {"error": str(exc)}
+
+    samples: List[Dict[str, Any]] = []
+    warnings: List[str] = []
+    used_bytes = 0
+    try:
+        with engine.connect() as conn:
+            for table in tables:
+                name = format_table_name(schema, table)
+                if deadline.expired() or used_bytes >= max_bytes:
+                    samples.append({"table": name, "skipped": "timeout" if deadline.expired() else "max_bytes"})
+                    continue
+                entry: Dict[str, Any] = {"rows": [], "truncated_values": 0, "stopped": None}
+                try:
+                    # One read-only transaction per table, so an error does not poison the rest.
+                    with deadline_guard(conn, deadline), read_only(conn):
+                        columns = table_columns(conn, quote_table_name(conn.dialect, schema, table))
+                        batches, info, table_warnings = sample_batches(
+                            conn, schema, table, columns, rows_per_table, deadline
+                        )
+                        try:
+                            for batch in batches:
+                                for row in batch:
+                                    peeked = [_peek_value(value, max_value_chars) for value in row]
+                                    values = [value for value, _ in peeked]
+                                    size = len(json.dumps(values, default=str))
+                                    if used_bytes + size > max_bytes:
+                                        entry["stopped"] = "max_bytes"
+                                        break
+                                    used_bytes += size
+                                    entry["rows"].append(values)
+                                    entry["truncated_values"] += sum(1 for _, cut in peeked if cut)
+                                if entry["stopped"]:
+                                    break
+                        finally:
+                            batches.close()
+                except SQLAlchemyError as exc:
+                    samples.append({"table": name, "error": "timeout" if deadline.expired() else str(exc)})
+                    continue
+                if entry["stopped"] is None and deadline.expired():
+                    entry["stopped"] = "timeout"
+                warnings.extend(f"{name}: {warning}" for warning in table_warnings)
+                samples.append({"table": name, "method": info.get("method"), "columns": columns, **entry})
+    except SQLAlchemyError as exc:
+        # Connecting failed (or the connection broke between tables).
+        return {"schema": schema, "error": str(exc)}
+
+    return {
+        "schema": schema,
+        "dialect": engine.dialect.name,
+        "samples": samples,
+        "bytes": used_bytes,
+        "max_bytes": max_bytes,
+        "warnings": warnings,
+    }
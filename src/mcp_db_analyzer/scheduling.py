@@ -0,0 +1,100 @@
+"""Run blocking tool bodies on worker threads with per-client fair-share limits."""
+from __future__ import annotations
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+import anyio
+import anyio.to_thread
+from anyio.lowlevel import RunVar
+
+DEFAULT_WORKERS = 8
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# anyio primitives belong to one event loop, so they are created per loop.
+_workers_limiter: RunVar[anyio.CapacityLimiter] = RunVar("mcp_db_analyzer_workers")
+_client_limiters: RunVar[Dict[Hashable, anyio.CapacityLimiter]] = RunVar("mcp_db_analyzer_clients")
+
+
+def _current_client_key() -> Hashable:
+    """
+    One key per MCP session (one per connected agent). Calls made outside a
+    request, e.g. from tests, share a single key.
+    """
+    from mcp.server.lowlevel.server import request_ctx
+
+    ctx = request_ctx.get(None)
+    if ctx is None:
+        return "local"
+    return id(ctx.session)
+
+
+class FairShareScheduler:
+    """
+    At most `workers` tool calls run at once across all clients, and a single
+    client may hold at most `per_client` of them, so one agent's large reflection
+    cannot starve the others. Waiters are served in FIFO order.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, per_client: Optional[int] = None) -> None:
+        self.configure(workers, per_client)
+
+    def configure(self, workers: int, per_client: Optional[int] = None) -> None:
+        self.workers = max(1, int(workers))
+        default_share = max(1, self.workers // 2)
+        self.per_client = max(1, min(int(per_client or default_share), self.workers))
+
+    def _workers(self) -> anyio.CapacityLimiter:
+        try:
+            limiter = _workers_limiter.get()
+        except LookupError:
+            limiter = anyio.CapacityLimiter(self.workers)
+            _workers_limiter.set(limiter)
+        limiter.total_tokens = self.workers
+        return limiter
+
+    def _client(self, key: Hashable) -> anyio.CapacityLimiter:
+        try:
+            limiters = _client_limiters.get()
+        except LookupError:
+            limiters = {}
+            _client_limiters.set(limiters)
+        limiter = limiters.get(key)
+        if limiter is None:
+            limiter = limiters[key] = anyio.CapacityLimiter(self.per_client)
+        return limiter
+
+    def _release_client(self, key: Hashable, limiter: anyio.CapacityLimiter) -> None:
+        stats = limiter.statistics()
+        if stats.borrowed_tokens == 0 and stats.tasks_waiting == 0:
+            _client_limiters.get().pop(key, None)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        key = _current_client_key()
+        client_limiter = self._client(key)
+        try:
+            async with client_limiter:
+                return await anyio.to_thread.run_sync(
+                    functools.partial(fn, *args, **kwargs),
+                    limiter=self._workers(),
+                )
+        finally:
+            self._release_client(key, client_limiter)
+
+
+SCHEDULER = FairShareScheduler()
+
+
+def run_in_worker(fn: F) -> Callable[..., Awaitable[Any]]:
+    """
+    Decorator for blocking tool functions: FastMCP awaits the returned coroutine
+    function, so the event loop keeps serving other clients while fn runs on a
+    worker thread under SCHEDULER's limits. The signature is preserved for schema
+    generation through functools.wraps.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await SCHEDULER.run(fn, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,271 @@
+"""Inverted index over a schema snapshot for name, prefix and fuzzy lookups."""
+from __future__ import annotations
+import heapq
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Reflection parts the index reads.
+SEARCH_FIELDS = frozenset(("columns", "indexes"))
+SEARCH_KINDS = ("table", "column", "index")
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 200
+# Same default as pg_trgm's similarity threshold.
+MIN_TRIGRAM_SIMILARITY = 0.3
+
+# Token weights by where the token came from.
+_FULL_NAME = 3.0
+_NAME_PART = 2.0
+_TYPE = 1.0
+# Match quality multipliers.
+_EXACT = 1.0
+_PREFIX = 0.7
+_FUZZY = 0.5
+
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_NON_WORD = re.compile(r"[^0-9A-Za-z]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased parts of an identifier: snake_case, camelCase and dotted names split."""
+    return [part.lower() for part in _NON_WORD.split(_CAMEL.sub(" ", text)) if part]
+
+
+def _trigrams(token: str) -> Set[str]:
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _type_token(type_text: Any) -> Optional[str]:
+    words = tokenize(str(type_text or ""))
+    return words[0] if words else None
+
+
+class SchemaIndex:
+    """
+    Postings from tokens to schema objects (tables, columns, indexes). Each
+    object is indexed under its full lowercased name, the parts of that name
+    and, for columns, its base type. A sorted token list serves prefix lookups
+    and a trigram index serves fuzzy ones.
+    """
+
+    def __init__(self) -> None:
+        self.documents: List[Dict[str, Any]] = []
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        # Forward index: each object's tokens and weights.
+        self.doc_tokens: List[Dict[str, float]] = []
+        # Postings grouped by weight, for walking the best matches first.
+        self.by_weight: Dict[str, Dict[float, List[int]]] = {}
+        self.tokens: List[str] = []
+        self.trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self.trigram_counts: Dict[str, int] = {}
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "SchemaIndex":
+        index = cls()
+        for table in result.get("tables", []) or []:
+            name = table.get("table")
+            if not name:
+                continue
+            index._add({"kind": "table", "table": name}, name.rsplit(".", 1)[-1])
+            for column in table.get("columns", []) or []:
+                if column.get("name"):
+                    index._add(
+                        {"kind": "column", "table": name, "name": column["name"], "type": column.get("type")},
+                        column["name"],
+                        _type_token(column.get("type")),
+                    )
+            for idx in table.get("indexes", []) or []:
+                if idx.get("name"):
+                    index._add(
+                        {"kind": "index", "table": name, "name": idx["name"], "columns": idx.get("columns", [])},
+                        idx["name"],
+                    )
+        index.tokens = sorted(index.postings)
+        for token, posting in index.postings.items():
+            groups: Dict[float, List[int]] = {}
+            for doc_id, weight in posting.items():
+                groups.setdefault(weight, []).append(doc_id)
+            index.by_weight[token] = groups
+        for token in index.tokens:
+            grams = _trigrams(token)
+            index.trigram_counts[token] = len(grams)
+            for gram in grams:
+                index.trigrams[gram].add(token)
+        return index
+
+    def _add(self, document: Dict[str, Any], name: str, type_token: Optional[str] = None) -> None:
+        doc_id = len(self.documents)
+        self.documents.append(document)
+        weights = {name.lower(): _FULL_NAME}
+        for part in tokenize(name):
+            weights.setdefault(part, _NAME_PART)
+        if type_token:
+            weights.setdefault(type_token, _TYPE)
+        self.doc_tokens.append(weights)
+        for token, weight in weights.items():
+            self.postings[token][doc_id] = weight
+
+    def _matches(self, term: str, fuzzy: bool) -> Dict[str, float]:
+        """
+        Index tokens matching term with their match quality: exact and prefix
+        matches, or trigram matches when there are none (a fuzzy fallback).
+        """
+        found: Dict[str, float] = {}
+        if term in self.postings:
+            found[term] = _EXACT
+        position = bisect_left(self.tokens, term)
+        while position < len(self.tokens) and self.tokens[position].startswith(term):
+            found.setdefault(self.tokens[position], _PREFIX)
+            position += 1
+        if found or not fuzzy or len(term) < 3:
+            return found
+        grams = _trigrams(term)
+        shared = Counter(chain.from_iterable(self.trigrams.get(gram, ()) for gram in grams))
+        for token, count in shared.items():
+            similarity = count / (len(grams) + self.trigram_counts[token] - count)
+            if similarity >= MIN_TRIGRAM_SIMILARITY:
+                found[token] = _FUZZY * similarity
+        return found
+
+    def search(
+        self,
+        query: str,
+        kinds: Optional[List[str]] = None,
+        limit: int = DEFAULT_LIMIT,
+        fuzzy: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Objects matching every part of the query (exactly, by prefix or
+        fuzzily), ranked by score: token weight times match quality, best match
+        per term, plus a bonus for matching the whole query as one name.
+        """
+        whole = query.strip().lower()
+        if not whole:
+            return []
+        required = set(tokenize(query)) or {whole}
+        wanted = set(kinds or SEARCH_KINDS)
+        matches = {term: self._matches(term, fuzzy) for term in required}
+        if whole not in matches:
+            # The whole query only adds a bonus; no fuzzy pass for it.
+            matches[whole] = self._matches(whole, False)
+
+        # Walk the postings of the required term with the fewest entries, best
+        # possible score first; the other terms are checked against each
+        # candidate's own tokens. Stop once no unseen object can make the top.
+        driver = min(required, key=lambda term: sum(len(self.postings[t]) for t in matches[term]))
+        levels = sorted(
+            (
+                (weight * quality, token, weight)
+                for token, quality in matches[driver].items()
+                for weight in self.by_weight[token]
+            ),
+            reverse=True,
+        )
+        others = [term for term in sorted(required | {whole}) if term != driver]
+        headroom = sum(_FULL_NAME * max(matches[term].values(), default=0.0) for term in others)
+
+        top: List[Tuple[float, int, List[str]]] = []
+        seen: Set[int] = set()
+        for bound, token, weight in levels:
+            if len(top) >= limit and top[0][0] >= bound + headroom:
+                break
+            for doc_id in self.by_weight[token][weight]:
+                if len(top) >= limit and top[0][0] >= bound + headroom:
+                    break
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                if self.documents[doc_id]["kind"] not in wanted:
+                    continue
+                scored = self._score(doc_id, required, matches)
+                if scored is None:
+                    continue
+                entry = (scored[0], -doc_id, scored[1])
+                if len(top) < limit:
+                    heapq.heappush(top, entry)
+                elif entry > top[0]:
+                    heapq.heapreplace(top, entry)
+
+        return [
+            {
+                **self.documents[-negative_id],
+                "score": round(score, 3),
+                "matched": sorted(set(matched)),
+            }
+            for score, negative_id, matched in sorted(top, reverse=True)
+        ]
+
+    def _score(
+        self,
+        doc_id: int,
+        required: Set[str],
+        matches: Dict[str, Dict[str, float]],
+    ) -> Optional[Tuple[float, List[str]]]:
+        """Sum of the best match per term, or None if a required term does not match."""
+        weights = self.doc_tokens[doc_id]
+        score = 0.0
+        matched: List[str] = []
+        for term, term_matches in matches.items():
+            best = max(
+                ((weight * term_matches[token], token) for token, weight in weights.items() if token in term_matches),
+                default=None,
+            )
+            if best is None:
+                if term in required:
+                    return None
+                continue
+            score += best[0]
+            matched.append(best[1])
+        return score, matched
+
+
+def search_schema(
+    connection_url: str,
+    query: str,
+    schema: Optional[str] = None,
+    include_tables: Optional[List[str]] = None,
+    exclude_tables: Optional[List[str]] = None,
+    kinds: Optional[List[str]] = None,
+    limit: int = DEFAULT_LIMIT,
+    fuzzy: bool = True,
+    timeout_s: Optional[float] = None,
+    cache: Any = None,
+) -> Dict[str, Any]:
+    """
+    Search table, column and index names (and column types) of one schema. The
+    index is built once per cached snapshot and reused until it expires.
+    """
+    from mcp_db_analyzer.cache import cached_derive
+
+    unknown = sorted(set(kinds or ()) - set(SEARCH_KINDS))
+    if unknown:
+        return {"error": f"Unknown kinds {unknown}. Choose from {list(SEARCH_KINDS)}."}
+    if not query or not query.strip():
+        return {"error": "Provide a non-empty query."}
+
+    result, index = cached_derive(
+        "search_index",
+        SchemaIndex.from_result,
+        connection_url=connection_url,
+        schema=schema,
+        include_tables=include_tables,
+        exclude_tables=exclude_tables,
+        timeout_s=timeout_s,
+        fields=SEARCH_FIELDS,
+        cache=cache,
+    )
+    if result.get("error"):
+        return result
+
+    limit = max(1, min(int(limit or DEFAULT_LIMIT), MAX_LIMIT))
+    matches = index.search(query, kinds=kinds, limit=limit, fuzzy=fuzzy)
+    return {
+        "schema": schema,
+        "query": query,
+        "results": matches,
+        "indexed": len(index.documents),
+        "partial": result.get("partial", False),
+    }
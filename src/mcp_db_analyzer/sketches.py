@@ -0,0 +1,153 @@
+"""Small probabilistic sketches over sampled column values."""
+from __future__ import annotations
+import math
+import random
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple
+
+
+def value_bytes(value: Any) -> bytes:
+    """
+    Stable byte form of a column value. Non-bytes values hash by their text, so
+    1 and '1' collide the way SQLite's type affinity compares them.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    return str(value).encode("utf-8", "surrogatepass")
+
+
+def hash64(value: Any, seed: int = 0) -> int:
+    digest = blake2b(value_bytes(value), digest_size=8, salt=seed.to_bytes(16, "big")).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """
+    Distinct-count estimate in 2**precision one-byte registers; the standard
+    error is about 1.04 / sqrt(2**precision) (1.6% at the default 12).
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        self._add_hash(hash64(value))
+
+    def add_many(self, values: Iterable[Any]) -> None:
+        for value in values:
+            self._add_hash(hash64(value))
+
+    def _add_hash(self, hashed: int) -> None:
+        rest_bits = 64 - self.precision
+        index = hashed >> rest_bits
+        rest = hashed & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are empty.
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class BloomFilter:
+    """
+    Set membership with no false negatives and about error_rate false
+    positives once capacity items are added. Probes come from double hashing
+    of one 128-bit digest.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(1, capacity)
+        bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.size = bits
+        self.hashes = max(1, round(bits / capacity * math.log(2)))
+        self.bits = bytearray((bits + 7) // 8)
+        self.count = 0
+
+    def _probes(self, value: Any) -> Iterable[int]:
+        digest = blake2b(value_bytes(value), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value: Any) -> None:
+        for bit in self._probes(value):
+            self.bits[bit >> 3] |= 1 << (bit & 7)
+        self.count += 1
+
+    def __contains__(self, value: Any) -> bool:
+        return all(self.bits[bit >> 3] & (1 << (bit & 7)) for bit in self._probes(value))
+
+
+_MERSENNE_61 = (1 << 61) - 1
+
+
+class MinHasher:
+    """
+    MinHash signatures of token sets, with num_perm universal hash functions
+    ((a * h + b) mod 2**61 - 1) applied to one 64-bit hash per token. Permuted
+    hashes are memoized per token, since schema tokens repeat across tables.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.coefficients = [
+            (rng.randrange(1, _MERSENNE_61), rng.randrange(0, _MERSENNE_61)) for _ in range(num_perm)
+        ]
+        self._token_hashes: Dict[Any, List[int]] = {}
+
+    def _permuted(self, token: Any) -> List[int]:
+        cached = self._token_hashes.get(token)
+        if cached is None:
+            hashed = hash64(token)
+            cached = [(a * hashed + b) % _MERSENNE_61 for a, b in self.coefficients]
+            self._token_hashes[token] = cached
+        return cached
+
+    def signature(self, tokens: Iterable[Any]) -> Tuple[int, ...]:
+        vectors = [self._permuted(token) for token in set(tokens)]
+        if not vectors:
+            return (_MERSENNE_61,) * self.num_perm
+        return tuple(map(min, *vectors)) if len(vectors) > 1 else tuple(vectors[0])
+
+
+def jaccard_estimate(left: Sequence[int], right: Sequence[int]) -> float:
+    """Fraction of agreeing MinHash components, an unbiased Jaccard estimate."""
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+def lsh_candidate_pairs(signatures: Dict[str, Sequence[int]], bands: int) -> Set[Tuple[str, str]]:
+    """
+    Pairs whose signatures agree on every row of at least one band. With r
+    rows per band, pairs above about (1 / bands) ** (1 / r) Jaccard collide.
+    """
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+    for name, signature in signatures.items():
+        rows = len(signature) // bands
+        for band in range(bands):
+            buckets.setdefault((band, tuple(signature[band * rows : (band + 1) * rows])), []).append(name)
+    pairs: Set[Tuple[str, str]] = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        members = sorted(members)
+        for i, left in enumerate(members):
+            for right in members[i + 1 :]:
+                pairs.add((left, right))
+    return pairs
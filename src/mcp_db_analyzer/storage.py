@@ -0,0 +1,164 @@
+"""On-disk size of tables and indexes, gathered with one bulk query per dialect."""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+from mcp_db_analyzer.db import filter_tables, format_table_name, get_shared_engine
+from mcp_db_analyzer.deadline import Deadline, deadline_guard
+
+TableStorage = Dict[str, Any]
+
+_PG_TABLES_SQL = """
+SELECT c.relname, pg_table_size(c.oid), pg_indexes_size(c.oid), pg_total_relation_size(c.oid)
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = COALESCE(:schema, current_schema()) AND c.relkind IN ('r', 'p', 'm')
+"""
+
+_PG_INDEXES_SQL = """
+SELECT t.relname, i.relname, pg_relation_size(i.oid)
+FROM pg_index x
+JOIN pg_class i ON i.oid = x.indexrelid
+JOIN pg_class t ON t.oid = x.indrelid
+JOIN pg_namespace n ON n.oid = t.relnamespace
+WHERE n.nspname = COALESCE(:schema, current_schema())
+"""
+
+_MYSQL_TABLES_SQL = """
+SELECT TABLE_NAME, DATA_LENGTH, INDEX_LENGTH
+FROM information_schema.TABLES
+WHERE TABLE_SCHEMA = COALESCE(:schema, DATABASE()) AND TABLE_TYPE = 'BASE TABLE'
+"""
+
+# Needs SELECT on mysql.innodb_index_stats; table totals do not.
+_MYSQL_INDEXES_SQL = """
+SELECT table_name, index_name, stat_value * @@innodb_page_size
+FROM mysql.innodb_index_stats
+WHERE database_name = COALESCE(:schema, DATABASE()) AND stat_name = 'size'
+"""
+
+
+def _entry(
+    data_bytes: Optional[int],
+    index_bytes: Optional[int],
+    total_bytes: Optional[int] = None,
+) -> TableStorage:
+    data = int(data_bytes or 0)
+    index = int(index_bytes or 0)
+    return {
+        "total_bytes": int(total_bytes) if total_bytes is not None else data + index,
+        "data_bytes": data,
+        "index_bytes": index,
+        "indexes": [],
+    }
+
+
+def _sqlite_storage(conn: Connection, schema: Optional[str]) -> Tuple[Dict[str, TableStorage], List[str]]:
+    preparer = conn.dialect.identifier_preparer
+    schema_name = schema or "main"
+    literal = "'" + schema_name.replace("'", "''") + "'"
+    try:
+        sizes = dict(
+            conn.exec_driver_sql(f"SELECT name, SUM(pgsize) FROM dbstat({literal}) GROUP BY name").fetchall()
+        )
+    except SQLAlchemyError:
+        return {}, ["SQLite was built without the dbstat virtual table; sizes unavailable."]
+
+    objects = conn.exec_driver_sql(
+        f"SELECT type, name, tbl_name FROM {preparer.quote(schema_name)}.sqlite_master "
+        "WHERE type IN ('table', 'index')"
+    ).fetchall()
+    result: Dict[str, TableStorage] = {}
+    for kind, name, table in objects:
+        if kind == "table":
+            result.setdefault(table, _entry(0, 0))["data_bytes"] = int(sizes.get(name) or 0)
+    for kind, name, table in objects:
+        if kind == "index" and table in result:
+            size = int(sizes.get(name) or 0)
+            result[table]["index_bytes"] += size
+            result[table]["indexes"].append({"name": name, "bytes": size})
+    for entry in result.values():
+        entry["total_bytes"] = entry["data_bytes"] + entry["index_bytes"]
+    return result, []
+
+
+def _postgres_storage(conn: Connection, schema: Optional[str]) -> Tuple[Dict[str, TableStorage], List[str]]:
+    result = {
+        name: _entry(data, index, total)
+        for name, data, index, total in conn.execute(text(_PG_TABLES_SQL), {"schema": schema})
+    }
+    for table, index, size in conn.execute(text(_PG_INDEXES_SQL), {"schema": schema}):
+        if table in result:
+            result[table]["indexes"].append({"name": index, "bytes": int(size or 0)})
+    return result, []
+
+
+def _mysql_storage(conn: Connection, schema: Optional[str]) -> Tuple[Dict[str, TableStorage], List[str]]:
+    result = {
+        name: _entry(data, index)
+        for name, data, index in conn.execute(text(_MYSQL_TABLES_SQL), {"schema": schema})
+    }
+    try:
+        rows = conn.execute(text(_MYSQL_INDEXES_SQL), {"schema": schema}).fetchall()
+    except SQLAlchemyError:
+        return result, ["Per-index sizes need SELECT on mysql.innodb_index_stats; only table totals reported."]
+    for table, index, size in rows:
+        if table in result:
+            result[table]["indexes"].append({"name": index, "bytes": int(size or 0)})
+    return result, []
+
+
+def table_storage(conn: Connection, schema: Optional[str]) -> Tuple[Dict[str, TableStorage], List[str]]:
+    """
+    Sizes for every table of schema in bulk, keyed by table name:
+    {"total_bytes", "data_bytes", "index_bytes", "indexes": [{"name", "bytes"}]}.
+    Unsupported dialects return an empty mapping and a warning.
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        return _sqlite_storage(conn, schema)
+    if dialect == "postgresql":
+        return _postgres_storage(conn, schema)
+    if dialect in ("mysql", "mariadb"):
+        return _mysql_storage(conn, schema)
+    return {}, [f"Storage sizes are not supported for {dialect}."]
+
+
+def collect_storage_stats(
+    connection_url: str,
+    schema: Optional[str] = None,
+    include_tables: Optional[List[str]] = None,
+    exclude_tables: Optional[List[str]] = None,
+    timeout_s: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Per-table and per-index sizes for one schema, largest tables first."""
+    deadline = Deadline(timeout_s)
+    try:
+        engine = get_shared_engine(connection_url)
+        with engine.connect() as conn, deadline_guard(conn, deadline):
+            sizes, warnings = table_storage(conn, schema)
+    except SQLAlchemyError as exc:
+        if deadline.expired():
+            return {
+                "schema": schema,
+                "error": f"Size queries did not finish within timeout_s={deadline.timeout_s}",
+            }
+        return {"schema": schema, "error": str(exc)}
+
+    names = filter_tables(sorted(sizes), schema, include_tables, exclude_tables)
+    tables = [
+        {"table": format_table_name(schema, name), **sizes[name]}
+        for name in sorted(names, key=lambda name: -sizes[name]["total_bytes"])
+    ]
+    for table in tables:
+        table["indexes"].sort(key=lambda idx: -idx["bytes"])
+    return {
+        "schema": schema,
+        "dialect": engine.dialect.name,
+        "tables": tables,
+        "total_bytes": sum(table["total_bytes"] for table in tables),
+        "warnings": warnings,
+    }
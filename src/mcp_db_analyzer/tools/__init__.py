@@ -1,7 +1,11 @@
 from mcp.server.fastmcp import FastMCP
-from src.mcp_db_analyzer.tools.info_tools import register_info_tools
+from .info_tools import register_info_tools
 from .schema_tools import register_schema_tools
 from .graph_tools import register_graph_tools
+from .fleet_tools import register_fleet_tools
+from .diff_tools import register_diff_tools
+from .query_tools import register_query_tools
+from .stats_tools import register_stats_tools
 
 
 def register_tools(mcp: FastMCP) -> None:
@@ -9,3 +13,7 @@ def register_tools(mcp: FastMCP) -> None:
     register_info_tools(mcp)
     register_schema_tools(mcp)
     register_graph_tools(mcp)
+    register_fleet_tools(mcp)
+    register_diff_tools(mcp)
+    register_query_tools(mcp)
+    register_stats_tools(mcp)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from mcp.server.fastmcp import FastMCP
+from mcp_db_analyzer.diff import diff_schemas as compute_schema_diff
+from mcp_db_analyzer.profiling import profile_slow_calls
+from mcp_db_analyzer.scheduling import run_in_worker
+
+
+def _resolve_side(
+    side: str,
+    connection_url: Optional[str],
+    snapshot: Optional[Dict[str, Any]],
+) -> Optional[str]:
+    """Return an error message when a side is not given exactly once."""
+    if (connection_url is None) == (snapshot is None):
+        return f"Provide exactly one of {side}_connection_url or {side}_snapshot."
+    if snapshot is not None and not isinstance(snapshot.get("tables"), list):
+        return f"{side}_snapshot must be an inspect_schema result with a 'tables' list."
+    if snapshot is not None and snapshot.get("format") == "compact":
+        return f"{side}_snapshot is a compact inspect_schema result; pass one returned with format=\"full\"."
+    return None
+
+
+def register_diff_tools(mcp: FastMCP) -> None:
+    """Register schema comparison tools."""
+
+    @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("diff_schemas")
+    def diff_schemas(
+        left_connection_url: Optional[str] = None,
+        right_connection_url: Optional[str] = None,
+        left_snapshot: Optional[Dict[str, Any]] = None,
+        right_snapshot: Optional[Dict[str, Any]] = None,
+        schema: Optional[str] = None,
+        include_tables: Optional[List[str]] = None,
+        exclude_tables: Optional[List[str]] = None,
+        timeout_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compare two schemas (e.g. staging vs production) using per-table digests.
+
+        Each side is either a live database (connection URL) or a previous
+        inspect_schema result (snapshot). Identical schemas are detected by
+        comparing Merkle roots; otherwise only tables whose digest changed are diffed.
+        Snapshots must use format="full". A snapshot taken with a fields projection
+        is compared only on the parts it has; the rest are listed in not_compared.
+
+        Args:
+            left_connection_url: SQLAlchemy URL of the baseline database.
+            right_connection_url: SQLAlchemy URL of the database to compare.
+            left_snapshot: inspect_schema output used instead of left_connection_url.
+            right_snapshot: inspect_schema output used instead of right_connection_url.
+            schema: Optional schema name used when reflecting live databases.
+            include_tables: Optional list of tables to include when reflecting.
+            exclude_tables: Optional list of tables to exclude when reflecting.
+            timeout_s: Optional deadline in seconds for reflecting each live side.
+                Tables skipped on either side are left out of added/removed.
+        """
+        for side, url, snapshot in (
+            ("left", left_connection_url, left_snapshot),
+            ("right", right_connection_url, right_snapshot),
+        ):
+            error = _resolve_side(side, url, snapshot)
+            if error:
+                return {"schema": schema, "error": error}
+
+        from mcp_db_analyzer.db import collect_schema
+
+        def load(url: Optional[str], snapshot: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            if snapshot is not None:
+                return snapshot
+            return collect_schema(
+                connection_url=url,
+                schema=schema,
+                include_tables=include_tables,
+                exclude_tables=exclude_tables,
+                timeout_s=timeout_s,
+            )
+
+        # Reflect both live sides in parallel; snapshots return immediately.
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="schema-diff") as pool:
+            left_future = pool.submit(load, left_connection_url, left_snapshot)
+            right_future = pool.submit(load, right_connection_url, right_snapshot)
+            left, right = left_future.result(), right_future.result()
+
+        for side, result in (("left", left), ("right", right)):
+            if result.get("error"):
+                return {"schema": schema, "error": f"{side}: {result['error']}"}
+
+        diff = compute_schema_diff(left, right)
+        diff["schema"] = schema
+
+        skipped = set(left.get("skipped_tables", []) or []) | set(right.get("skipped_tables", []) or [])
+        diff["partial"] = bool(left.get("partial") or right.get("partial"))
+        diff["skipped_tables"] = sorted(skipped)
+        if skipped:
+            # A table missing only because it was not reached is not a real difference.
+            diff["added_tables"] = [t for t in diff["added_tables"] if t not in skipped]
+            diff["removed_tables"] = [t for t in diff["removed_tables"] if t not in skipped]
+        return diff
@@ -0,0 +1,50 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+from mcp.server.fastmcp import FastMCP
+from mcp_db_analyzer.profiling import profile_slow_calls
+from mcp_db_analyzer.scheduling import run_in_worker
+
+
+def register_fleet_tools(mcp: FastMCP) -> None:
+    """Register multi-database (fleet) tools."""
+
+    @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("fleet_schema_analysis")
+    def fleet_schema_analysis(
+        connection_urls: List[str],
+        schema: Optional[str] = None,
+        include_tables: Optional[List[str]] = None,
+        exclude_tables: Optional[List[str]] = None,
+        max_concurrency: int = 8,
+        timeout_s: float = 30.0,
+        include_diagrams: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Reflect many databases (e.g. shards) concurrently and report schema drift.
+
+        Identical schemas are deduplicated by content hash, so insights and
+        Mermaid diagrams are computed once per distinct schema. Profiles of
+        slow calls cover only the calling thread, not the per-target workers.
+
+        Args:
+            connection_urls: SQLAlchemy connection URLs, one per target.
+            schema: Optional schema name applied to every target.
+            include_tables: Optional list of tables to include.
+            exclude_tables: Optional list of tables to exclude.
+            max_concurrency: Targets reflected at the same time (capped at 32); timed-out
+                targets hold their slot until their connection is released.
+            timeout_s: Per-target timeout in seconds.
+            include_diagrams: Include a Mermaid diagram per distinct schema.
+        """
+        from mcp_db_analyzer.fleet import analyze_fleet
+
+        return analyze_fleet(
+            connection_urls=connection_urls,
+            schema=schema,
+            include_tables=include_tables,
+            exclude_tables=exclude_tables,
+            max_concurrency=max_concurrency,
+            timeout_s=timeout_s,
+            include_diagrams=include_diagrams,
+        )
@@ -1,25 +1,67 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from mcp.server.fastmcp import FastMCP
 
 # ייבוא הלוגיקה ישירות מה-Database ומה-Graph builder
 # זה מבטיח שאנחנו לא תלויים ברישום של כלים אחרים
-from mcp_db_analyzer.db import collect_schema
+from mcp_db_analyzer.cache import cached_collect_schema
 from mcp_db_analyzer.graph import build_dot, build_mermaid_er
+from mcp_db_analyzer.profiling import profile_slow_calls
+from mcp_db_analyzer.scheduling import run_in_worker
+
+# Diagrams only need these parts, so skip reflecting indexes, uniques and defaults.
+_DOT_FIELDS = frozenset(("foreign_keys",))
+_MERMAID_FIELDS = frozenset(("columns", "foreign_keys"))
+
+
+def _inferred_edges(
+    connection_url: str,
+    schema: Optional[str],
+    timeout_s: Optional[float],
+    min_confidence: float,
+) -> Dict[str, Any]:
+    from mcp_db_analyzer.inference import infer_foreign_keys
+
+    return infer_foreign_keys(
+        connection_url=connection_url,
+        schema=schema,
+        min_confidence=min_confidence,
+        timeout_s=timeout_s,
+    )
+
+
+def _view_edges(connection_url: str, schema: Optional[str], timeout_s: Optional[float]) -> Dict[str, Any]:
+    from mcp_db_analyzer.views import cached_view_dependencies
+
+    return cached_view_dependencies(connection_url=connection_url, schema=schema, timeout_s=timeout_s)
+
 
 def register_graph_tools(mcp: FastMCP) -> None:
     """Register graph visualization tools."""
 
     @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("schema_graph_dot")
     def schema_graph_dot(
         connection_url: str,
         schema: Optional[str] = None,
+        timeout_s: Optional[float] = None,
+        include_inferred: bool = False,
+        min_confidence: float = 0.8,
+        include_views: bool = False,
     ) -> Dict[str, Any]:
         """
         Return a DOT graph for the schema (tables + foreign keys).
         Use this to get a technical, graphviz-compatible representation of the DB.
+        With timeout_s, the graph covers the tables reflected before the deadline.
+        With include_inferred, undeclared FKs found by infer_foreign_keys with at
+        least min_confidence are added as dashed edges.
+        With include_views, views are drawn as ellipses with dotted edges to
+        the tables and views they read.
         """
-        result = collect_schema(connection_url=connection_url, schema=schema)
+        result = cached_collect_schema(
+            connection_url=connection_url, schema=schema, timeout_s=timeout_s, fields=_DOT_FIELDS
+        )
         
         if result.get("error"):
             return result
@@ -27,28 +69,60 @@ def register_graph_tools(mcp: FastMCP) -> None:
         tables = result.get("tables", [])
         fks = result.get("foreign_keys", [])
 
-        dot_content = build_dot(tables, fks)
+        inferred: List[Dict[str, Any]] = []
+        if include_inferred:
+            inference = _inferred_edges(connection_url, schema, timeout_s, min_confidence)
+            if inference.get("error"):
+                return inference
+            inferred = inference["inferred"]
+            fks = fks + inferred
+
+        view_edges: List[Dict[str, Any]] = []
+        if include_views:
+            dependencies = _view_edges(connection_url, schema, timeout_s)
+            if dependencies.get("error"):
+                return dependencies
+            view_edges = dependencies["edges"]
+
+        dot_content = build_dot(tables, fks, view_edges)
         
         return {
             "schema": schema,
             "dot": dot_content,
             "metadata": {
                 "tables_count": len(tables),
-                "foreign_keys_count": len(fks),
+                "foreign_keys_count": len(fks) - len(inferred),
+                "inferred_foreign_keys_count": len(inferred),
+                "view_edges_count": len(view_edges),
                 "dialect": result.get("dialect"),
+                "partial": result.get("partial", False),
+                "skipped_tables": result.get("skipped_tables", []),
             }
         }
 
     @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("schema_graph_mermaid")
     def schema_graph_mermaid(
         connection_url: str,
         schema: Optional[str] = None,
+        timeout_s: Optional[float] = None,
+        include_inferred: bool = False,
+        min_confidence: float = 0.8,
+        include_views: bool = False,
     ) -> Dict[str, Any]:
         """
         Generate a Mermaid ER diagram for the schema.
         Ideal for visual documentation and understanding relationships.
+        With timeout_s, the diagram covers the tables reflected before the deadline.
+        With include_inferred, undeclared FKs found by infer_foreign_keys with at
+        least min_confidence are added as dashed (..) relationships.
+        With include_views, views get dashed "reads" relationships to the
+        tables and views they read.
         """
-        result = collect_schema(connection_url=connection_url, schema=schema)
+        result = cached_collect_schema(
+            connection_url=connection_url, schema=schema, timeout_s=timeout_s, fields=_MERMAID_FIELDS
+        )
         
         if result.get("error"):
             return result
@@ -56,7 +130,22 @@ def register_graph_tools(mcp: FastMCP) -> None:
         tables = result.get("tables", [])
         fks = result.get("foreign_keys", [])
 
-        mermaid_result = build_mermaid_er(tables=tables, fks=fks)
+        inferred: List[Dict[str, Any]] = []
+        if include_inferred:
+            inference = _inferred_edges(connection_url, schema, timeout_s, min_confidence)
+            if inference.get("error"):
+                return inference
+            inferred = inference["inferred"]
+            fks = fks + inferred
+
+        view_edges: List[Dict[str, Any]] = []
+        if include_views:
+            dependencies = _view_edges(connection_url, schema, timeout_s)
+            if dependencies.get("error"):
+                return dependencies
+            view_edges = dependencies["edges"]
+
+        mermaid_result = build_mermaid_er(tables=tables, fks=fks, view_edges=view_edges)
         
         if "error" in mermaid_result:
             return {
@@ -70,7 +159,56 @@ def register_graph_tools(mcp: FastMCP) -> None:
             "mermaid": mermaid_result["mermaid"],
             "metadata": {
                 "tables_count": len(tables),
-                "foreign_keys_count": len(fks),
+                "foreign_keys_count": len(fks) - len(inferred),
+                "inferred_foreign_keys_count": len(inferred),
+                "view_edges_count": len(view_edges),
                 "dialect": result.get("dialect"),
+                "partial": result.get("partial", False),
+                "skipped_tables": result.get("skipped_tables", []),
             }
         }
+
+    @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("infer_foreign_keys")
+    def infer_foreign_keys(
+        connection_url: str,
+        schema: Optional[str] = None,
+        include_tables: Optional[List[str]] = None,
+        exclude_tables: Optional[List[str]] = None,
+        sample_rows: int = 2_000,
+        min_confidence: float = 0.8,
+        budget_s: float = 5.0,
+        timeout_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Infer undeclared foreign keys for databases that declare none.
+
+        Candidates come from column names and types that match another table's
+        single-column primary key (orders.customer_id -> customers.id). Each is
+        verified by sampling the child column and testing the values against a
+        Bloom filter of the parent keys; containment and the naming match give
+        a confidence score.
+
+        Args:
+            connection_url: SQLAlchemy connection URL.
+            schema: Optional schema name.
+            include_tables: Optional list of tables to include.
+            exclude_tables: Optional list of tables to exclude.
+            sample_rows: Child rows sampled per candidate.
+            min_confidence: Edges below this score are reported as rejected.
+            budget_s: Time budget per candidate, including reading parent keys.
+            timeout_s: Optional overall deadline in seconds.
+        """
+        from mcp_db_analyzer.inference import infer_foreign_keys as infer
+
+        return infer(
+            connection_url=connection_url,
+            schema=schema,
+            include_tables=include_tables,
+            exclude_tables=exclude_tables,
+            sample_rows=sample_rows,
+            min_confidence=min_confidence,
+            budget_s=budget_s,
+            timeout_s=timeout_s,
+        )
@@ -1,7 +1,7 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from mcp.server.fastmcp import FastMCP
-from sqlalchemy.engine import Engine
-from src.mcp_db_analyzer.db import open_engine, get_schema_inspector
+from mcp_db_analyzer.profiling import profile_slow_calls
+from mcp_db_analyzer.scheduling import run_in_worker
 
 
 def register_info_tools(mcp: FastMCP) -> None:
@@ -17,25 +17,41 @@ def register_info_tools(mcp: FastMCP) -> None:
                 "server_info",
                 "list_schemas",
                 "inspect_schema",
+                "inspect_all_schemas",
                 "schema_graph_dot",
                 "schema_graph_mermaid",
                 "schema_insights",
+                "fleet_schema_analysis",
+                "diff_schemas",
+                "analyze_query",
+                "simulate_indexes",
+                "storage_stats",
+                "column_stats",
+                "infer_foreign_keys",
+                "search_schema",
+                "sample_rows",
+                "export_schema_catalog",
             ],
             "notes": "DB Analyzer MCP is running.",
         }
 
     @mcp.tool()
-    def list_schemas(connection_url: str) -> Dict[str, Any]:
-        """List available schemas for the given DB."""
-        
-        engine: Engine | None = None
+    @run_in_worker
+    @profile_slow_calls("list_schemas")
+    def list_schemas(connection_url: str, timeout_s: Optional[float] = None) -> Dict[str, Any]:
+        """List available schemas for the given DB (partial, empty list if timeout_s expires)."""
+        # SQLAlchemy is imported on first use to keep server startup fast.
+        from mcp_db_analyzer.db import get_schema_inspector, get_shared_engine
+        from mcp_db_analyzer.deadline import Deadline, deadline_guard
+
+        engine = None
+        deadline = Deadline(timeout_s)
         try:
-            engine = open_engine(connection_url)
-            inspector = get_schema_inspector(engine)
-            schemas = inspector.get_schema_names()
-            return {"schemas": schemas, "dialect": engine.dialect.name}
+            engine = get_shared_engine(connection_url)
+            with engine.connect() as conn, deadline_guard(conn, deadline):
+                schemas = get_schema_inspector(conn).get_schema_names()
+            return {"schemas": schemas, "dialect": engine.dialect.name, "partial": False}
         except Exception as exc:
+            if deadline.expired() and engine is not None:
+                return {"schemas": [], "dialect": engine.dialect.name, "partial": True}
             return {"schemas": [], "error": str(exc)}
-        finally:
-            if engine is not None:
-                engine.dispose()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+from mcp.server.fastmcp import FastMCP
+from mcp_db_analyzer.profiling import profile_slow_calls
+from mcp_db_analyzer.scheduling import run_in_worker
+
+
+def register_query_tools(mcp: FastMCP) -> None:
+    """Register query plan tools."""
+
+    @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("analyze_query")
+    def analyze_query(
+        connection_url: str,
+        sql: str,
+        params: Optional[Dict[str, Any]] = None,
+        schema: Optional[str] = None,
+        timeout_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        EXPLAIN a query (never executed, read-only transaction) and flag full
+        scans, temp B-trees/sorts and nested loops over unindexed joins.
+
+        The plan is normalized into one tree for SQLite, Postgres and MySQL.
+        Flagged tables are cross-referenced with their reflected indexes and
+        unindexed predicate columns come back as suggested_indexes.
+
+        Args:
+            connection_url: SQLAlchemy connection URL.
+            sql: One SQL statement, without EXPLAIN.
+            params: Optional bind parameters for :name placeholders.
+            schema: Optional schema (Postgres search_path, index reflection).
+            timeout_s: Optional deadline in seconds.
+        """
+        from mcp_db_analyzer.plans import analyze_query as explain_and_flag
+
+        return explain_and_flag(
+            connection_url=connection_url,
+            sql=sql,
+            params=params,
+            schema=schema,
+            timeout_s=timeout_s,
+        )
+
+    @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("simulate_indexes")
+    def simulate_indexes(
+        connection_url: str,
+        workload: List[str],
+        candidate_indexes: Optional[List[Dict[str, Any]]] = None,
+        sample_rows: int = 0,
+        timeout_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        What-if index test for SQLite: clone the schema into an in-memory database,
+        add candidate indexes and show which workload queries go from SCAN to SEARCH.
+        The source database is only read.
+
+        Args:
+            connection_url: SQLAlchemy SQLite connection URL.
+            workload: SQL statements to EXPLAIN before and after.
+            candidate_indexes: [{"table", "columns", "unique"?}]; defaults to the
+                missing FK indexes (analyze_query's suggested_indexes fit too).
+            sample_rows: Rows copied per table (max 10000) so planner statistics
+                reflect real data; 0 copies DDL only.
+            timeout_s: Optional deadline in seconds for reading the source.
+        """
+        from mcp_db_analyzer.whatif import simulate_indexes as run_simulation
+
+        return run_simulation(
+            connection_url=connection_url,
+            workload=workload,
+            candidate_indexes=candidate_indexes,
+            sample_rows=sample_rows,
+            timeout_s=timeout_s,
+        )
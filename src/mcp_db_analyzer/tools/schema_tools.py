@@ -1,13 +1,57 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
 from mcp.server.fastmcp import FastMCP
-from src.mcp_db_analyzer.db import collect_schema
-from src.mcp_db_analyzer.insights import build_insights
+from mcp_db_analyzer.cache import cached_collect_schema
+from mcp_db_analyzer.formats import RESPONSE_FORMATS, project_fields, to_compact
+from mcp_db_analyzer.insights import INSIGHT_FIELDS, build_insights
+from mcp_db_analyzer.profiling import profile_slow_calls
+from mcp_db_analyzer.scheduling import run_in_worker
+
+
+def _shaped_collect(
+    collect: Callable[[FrozenSet[str]], Dict[str, Any]],
+    fields: Optional[List[str]],
+    include_insights: bool,
+    format: str,
+    include_storage: bool = False,
+) -> Dict[str, Any]:
+    """
+    Reflect only what the projection (plus insights, if requested) needs, then
+    trim to the requested fields and apply the response format.
+    """
+    from mcp_db_analyzer.db import normalize_fields
+
+    if format not in RESPONSE_FORMATS:
+        return {"error": f"Unknown format {format!r}. Choose from {list(RESPONSE_FORMATS)}."}
+    try:
+        requested = normalize_fields(fields)
+    except ValueError as exc:
+        return {"error": str(exc)}
+    if include_storage:
+        requested |= {"storage"}
+
+    reflect_fields = requested | INSIGHT_FIELDS if include_insights else requested
+    result = collect(reflect_fields)
+    if result.get("error"):
+        return result
+
+    if include_insights:
+        result["insights"] = build_insights(
+            result.get("tables", []),
+            result.get("foreign_keys", []),
+        )
+    if reflect_fields != requested:
+        result = project_fields(result, requested)
+    if format == "compact":
+        result = to_compact(result)
+    return result
 
 
 def register_schema_tools(mcp: FastMCP) -> None:
     """Register schema inspection tools."""
     
     @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("inspect_schema")
     def inspect_schema(
         connection_url: str,
         schema: Optional[str] = None,
@@ -15,6 +59,10 @@ def register_schema_tools(mcp: FastMCP) -> None:
         exclude_tables: Optional[List[str]] = None,
         include_stats: bool = False,
         include_insights: bool = False,
+        timeout_s: Optional[float] = None,
+        format: str = "full",
+        fields: Optional[List[str]] = None,
+        include_storage: bool = False,
     ) -> Dict[str, Any]:
         """
         Inspect DB schema via SQLAlchemy Inspector.
@@ -26,47 +74,225 @@ def register_schema_tools(mcp: FastMCP) -> None:
             exclude_tables: Optional list of tables to exclude.
             include_stats: Include row counts per table (guarded).
             include_insights: Include heuristic insights in the same response.
+            timeout_s: Optional deadline in seconds; on expiry returns the tables
+                reflected so far with partial=true and skipped_tables.
+            format: "full" (per-column dicts) or "compact" (columnar arrays with a
+                shared "types" dictionary referenced by index).
+            fields: Optional projection of columns, defaults, primary_key,
+                foreign_keys, indexes, unique_constraints. Parts left out are not reflected.
+            include_storage: Add per-table "storage" (data/index bytes, per-index
+                sizes) from one bulk size query; same as adding "storage" to fields.
         """
-        result = collect_schema(
-            connection_url=connection_url,
-            schema=schema,
-            include_tables=include_tables,
-            exclude_tables=exclude_tables,
-            include_stats=include_stats,
+        result = _shaped_collect(
+            lambda reflect_fields: cached_collect_schema(
+                connection_url=connection_url,
+                schema=schema,
+                include_tables=include_tables,
+                exclude_tables=exclude_tables,
+                include_stats=include_stats,
+                timeout_s=timeout_s,
+                fields=reflect_fields,
+            ),
+            fields,
+            include_insights,
+            format,
+            include_storage,
         )
-
-        if include_insights and not result.get("error"):
-            result["insights"] = build_insights(
-                result.get("tables", []),
-                result.get("foreign_keys", []),
-            )
-
+        result.setdefault("schema", schema)
         return result
 
     @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("schema_insights")
     def schema_insights(
         connection_url: str,
         schema: Optional[str] = None,
         include_tables: Optional[List[str]] = None,
         exclude_tables: Optional[List[str]] = None,
+        timeout_s: Optional[float] = None,
+        include_views: bool = False,
     ) -> Dict[str, Any]:
-        """Return heuristic insights about the schema."""
-        result = inspect_schema(
-            connection_url=connection_url,
-            schema=schema,
-            include_tables=include_tables,
-            exclude_tables=exclude_tables,
-            include_insights=False,
+        """
+        Return heuristic insights about the schema (partial if timeout_s expires).
+        With include_views, view_dependencies lists the tables and views each
+        view reads and, per object, every view that depends on it (impact).
+        """
+        result = _shaped_collect(
+            lambda reflect_fields: cached_collect_schema(
+                connection_url=connection_url,
+                schema=schema,
+                include_tables=include_tables,
+                exclude_tables=exclude_tables,
+                timeout_s=timeout_s,
+                fields=reflect_fields,
+            ),
+            sorted(INSIGHT_FIELDS),
+            False,
+            "full",
         )
         if result.get("error"):
             return result
 
+        insights = build_insights(
+            result.get("tables", []),
+            result.get("foreign_keys", []),
+        )
+        if include_views:
+            from mcp_db_analyzer.views import cached_view_dependencies
+
+            insights["view_dependencies"] = cached_view_dependencies(
+                connection_url=connection_url, schema=schema, timeout_s=timeout_s
+            )
+
         return {
             "schema": schema,
             "dialect": result.get("dialect"),
-            "insights": build_insights(
-                result.get("tables", []),
-                result.get("foreign_keys", []),
-            ),
+            "insights": insights,
+            "partial": result.get("partial", False),
+            "skipped_tables": result.get("skipped_tables", []),
         }
 
+    @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("inspect_all_schemas")
+    def inspect_all_schemas(
+        connection_url: str,
+        schemas: Optional[List[str]] = None,
+        include_tables: Optional[List[str]] = None,
+        exclude_tables: Optional[List[str]] = None,
+        include_stats: bool = False,
+        include_insights: bool = False,
+        max_workers: int = 4,
+        timeout_s: Optional[float] = None,
+        format: str = "full",
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Inspect every schema (or the given ones) concurrently and merge the results.
+        Profiles of slow calls (MCP_DB_ANALYZER_PROFILE_DIR) cover only the
+        calling thread, not the per-schema worker threads.
+
+        Args:
+            connection_url: SQLAlchemy connection URL.
+            schemas: Optional schema names; defaults to all non-system schemas.
+            include_tables: Optional list of tables to include (bare or schema-qualified).
+            exclude_tables: Optional list of tables to exclude.
+            include_stats: Include row counts per table (guarded).
+            include_insights: Include heuristic insights over the merged schema.
+            max_workers: Number of schemas reflected in parallel (capped).
+            timeout_s: Optional deadline in seconds shared by all schemas.
+            format: "full" or "compact" (see inspect_schema).
+            fields: Optional projection (see inspect_schema).
+        """
+        from mcp_db_analyzer.db import collect_all_schemas
+
+        return _shaped_collect(
+            lambda reflect_fields: collect_all_schemas(
+                connection_url=connection_url,
+                schemas=schemas,
+                include_tables=include_tables,
+                exclude_tables=exclude_tables,
+                include_stats=include_stats,
+                max_workers=max_workers,
+                timeout_s=timeout_s,
+                fields=reflect_fields,
+            ),
+            fields,
+            include_insights,
+            format,
+        )
+
+    @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("search_schema")
+    def search_schema(
+        connection_url: str,
+        query: str,
+        schema: Optional[str] = None,
+        include_tables: Optional[List[str]] = None,
+        exclude_tables: Optional[List[str]] = None,
+        kinds: Optional[List[str]] = None,
+        limit: int = 20,
+        fuzzy: bool = True,
+        timeout_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Find tables, columns and indexes by name (or columns by type) without
+        pulling the whole schema, e.g. "customer_id" or "uuid".
+
+        Names are split into tokens (snake_case, camelCase); every query term
+        must match a token exactly or by prefix, or with fuzzy, by trigram
+        similarity when it has no such match. The index is built once per
+        cached schema snapshot.
+
+        Args:
+            connection_url: SQLAlchemy connection URL.
+            query: Names or name fragments to look for.
+            schema: Optional schema name.
+            include_tables: Optional list of tables to include.
+            exclude_tables: Optional list of tables to exclude.
+            kinds: Optional subset of "table", "column", "index".
+            limit: Maximum results (capped at 200).
+            fuzzy: Fall back to trigram similarity for misspelled terms.
+            timeout_s: Optional deadline in seconds for reflecting the schema.
+        """
+        from mcp_db_analyzer.search import search_schema as search
+
+        return search(
+            connection_url=connection_url,
+            query=query,
+            schema=schema,
+            include_tables=include_tables,
+            exclude_tables=exclude_tables,
+            kinds=kinds,
+            limit=limit,
+            fuzzy=fuzzy,
+            timeout_s=timeout_s,
+        )
+
+    @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("export_schema_catalog")
+    def export_schema_catalog(
+        connection_url: str,
+        output_dir: str,
+        schema: Optional[str] = None,
+        include_tables: Optional[List[str]] = None,
+        exclude_tables: Optional[List[str]] = None,
+        format: str = "parquet",
+        batch_rows: int = 10_000,
+        timeout_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Export the schema catalog to columnar files for offline analysis
+        (notebooks, fleet-wide queries) instead of large JSON dumps.
+
+        Writes one file per entity (tables, columns, foreign_keys, indexes)
+        with dictionary-encoded names and types. Tables are reflected and
+        written one at a time, so memory stays bounded on very large schemas.
+        Requires pyarrow and MCP_DB_ANALYZER_EXPORT_DIR, the server directory
+        exports are confined to.
+
+        Args:
+            connection_url: SQLAlchemy connection URL.
+            output_dir: Directory for the files, relative to the export root
+                (created if missing).
+            schema: Optional schema name.
+            include_tables: Optional list of tables to include.
+            exclude_tables: Optional list of tables to exclude.
+            format: "parquet" (.parquet files) or "arrow" (Arrow IPC streams, .arrows).
+            batch_rows: Rows buffered per entity before a batch is written.
+            timeout_s: Optional deadline in seconds; later tables are skipped.
+        """
+        from mcp_db_analyzer.export import export_schema_catalog as export
+
+        return export(
+            connection_url=connection_url,
+            output_dir=output_dir,
+            schema=schema,
+            include_tables=include_tables,
+            exclude_tables=exclude_tables,
+            format=format,
+            batch_rows=batch_rows,
+            timeout_s=timeout_s,
+        )
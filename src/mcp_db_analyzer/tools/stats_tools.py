@@ -0,0 +1,124 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+from mcp.server.fastmcp import FastMCP
+from mcp_db_analyzer.profiling import profile_slow_calls
+from mcp_db_analyzer.scheduling import run_in_worker
+
+
+def register_stats_tools(mcp: FastMCP) -> None:
+    """Register storage and data statistics tools."""
+
+    @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("storage_stats")
+    def storage_stats(
+        connection_url: str,
+        schema: Optional[str] = None,
+        include_tables: Optional[List[str]] = None,
+        exclude_tables: Optional[List[str]] = None,
+        timeout_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Report on-disk size per table and per index, largest tables first.
+
+        Uses one bulk query per dialect: SQLite dbstat, Postgres
+        pg_total_relation_size/pg_indexes_size, MySQL information_schema.TABLES
+        DATA_LENGTH/INDEX_LENGTH (per-index sizes from mysql.innodb_index_stats).
+
+        Args:
+            connection_url: SQLAlchemy connection URL.
+            schema: Optional schema name.
+            include_tables: Optional list of tables to include.
+            exclude_tables: Optional list of tables to exclude.
+            timeout_s: Optional deadline in seconds.
+        """
+        from mcp_db_analyzer.storage import collect_storage_stats
+
+        return collect_storage_stats(
+            connection_url=connection_url,
+            schema=schema,
+            include_tables=include_tables,
+            exclude_tables=exclude_tables,
+            timeout_s=timeout_s,
+        )
+
+    @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("column_stats")
+    def column_stats(
+        connection_url: str,
+        table: str,
+        schema: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        max_rows: int = 10_000,
+        top_k: int = 5,
+        timeout_s: Optional[float] = 30.0,
+    ) -> Dict[str, Any]:
+        """
+        Estimate per-column null fraction, distinct count (HyperLogLog) and most
+        common values from a bounded sample of one table.
+
+        Samples with TABLESAMPLE SYSTEM on Postgres and random rowid ranges on
+        SQLite (first rows elsewhere), streamed in fetchmany batches. Sampling
+        stops at max_rows or timeout_s, whichever comes first.
+
+        Args:
+            connection_url: SQLAlchemy connection URL.
+            table: Table name.
+            schema: Optional schema name.
+            columns: Optional subset of columns (default: all).
+            max_rows: Row budget for the sample (capped at 1,000,000).
+            top_k: Most common values to report per column (0 to skip).
+            timeout_s: Time budget in seconds; statistics cover the rows read.
+        """
+        from mcp_db_analyzer.sampling import collect_column_stats
+
+        return collect_column_stats(
+            connection_url=connection_url,
+            table=table,
+            schema=schema,
+            columns=columns,
+            max_rows=max_rows,
+            top_k=top_k,
+            timeout_s=timeout_s,
+        )
+
+    @mcp.tool()
+    @run_in_worker
+    @profile_slow_calls("sample_rows")
+    def sample_rows(
+        connection_url: str,
+        tables: List[str],
+        schema: Optional[str] = None,
+        rows_per_table: int = 10,
+        max_value_chars: int = 200,
+        max_bytes: int = 65_536,
+        timeout_s: Optional[float] = 30.0,
+    ) -> Dict[str, Any]:
+        """
+        Peek at a few real rows per table to see value formats, read-only.
+
+        Rows are streamed with server-side cursors and fetchmany (random pages
+        on Postgres, random rowid runs on SQLite, first rows elsewhere). Long
+        TEXT/BLOB values are cut, and the response stays under max_bytes.
+
+        Args:
+            connection_url: SQLAlchemy connection URL.
+            tables: Tables to sample.
+            schema: Optional schema name.
+            rows_per_table: Rows per table (capped at 1,000).
+            max_value_chars: Longest value kept; BLOBs show this many hex digits.
+            max_bytes: Cap on the JSON size of all sampled rows (at most 1 MiB).
+            timeout_s: Time budget in seconds; later tables are skipped.
+        """
+        from mcp_db_analyzer.sampling import sample_table_rows
+
+        return sample_table_rows(
+            connection_url=connection_url,
+            tables=tables,
+            schema=schema,
+            rows_per_table=rows_per_table,
+            max_value_chars=max_value_chars,
+            max_bytes=max_bytes,
+            timeout_s=timeout_s,
+        )
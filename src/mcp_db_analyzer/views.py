@@ -0,0 +1,191 @@
+"""View definitions and view -> table dependency edges, built on request."""
+from __future__ import annotations
+import re
+from typing import Any, Dict, List, Optional, Set
+
+from mcp_db_analyzer.plans import strip_quotes
+
+_PG_VIEWS_SQL = """
+SELECT viewname, definition FROM pg_views
+WHERE schemaname = COALESCE(:schema, current_schema())
+"""
+
+_MYSQL_VIEWS_SQL = """
+SELECT TABLE_NAME, VIEW_DEFINITION FROM information_schema.VIEWS
+WHERE TABLE_SCHEMA = COALESCE(:schema, DATABASE())
+"""
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+# Dotted names and parentheses; everything else in a definition is skipped.
+_TOKEN = re.compile(r"[A-Za-z_][\w$]*(?:\.[A-Za-z_][\w$]*)*|[(),]")
+_FROM_START = {"FROM", "JOIN", "STRAIGHT_JOIN"}
+# Keywords that end a FROM list; a later JOIN starts reading names again.
+_FROM_END = {
+    "WHERE", "GROUP", "ORDER", "HAVING", "LIMIT", "OFFSET", "FETCH", "WINDOW", "QUALIFY",
+    "UNION", "EXCEPT", "INTERSECT", "ON", "USING", "SELECT", "VALUES", "RETURNING", "SET",
+}
+_FROM_MODIFIERS = {"ONLY", "LATERAL"}
+
+
+def view_definitions(conn: Any, schema: Optional[str], views: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Definitions of the given views: one catalog query on SQLite, Postgres and
+    MySQL, Inspector.get_view_definition per view elsewhere. Views whose
+    definition cannot be read (missing privileges) map to None.
+    """
+    from sqlalchemy import inspect, text
+    from sqlalchemy.exc import SQLAlchemyError
+
+    wanted = set(views)
+    if not wanted:
+        return {}
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        prefix = f"{conn.dialect.identifier_preparer.quote(schema)}." if schema else ""
+        rows = conn.exec_driver_sql(f"SELECT name, sql FROM {prefix}sqlite_master WHERE type = 'view'")
+    elif dialect == "postgresql":
+        rows = conn.execute(text(_PG_VIEWS_SQL), {"schema": schema})
+    elif dialect in ("mysql", "mariadb"):
+        rows = conn.execute(text(_MYSQL_VIEWS_SQL), {"schema": schema})
+    else:
+        inspector = inspect(conn)
+        definitions: Dict[str, Optional[str]] = {}
+        for view in views:
+            try:
+                definitions[view] = inspector.get_view_definition(view, schema=schema)
+            except (SQLAlchemyError, NotImplementedError):
+                definitions[view] = None
+        return definitions
+    found = {name: definition for name, definition in rows if name in wanted}
+    return {view: found.get(view) for view in views}
+
+
+def table_references(sql: str, known: Dict[str, str], schema: Optional[str] = None) -> List[str]:
+    """
+    Objects a view definition reads from: the name after FROM or JOIN, and
+    after each comma of a FROM list, also inside the parentheses that
+    pg_get_viewdef and MySQL put around joins ("FROM (customers c JOIN ...").
+    Commas in select lists and function arguments do not count. Names are kept
+    only when they name a known table or view: known maps lowercased bare
+    names to their reported names, so CTE names drop out. With schema, names
+    qualified with another schema are skipped.
+    """
+    found: List[str] = []
+    # One [in_from_list, expecting_name] frame per open parenthesis.
+    frames = [[False, False]]
+    for token in _TOKEN.findall(strip_quotes(_COMMENTS.sub(" ", sql))):
+        frame = frames[-1]
+        if token == "(":
+            # "FROM (" opens a parenthesized join (or a subquery, whose SELECT resets it).
+            frames.append([frame[1], frame[1]])
+        elif token == ")":
+            if len(frames) > 1:
+                frames.pop()
+            frames[-1][1] = False
+        elif token == ",":
+            frame[1] = frame[0]
+        elif token.upper() in _FROM_START:
+            frame[0] = frame[1] = True
+        elif token.upper() in _FROM_END:
+            frame[0] = frame[1] = False
+        elif token.upper() in _FROM_MODIFIERS:
+            continue
+        elif frame[1]:
+            frame[1] = False
+            parts = token.lower().split(".")
+            if schema is not None and len(parts) > 1 and parts[-2] != schema.lower():
+                continue
+            reported = known.get(parts[-1])
+            if reported is not None and reported not in found:
+                found.append(reported)
+    return found
+
+
+def build_view_dependencies(
+    conn: Any,
+    schema: Optional[str],
+    tables: List[str],
+    views: List[str],
+) -> Dict[str, Any]:
+    """
+    Edges from each view to the tables and views its definition reads, plus the
+    reverse, transitive map of which views depend on each object (impact).
+    Table and view names are reported like collect_schema's table entries.
+    """
+    from mcp_db_analyzer.db import format_table_name
+
+    names = {table: table for table in tables}
+    names.update({view: format_table_name(schema, view) for view in views})
+    known = {name.rsplit(".", 1)[-1].lower(): reported for name, reported in names.items()}
+    view_names = {format_table_name(schema, view) for view in views}
+    # Catalog text qualifies names with the schema even when it is the default one.
+    target_schema = schema or getattr(conn.dialect, "default_schema_name", None)
+
+    edges: List[Dict[str, str]] = []
+    unparsed: List[str] = []
+    definitions = view_definitions(conn, schema, views)
+    for view in views:
+        definition = definitions.get(view)
+        name = format_table_name(schema, view)
+        if not definition:
+            unparsed.append(name)
+            continue
+        for referenced in table_references(definition, known, target_schema):
+            if referenced != name:
+                kind = "view" if referenced in view_names else "table"
+                edges.append({"view": name, "references": referenced, "kind": kind})
+
+    direct: Dict[str, Set[str]] = {}
+    for edge in edges:
+        direct.setdefault(edge["references"], set()).add(edge["view"])
+    dependents: Dict[str, List[str]] = {}
+    for target in sorted(direct):
+        seen: Set[str] = set()
+        stack = list(direct[target])
+        while stack:
+            view = stack.pop()
+            if view in seen:
+                continue
+            seen.add(view)
+            stack.extend(direct.get(view, ()))
+        dependents[target] = sorted(seen)
+    return {"edges": edges, "dependents": dependents, "unparsed_views": unparsed}
+
+
+def cached_view_dependencies(
+    connection_url: str,
+    schema: Optional[str] = None,
+    timeout_s: Optional[float] = None,
+    cache: Any = None,
+) -> Dict[str, Any]:
+    """
+    View dependencies for a schema, read and parsed on first request and then
+    kept with the cached snapshot, like diagrams and insights.
+    """
+    from sqlalchemy.exc import SQLAlchemyError
+    from mcp_db_analyzer.cache import cached_derive
+    from mcp_db_analyzer.db import get_shared_engine
+    from mcp_db_analyzer.deadline import Deadline, deadline_guard
+
+    def build(result: Dict[str, Any]) -> Dict[str, Any]:
+        # Errors propagate, so a failed read is not kept with the snapshot.
+        tables = [table["table"] for table in result.get("tables", []) if table.get("table")]
+        engine = get_shared_engine(connection_url)
+        with engine.connect() as conn, deadline_guard(conn, Deadline(timeout_s)):
+            return build_view_dependencies(conn, schema, tables, list(result.get("views", []) or []))
+
+    try:
+        result, dependencies = cached_derive(
+            "view_dependencies",
+            build,
+            connection_url=connection_url,
+            schema=schema,
+            timeout_s=timeout_s,
+            fields=frozenset(),
+            cache=cache,
+        )
+    except SQLAlchemyError as exc:
+        return {"error": f"Could not read view definitions: {exc}"}
+    if result.get("error"):
+        return result
+    return dependencies
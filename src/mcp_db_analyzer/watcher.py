@@ -0,0 +1,175 @@
+"""Background watcher that keeps cached schema snapshots warm across DDL changes."""
+from __future__ import annotations
+import logging
+import os
+import random
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from mcp_db_analyzer.cache import SNAPSHOTS, Snapshot, SnapshotCache, SnapshotKey, cached_collect_schema
+
+WATCH_INTERVAL_ENV = "MCP_DB_ANALYZER_WATCH_INTERVAL_S"
+WATCH_JITTER_ENV = "MCP_DB_ANALYZER_WATCH_JITTER_S"
+PROBE_TIMEOUT_S = 5.0
+REFRESH_TIMEOUT_S = 120.0
+
+logger = logging.getLogger(__name__)
+
+# Postgres keeps no DDL timestamps; every DDL statement rewrites catalog rows,
+# which changes their xmin, so counts and xmin sums over the schema's catalog
+# rows change whenever a table, column, index or constraint does.
+_PG_FINGERPRINT_SQL = """
+WITH ns AS (
+    SELECT oid FROM pg_namespace WHERE nspname = COALESCE(:schema, current_schema())
+), rel AS (
+    SELECT c.oid, c.xmin FROM pg_class c WHERE c.relnamespace IN (SELECT oid FROM ns)
+)
+SELECT
+    (SELECT count(*) FROM rel),
+    (SELECT COALESCE(sum(xmin::text::bigint), 0) FROM rel),
+    (SELECT count(*) FROM pg_attribute a WHERE a.attrelid IN (SELECT oid FROM rel) AND a.attnum > 0),
+    (SELECT COALESCE(sum(a.xmin::text::bigint), 0) FROM pg_attribute a
+        WHERE a.attrelid IN (SELECT oid FROM rel) AND a.attnum > 0),
+    (SELECT count(*) FROM pg_constraint k WHERE k.connamespace IN (SELECT oid FROM ns)),
+    (SELECT COALESCE(sum(k.xmin::text::bigint), 0) FROM pg_constraint k
+        WHERE k.connamespace IN (SELECT oid FROM ns))
+"""
+
+# InnoDB resets CREATE_TIME on ALTER TABLE; the counts catch in-place changes.
+_MYSQL_FINGERPRINT_SQL = """
+SELECT
+    (SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = COALESCE(:schema, DATABASE())),
+    (SELECT MAX(CREATE_TIME) FROM information_schema.TABLES WHERE TABLE_SCHEMA = COALESCE(:schema, DATABASE())),
+    (SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = COALESCE(:schema, DATABASE())),
+    (SELECT COUNT(*) FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = COALESCE(:schema, DATABASE())),
+    (SELECT COUNT(*) FROM information_schema.TABLE_CONSTRAINTS WHERE TABLE_SCHEMA = COALESCE(:schema, DATABASE()))
+"""
+
+
+def _env_seconds(name: str) -> Optional[float]:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+def probe_fingerprint(connection_url: str, schema: Optional[str]) -> Optional[Tuple[Any, ...]]:
+    """
+    Cheap catalog fingerprint that changes whenever the schema's DDL does:
+    SQLite PRAGMA schema_version, Postgres catalog row versions, MySQL
+    information_schema timestamps and counts. None when the dialect is not
+    supported or the probe fails.
+    """
+    from sqlalchemy import text
+    from sqlalchemy.exc import SQLAlchemyError
+    from mcp_db_analyzer.db import get_shared_engine
+    from mcp_db_analyzer.deadline import Deadline, deadline_guard
+
+    try:
+        engine = get_shared_engine(connection_url)
+        dialect = engine.dialect.name
+        with engine.connect() as conn, deadline_guard(conn, Deadline(PROBE_TIMEOUT_S)):
+            if dialect == "sqlite":
+                prefix = f"{engine.dialect.identifier_preparer.quote(schema)}." if schema else ""
+                row = conn.exec_driver_sql(f"PRAGMA {prefix}schema_version").fetchone()
+            elif dialect == "postgresql":
+                row = conn.execute(text(_PG_FINGERPRINT_SQL), {"schema": schema}).fetchone()
+            elif dialect in ("mysql", "mariadb"):
+                row = conn.execute(text(_MYSQL_FINGERPRINT_SQL), {"schema": schema}).fetchone()
+            else:
+                return None
+    except (SQLAlchemyError, ValueError) as exc:
+        logger.debug("Fingerprint probe failed for %s: %s", schema, exc)
+        return None
+    return (dialect,) + tuple(str(value) for value in row) if row is not None else None
+
+
+class SchemaWatcher:
+    """
+    Polls the catalog fingerprint of every (database, schema) with a cached
+    snapshot. Unchanged snapshots get their TTL restarted; changed ones are
+    re-reflected in the background, so tool calls are served warm.
+    """
+
+    def __init__(self, cache: SnapshotCache = SNAPSHOTS) -> None:
+        self.cache = cache
+        self.interval_s = 0.0
+        self.jitter_s = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _fingerprint_key(self, key: SnapshotKey) -> Optional[Tuple[Any, ...]]:
+        return probe_fingerprint(key[0], key[1])
+
+    def start(self, interval_s: Optional[float] = None, jitter_s: Optional[float] = None) -> bool:
+        """
+        Start polling every interval_s seconds plus a random delay of up to
+        jitter_s (defaults from MCP_DB_ANALYZER_WATCH_INTERVAL_S / _JITTER_S).
+        Returns False when the interval is unset or not positive.
+        """
+        interval = interval_s if interval_s is not None else _env_seconds(WATCH_INTERVAL_ENV)
+        if not interval or interval <= 0 or self.running:
+            return False
+        jitter = jitter_s if jitter_s is not None else _env_seconds(WATCH_JITTER_ENV)
+        self.interval_s = interval
+        self.jitter_s = max(0.0, jitter if jitter is not None else interval / 10)
+        self.cache.fingerprinter = self._fingerprint_key
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="mcp-db-analyzer-watcher", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_s + self.jitter_s + 1)
+        self._thread = None
+        self.cache.fingerprinter = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_s + random.uniform(0, self.jitter_s)):
+            try:
+                self.poll_once()
+            except Exception:  # keep watching; one bad poll must not stop the thread
+                logger.exception("Schema watcher poll failed")
+
+    def poll_once(self) -> Dict[str, int]:
+        """Probe each watched schema once. Returns counts of confirmed and refreshed snapshots."""
+        groups: Dict[Tuple[str, Optional[str]], List[Tuple[SnapshotKey, Snapshot]]] = {}
+        for key, snapshot in self.cache.snapshots():
+            groups.setdefault((key[0], key[1]), []).append((key, snapshot))
+
+        confirmed = refreshed = 0
+        for (connection_url, schema), entries in groups.items():
+            current = probe_fingerprint(connection_url, schema)
+            if current is None:
+                continue
+            for key, snapshot in entries:
+                if snapshot.fingerprint == current:
+                    confirmed += self.cache.touch(key, snapshot)
+                    continue
+                if not self.cache.discard(key, snapshot):
+                    continue
+                _, _, include_tables, exclude_tables, include_stats = key
+                cached_collect_schema(
+                    connection_url=connection_url,
+                    schema=schema,
+                    include_tables=list(include_tables) if include_tables else None,
+                    exclude_tables=list(exclude_tables) if exclude_tables else None,
+                    include_stats=include_stats,
+                    timeout_s=REFRESH_TIMEOUT_S,
+                    fields=snapshot.fields,
+                    cache=self.cache,
+                )
+                refreshed += 1
+        return {"schemas": len(groups), "confirmed": confirmed, "refreshed": refreshed}
+
+
+WATCHER = SchemaWatcher()
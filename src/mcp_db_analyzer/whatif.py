@@ -0,0 +1,310 @@
+"""What-if index simulation on an in-memory clone of a SQLite schema."""
+from __future__ import annotations
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from mcp_db_analyzer.db import get_shared_engine
+from mcp_db_analyzer.deadline import Deadline, deadline_guard
+from mcp_db_analyzer.insights import find_missing_fk_indexes
+from mcp_db_analyzer.plans import (
+    AUTO_INDEX,
+    FULL_SCAN,
+    INDEX_LOOKUP,
+    PK_LOOKUP,
+    normalize_sqlite_plan,
+    read_only,
+    single_statement,
+    walk_plan,
+)
+
+MAX_SAMPLE_ROWS = 10_000
+_SEEKS = (INDEX_LOOKUP, PK_LOOKUP)
+_SCANS = (FULL_SCAN, AUTO_INDEX)
+
+
+class _NullParams(dict):
+    """Binds every named parameter to NULL; plans do not depend on the values."""
+
+    def __missing__(self, key: str) -> None:
+        return None
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _explain_rows(conn: sqlite3.Connection, sql: str) -> List[Tuple[Any, ...]]:
+    statement = "EXPLAIN QUERY PLAN " + sql
+    try:
+        return conn.execute(statement, _NullParams()).fetchall()
+    except sqlite3.ProgrammingError:
+        pass
+    try:
+        return conn.execute(statement).fetchall()
+    except sqlite3.ProgrammingError as exc:
+        # Positional placeholders: sqlite3 reports how many it expected.
+        match = re.search(r"uses (\d+)", str(exc))
+        if not match:
+            raise
+        return conn.execute(statement, [None] * int(match.group(1))).fetchall()
+
+
+def _clone_source(
+    connection_url: str,
+    sample_rows: int,
+    deadline: Deadline,
+) -> Tuple[sqlite3.Connection, List[Dict[str, Any]], str, List[str]]:
+    """
+    Copy tables, indexes and views (and sqlite_stat1, so the planner sees the
+    same statistics) into a new in-memory database. The source is only read,
+    under PRAGMA query_only. Returns the clone, the source foreign keys, how
+    planner statistics were obtained and warnings.
+    """
+    engine = get_shared_engine(connection_url)
+    if engine.dialect.name != "sqlite":
+        raise ValueError(f"simulate_indexes supports sqlite, not {engine.dialect.name}.")
+
+    clone = sqlite3.connect(":memory:", check_same_thread=False)
+    try:
+        warnings: List[str] = []
+        fks: List[Dict[str, Any]] = []
+        with engine.connect() as conn, deadline_guard(conn, deadline), read_only(conn):
+            objects = conn.exec_driver_sql(
+                "SELECT type, name, tbl_name, sql FROM sqlite_master "
+                "WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' "
+                "ORDER BY CASE type WHEN 'table' THEN 0 WHEN 'index' THEN 1 ELSE 2 END"
+            ).fetchall()
+            tables: List[str] = []
+            for kind, name, table_name, sql in objects:
+                if kind == "trigger":
+                    continue
+                if kind == "table" and sql.upper().startswith("CREATE VIRTUAL"):
+                    warnings.append(f"Virtual table {name} not cloned.")
+                    continue
+                try:
+                    clone.execute(sql)
+                except sqlite3.Error as exc:
+                    warnings.append(f"Could not clone {kind} {name}: {exc}")
+                    continue
+                if kind == "table":
+                    tables.append(name)
+
+            for table in tables:
+                for row in conn.exec_driver_sql(f"PRAGMA foreign_key_list({_quote(table)})").fetchall():
+                    fks.append({"table": table, "referred_table": row[2], "columns": (row[0], row[3], row[4])})
+                if sample_rows <= 0 or deadline.expired():
+                    continue
+                columns = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({_quote(table)})")]
+                column_list = ", ".join(_quote(col) for col in columns)
+                rows = conn.exec_driver_sql(
+                    f"SELECT {column_list} FROM {_quote(table)} LIMIT {int(sample_rows)}"
+                ).fetchall()
+                clone.executemany(
+                    f"INSERT INTO {_quote(table)} ({column_list}) VALUES ({', '.join('?' * len(columns))})",
+                    [tuple(row) for row in rows],
+                )
+
+            has_stats = conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            ).fetchone()
+            statistics = "none"
+            if has_stats:
+                clone.execute("ANALYZE")  # creates sqlite_stat1
+                clone.execute("DELETE FROM sqlite_stat1")
+                stats = conn.exec_driver_sql("SELECT tbl, idx, stat FROM sqlite_stat1").fetchall()
+                clone.executemany("INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (?, ?, ?)", stats)
+                clone.execute("ANALYZE sqlite_master")  # reload the copied statistics
+                statistics = "copied"
+            elif sample_rows > 0:
+                clone.execute("ANALYZE")
+                statistics = "sampled"
+        clone.commit()
+    except BaseException:
+        # Reflection or copying failed part way; do not leak the in-memory clone.
+        clone.close()
+        raise
+    return clone, _fk_entries(fks), statistics, warnings
+
+
+def _fk_entries(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Group PRAGMA foreign_key_list rows (id, from, to) into inspect_schema-style FKs."""
+    grouped: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    for row in rows:
+        fk_id, column, referred = row["columns"]
+        entry = grouped.setdefault(
+            (row["table"], fk_id),
+            {
+                "table": row["table"],
+                "constrained_columns": [],
+                "referred_table": row["referred_table"],
+                "referred_columns": [],
+            },
+        )
+        entry["constrained_columns"].append(column)
+        entry["referred_columns"].append(referred)
+    return list(grouped.values())
+
+
+def _clone_tables(clone: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Minimal table entries (PK and indexes) for find_missing_fk_indexes."""
+    tables: List[Dict[str, Any]] = []
+    names = [row[0] for row in clone.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    for name in names:
+        info = sorted(clone.execute(f"PRAGMA table_info({_quote(name)})"), key=lambda row: row[5])
+        pk = [row[1] for row in info if row[5]]
+        indexes = []
+        for row in clone.execute(f"PRAGMA index_list({_quote(name)})"):
+            columns = [col[2] for col in clone.execute(f"PRAGMA index_info({_quote(row[1])})")]
+            indexes.append({"name": row[1], "columns": columns, "unique": bool(row[2])})
+        tables.append({"table": name, "primary_key": pk, "indexes": indexes})
+    return tables
+
+
+def _candidate_name(table: str, columns: List[str]) -> str:
+    return "whatif_" + re.sub(r"\W+", "_", "_".join([table] + columns)).strip("_").lower()
+
+
+def _table_accesses(tree: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {key: node[key] for key in ("table", "alias", "access", "index", "detail")}
+        for node in walk_plan(tree)
+        if node["table"]
+    ]
+
+
+def _keyed_accesses(accesses: List[Dict[str, Any]]) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
+    """
+    Accesses keyed by (table, alias, occurrence), so plans can be compared
+    after the planner reorders a join; occurrence separates repeated scans of
+    one table and alias (e.g. in subqueries).
+    """
+    keyed: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    seen: Dict[Tuple[Any, Any], int] = {}
+    for access in accesses:
+        name = (access["table"], access["alias"])
+        seen[name] = seen.get(name, 0) + 1
+        keyed[name + (seen[name],)] = access
+    return keyed
+
+
+def simulate_indexes(
+    connection_url: str,
+    workload: List[str],
+    candidate_indexes: Optional[List[Dict[str, Any]]] = None,
+    sample_rows: int = 0,
+    timeout_s: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Clone the schema into memory, EXPLAIN each workload query, add the candidate
+    indexes (default: the missing FK indexes) and EXPLAIN again. Reports which
+    table accesses change from SCAN to SEARCH and which candidates were used.
+    """
+    statements: List[str] = []
+    for sql in workload or []:
+        statement = single_statement(sql or "")
+        if not statement:
+            return {"error": f"Workload entries must be single statements: {sql!r}"}
+        statements.append(statement)
+    if not statements:
+        return {"error": "Provide at least one workload query."}
+
+    sample_rows = max(0, min(int(sample_rows or 0), MAX_SAMPLE_ROWS))
+    deadline = Deadline(timeout_s)
+    try:
+        clone, fks, statistics, warnings = _clone_source(connection_url, sample_rows, deadline)
+    except (ValueError, sqlite3.Error) as exc:
+        return {"error": str(exc)}
+    except SQLAlchemyError as exc:
+        if deadline.expired():
+            return {"error": f"Cloning did not finish within timeout_s={deadline.timeout_s}", "partial": True}
+        return {"error": str(exc)}
+
+    try:
+        if candidate_indexes is None:
+            candidate_indexes = find_missing_fk_indexes(_clone_tables(clone), fks)["missing"]
+
+        def explain_all() -> List[Any]:
+            plans: List[Any] = []
+            for statement in statements:
+                try:
+                    plans.append(_table_accesses(normalize_sqlite_plan(_explain_rows(clone, statement), statement)))
+                except sqlite3.Error as exc:
+                    plans.append({"error": str(exc)})
+            return plans
+
+        before = explain_all()
+
+        candidates: List[Dict[str, Any]] = []
+        for candidate in candidate_indexes:
+            table = str(candidate.get("table") or "")
+            columns = [str(col) for col in candidate.get("columns") or []]
+            name = _candidate_name(table, columns)
+            ddl = (
+                f"CREATE {'UNIQUE ' if candidate.get('unique') else ''}INDEX {_quote(name)} "
+                f"ON {_quote(table)} ({', '.join(_quote(col) for col in columns)})"
+            )
+            entry: Dict[str, Any] = {"table": table, "columns": columns, "name": name, "ddl": ddl, "used_by": []}
+            try:
+                clone.execute(ddl)
+            except sqlite3.Error as exc:
+                entry["error"] = str(exc)
+            candidates.append(entry)
+        if statistics == "sampled":
+            clone.execute("ANALYZE")
+
+        after = explain_all()
+    except sqlite3.Error as exc:
+        return {"error": str(exc)}
+    finally:
+        clone.close()
+
+    by_name = {entry["name"]: entry for entry in candidates}
+    queries: List[Dict[str, Any]] = []
+    for position, (statement, old, new) in enumerate(zip(statements, before, after)):
+        if isinstance(old, dict) or isinstance(new, dict):
+            queries.append({"sql": statement, "error": (old if isinstance(old, dict) else new)["error"]})
+            continue
+        changes = []
+        old_by_key = _keyed_accesses(old)
+        for key, new_access in _keyed_accesses(new).items():
+            old_access = old_by_key.get(key)
+            if old_access is not None and old_access["access"] in _SCANS and new_access["access"] in _SEEKS:
+                changes.append(
+                    {
+                        "table": new_access["table"],
+                        "before": old_access["detail"],
+                        "after": new_access["detail"],
+                        "index": new_access["index"],
+                    }
+                )
+        for access in new:
+            candidate = by_name.get(str(access["index"]))
+            if candidate is not None and position not in candidate["used_by"]:
+                candidate["used_by"].append(position)
+        queries.append(
+            {
+                "sql": statement,
+                "before": [access["detail"] for access in old],
+                "after": [access["detail"] for access in new],
+                "scan_to_search": changes,
+                "improved": bool(changes),
+            }
+        )
+
+    return {
+        "candidates": candidates,
+        "queries": queries,
+        "summary": {
+            "queries": len(queries),
+            "improved": sum(1 for query in queries if query.get("improved")),
+            "unused_candidates": [
+                entry["name"] for entry in candidates if not entry["used_by"] and "error" not in entry
+            ],
+        },
+        "sampled_rows_per_table": sample_rows,
+        "statistics": statistics,
+        "warnings": warnings,
+    }
@@ -1,7 +1,37 @@
 from __future__ import annotations
+import sqlite3
 import sys
 from pathlib import Path
+from typing import Callable, Optional
+
+import pytest
 
 
 SRC_ROOT = Path(__file__).resolve().parents[1] / "src"
 sys.path.insert(0, str(SRC_ROOT))
+
+SqliteSeed = Callable[[sqlite3.Connection], None]
+
+
+@pytest.fixture()
+def make_sqlite_db(tmp_path) -> Callable[..., str]:
+    """
+    Factory for SQLite test databases: make_sqlite_db(script, name, seed) runs
+    the SQL script (and seed(conn), for bulk inserts) in tmp_path/name and
+    returns its SQLAlchemy URL.
+    """
+
+    def make(script: str, name: str = "test.db", seed: Optional[SqliteSeed] = None) -> str:
+        path = tmp_path / name
+        conn = sqlite3.connect(path)
+        try:
+            conn.executescript(script)
+            if seed is not None:
+                seed(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        return f"sqlite:///{path}"
+
+    return make
+
@@ -0,0 +1,84 @@
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Dict, List
+from mcp_db_analyzer.cache import SERVER_SNAPSHOT_TTL_S, SNAPSHOT_TTL_ENV, SnapshotCache
+
+FULL = frozenset({"columns", "defaults", "indexes"})
+
+
+def _result(tag: str) -> Dict[str, Any]:
+    return {
+        "tables": [{"table": "users", "columns": [{"name": "id", "default": None}], "indexes": []}],
+        "tag": tag,
+    }
+
+
+def test_snapshot_serves_narrower_requests_by_projection() -> None:
+    cache = SnapshotCache(ttl_s=60, max_entries=4)
+    calls: List[str] = []
+
+    def collect() -> Dict[str, Any]:
+        calls.append("x")
+        return _result("first")
+
+    first, hit = cache.get_or_collect(("k",), FULL, collect)
+    assert not hit and first["tag"] == "first"
+
+    narrow, hit = cache.get_or_collect(("k",), frozenset({"columns"}), collect)
+    assert hit and calls == ["x"]
+    assert narrow["tables"][0] == {"table": "users", "columns": [{"name": "id"}]}
+
+    # A wider request than what is cached must reflect again.
+    _, hit = cache.get_or_collect(("k",), FULL | {"foreign_keys"}, collect)
+    assert not hit and calls == ["x", "x"]
+
+    assert cache.invalidate() == 1
+
+
+def test_partial_and_error_results_are_not_cached() -> None:
+    cache = SnapshotCache(ttl_s=60, max_entries=4)
+    cache.get_or_collect(("k",), FULL, lambda: {"error": "boom"})
+    cache.get_or_collect(("k",), FULL, lambda: dict(_result("p"), partial=True))
+    result, hit = cache.get_or_collect(("k",), FULL, lambda: _result("ok"))
+    assert not hit and result["tag"] == "ok"
+
+
+def test_concurrent_misses_reflect_once() -> None:
+    cache = SnapshotCache(ttl_s=60, max_entries=4)
+    calls: List[int] = []
+
+    def slow_collect() -> Dict[str, Any]:
+        calls.append(1)
+        time.sleep(0.2)
+        return _result("slow")
+
+    threads = [
+        threading.Thread(target=cache.get_or_collect, args=(("k",), FULL, slow_collect))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+
+
+def test_snapshots_are_only_reused_once_the_server_enables_them(monkeypatch) -> None:
+    monkeypatch.delenv(SNAPSHOT_TTL_ENV, raising=False)
+    cache = SnapshotCache(max_entries=4)
+    calls: List[str] = []
+
+    def collect() -> Dict[str, Any]:
+        calls.append("x")
+        return _result("fresh")
+
+    cache.get_or_collect(("k",), FULL, collect)
+    _, hit = cache.get_or_collect(("k",), FULL, collect)
+    assert not hit and calls == ["x", "x"]
+
+    # The latest reflection is kept for resources and becomes reusable once the TTL allows.
+    assert cache.lookup(("k",), FULL) is None and len(cache.snapshots()) == 1
+    cache.configure(SERVER_SNAPSHOT_TTL_S)
+    _, hit = cache.get_or_collect(("k",), FULL, collect)
+    assert hit and calls == ["x", "x"]
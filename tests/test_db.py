@@ -65,3 +65,109 @@ def test_collect_schema_exclude_tables(sqlite_db_url: str) -> None:
     table_map = _table_map(result)
     assert "users" not in table_map
     assert "orders" in table_map
+
+
+def test_collect_all_schemas_merges_attached_schemas(sqlite_db_url: str, tmp_path, monkeypatch) -> None:
+    from sqlalchemy import create_engine, event
+    from mcp_db_analyzer import db
+
+    tenant_path = tmp_path / "tenant.db"
+    conn = sqlite3.connect(tenant_path)
+    conn.executescript(
+        """
+        CREATE TABLE accounts (id INTEGER PRIMARY KEY);
+        CREATE TABLE invoices (
+            id INTEGER PRIMARY KEY,
+            account_id INTEGER REFERENCES accounts(id)
+        );
+        """
+    )
+    conn.close()
+
+    def open_engine_with_tenant(connection_url: str):
+        engine = create_engine(connection_url)
+
+        @event.listens_for(engine, "connect")
+        def _attach(dbapi_conn, _record) -> None:
+            dbapi_conn.execute(f"ATTACH DATABASE '{tenant_path}' AS tenant")
+
+        return engine
+
+    monkeypatch.setattr(db, "open_engine", open_engine_with_tenant)
+
+    result = db.collect_all_schemas(sqlite_db_url, max_workers=2)
+    assert result.get("error") is None
+    assert result["schemas"] == ["main", "tenant"]
+    assert set(_table_map(result)) == {
+        "main.users",
+        "main.orders",
+        "tenant.accounts",
+        "tenant.invoices",
+    }
+    fk_pairs = {(fk["table"], fk["referred_table"]) for fk in result["foreign_keys"]}
+    assert fk_pairs == {("main.orders", "main.users"), ("tenant.invoices", "tenant.accounts")}
+    assert [timing["schema"] for timing in result["timings"]] == ["main", "tenant"]
+    assert all(timing["elapsed_ms"] >= 0 for timing in result["timings"])
+
+
+def test_filter_foreign_keys_keeps_cross_schema_targets() -> None:
+    from mcp_db_analyzer.db import _filter_foreign_keys
+
+    fk = {"table": "tenant.orders", "referred_table": "public.users"}
+    candidates = [("public", "users", fk), ("billing", "plans", {"table": "tenant.orders"})]
+    kept = _filter_foreign_keys(candidates, {"public.users", "tenant.orders"}, set())
+    assert kept == [fk]
+
+
+def test_collect_schema_deadline_returns_partial_result(sqlite_db_url: str, monkeypatch) -> None:
+    import time
+    from sqlalchemy.engine.reflection import Inspector
+
+    original_get_columns = Inspector.get_columns
+
+    def slow_get_columns(self, table_name, schema=None, **kw):
+        time.sleep(0.3)
+        return original_get_columns(self, table_name, schema=schema, **kw)
+
+    monkeypatch.setattr(Inspector, "get_columns", slow_get_columns)
+
+    result = collect_schema(sqlite_db_url, timeout_s=0.2)
+    assert result.get("error") is None
+    assert result["partial"] is True
+    assert [t["table"] for t in result["tables"]] == ["orders"]
+    assert result["skipped_tables"] == ["users"]
+
+
+def test_collect_schema_deadline_on_locked_database(sqlite_db_url: str) -> None:
+    import time
+
+    db_path = sqlite_db_url[len("sqlite:///"):]
+    locker = sqlite3.connect(db_path)
+    locker.execute("BEGIN EXCLUSIVE")
+    try:
+        started = time.monotonic()
+        result = collect_schema(sqlite_db_url, timeout_s=0.3)
+        assert time.monotonic() - started < 2
+    finally:
+        locker.rollback()
+        locker.close()
+
+    assert result.get("error") is None
+    assert result["partial"] is True
+    assert result["tables"] == []
+
+
+def test_collect_schema_fields_skip_reflection(sqlite_db_url: str, monkeypatch) -> None:
+    from sqlalchemy.engine.reflection import Inspector
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("should not be reflected")
+
+    monkeypatch.setattr(Inspector, "get_indexes", fail)
+    monkeypatch.setattr(Inspector, "get_unique_constraints", fail)
+
+    result = collect_schema(sqlite_db_url, fields=frozenset({"columns", "foreign_keys"}))
+    orders = _table_map(result)["orders"]
+    assert set(orders) == {"table", "columns", "row_count"}
+    assert "default" not in orders["columns"][0]
+    assert len(result["foreign_keys"]) == 1
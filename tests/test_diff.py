@@ -0,0 +1,103 @@
+from __future__ import annotations
+import copy
+from typing import Any, Dict
+from mcp_db_analyzer.diff import diff_schemas
+from mcp_db_analyzer.digest import schema_digest, table_digests
+from mcp_db_analyzer.formats import project_fields
+from mcp_db_analyzer.tools.diff_tools import _resolve_side
+
+
+def _snapshot() -> Dict[str, Any]:
+    return {
+        "tables": [
+            {
+                "table": "users",
+                "columns": [
+                    {"name": "id", "type": "INTEGER", "nullable": False, "default": None},
+                    {"name": "name", "type": "TEXT", "nullable": False, "default": None},
+                ],
+                "primary_key": ["id"],
+                "indexes": [],
+                "unique_constraints": [],
+                "row_count": 10,
+            },
+            {
+                "table": "orders",
+                "columns": [
+                    {"name": "id", "type": "INTEGER", "nullable": False, "default": None},
+                    {"name": "user_id", "type": "INTEGER", "nullable": False, "default": None},
+                ],
+                "primary_key": ["id"],
+                "indexes": [],
+                "unique_constraints": [],
+                "row_count": 3,
+            },
+        ],
+        "foreign_keys": [
+            {
+                "table": "orders",
+                "constrained_columns": ["user_id"],
+                "referred_table": "users",
+                "referred_columns": ["id"],
+            }
+        ],
+        "views": [],
+    }
+
+
+def test_digests_ignore_row_counts_and_table_order() -> None:
+    left = _snapshot()
+    right = copy.deepcopy(left)
+    right["tables"].reverse()
+    right["tables"][0]["row_count"] = 999
+
+    assert table_digests(left) == table_digests(right)
+    assert schema_digest(left) == schema_digest(right)
+
+    result = diff_schemas(left, right)
+    assert result["identical"] is True
+    assert result["unchanged_tables_count"] == 2
+
+
+def test_diff_reports_only_changed_tables() -> None:
+    left = _snapshot()
+    right = copy.deepcopy(left)
+    users = right["tables"][0]
+    users["columns"][1]["type"] = "VARCHAR(100)"
+    users["columns"].append({"name": "email", "type": "TEXT", "nullable": True, "default": None})
+    users["indexes"].append({"name": "ix_users_email", "columns": ["email"], "unique": True})
+    right["tables"].append({"table": "audit", "columns": [], "primary_key": []})
+    right["foreign_keys"] = []
+
+    result = diff_schemas(left, right)
+
+    assert result["identical"] is False
+    assert result["added_tables"] == ["audit"]
+    assert result["removed_tables"] == []
+    assert result["unchanged_tables_count"] == 0
+    altered = {t["table"]: t for t in result["altered_tables"]}
+    assert set(altered) == {"users", "orders"}
+    assert altered["users"]["added_columns"] == ["email"]
+    assert altered["users"]["altered_columns"] == [
+        {"column": "name", "changes": {"type": {"before": "TEXT", "after": "VARCHAR(100)"}}}
+    ]
+    assert [idx["name"] for idx in altered["users"]["indexes"]["added"]] == ["ix_users_email"]
+    assert altered["orders"]["foreign_keys"]["removed"][0]["referred_table"] == "users"
+
+
+def test_projected_snapshot_is_compared_only_on_its_parts() -> None:
+    live = _snapshot()
+    live["tables"][0]["indexes"].append({"name": "ix_users_name", "columns": ["name"], "unique": False})
+    live["tables"][0]["columns"][1]["default"] = "'x'"
+    snapshot = project_fields(_snapshot(), frozenset({"columns", "primary_key", "foreign_keys"}))
+
+    result = diff_schemas(snapshot, live)
+
+    assert result["identical"] is True
+    assert result["not_compared"] == ["defaults", "indexes", "unique_constraints"]
+    assert diff_schemas(_snapshot(), live)["not_compared"] == []
+
+
+def test_compact_snapshot_is_rejected() -> None:
+    assert "format" in _resolve_side("left", None, {"format": "compact", "tables": []})
+    assert _resolve_side("left", None, _snapshot()) is None
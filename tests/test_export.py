@@ -0,0 +1,57 @@
+from __future__ import annotations
+import importlib.util
+import pytest
+from mcp_db_analyzer.export import EXPORT_DIR_ENV, export_schema_catalog, resolve_output_dir
+
+
+SCHEMA = """
+CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE orders (
+    id INTEGER PRIMARY KEY,
+    customer_id INTEGER REFERENCES customers(id),
+    status TEXT DEFAULT 'new'
+);
+CREATE INDEX ix_orders_customer_id ON orders (customer_id);
+CREATE VIEW open_orders AS SELECT * FROM orders WHERE status = 'new';
+"""
+
+
+def test_export_rejects_unknown_format_and_missing_pyarrow(make_sqlite_db) -> None:
+    url = make_sqlite_db(SCHEMA)
+    assert "Unknown format" in export_schema_catalog(url, "out", format="csv")["error"]
+    if importlib.util.find_spec("pyarrow") is None:
+        assert "pyarrow is required" in export_schema_catalog(url, "out")["error"]
+
+
+def test_output_dir_must_stay_inside_the_export_root(tmp_path, monkeypatch) -> None:
+    monkeypatch.delenv(EXPORT_DIR_ENV, raising=False)
+    with pytest.raises(ValueError, match="disabled"):
+        resolve_output_dir("out")
+
+    monkeypatch.setenv(EXPORT_DIR_ENV, str(tmp_path))
+    assert resolve_output_dir("fleet/shard1") == str(tmp_path.resolve() / "fleet" / "shard1")
+    for escape in ("../elsewhere", "/etc", "fleet/../../elsewhere"):
+        with pytest.raises(ValueError, match="inside"):
+            resolve_output_dir(escape)
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_export_writes_one_dictionary_encoded_file_per_entity(tmp_path, monkeypatch, make_sqlite_db, format) -> None:
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+
+    monkeypatch.setenv(EXPORT_DIR_ENV, str(tmp_path))
+    url = make_sqlite_db(SCHEMA)
+    result = export_schema_catalog(url, "out", format=format, batch_rows=2)
+
+    assert result["rows"] == {"tables": 3, "columns": 5, "foreign_keys": 1, "indexes": 1}
+    assert result["tables_exported"] == 2 and result["views_exported"] == 1
+    read = pq.read_table if format == "parquet" else (lambda path: pa.ipc.open_stream(path).read_all())
+    columns = read(result["files"]["columns"])
+    assert pa.types.is_dictionary(columns.schema.field("type").type)
+    rows = {(row["table"], row["name"]): row for row in columns.to_pylist()}
+    assert rows[("orders", "customer_id")]["position"] == 2
+    assert rows[("customers", "id")]["primary_key"] is True
+    fks = read(result["files"]["foreign_keys"]).to_pylist()
+    assert fks[0]["referred_table"] == "customers" and fks[0]["constrained_columns"] == ["customer_id"]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+import threading
+import time
+from typing import List
+from mcp_db_analyzer import fleet
+from mcp_db_analyzer.fleet import analyze_fleet
+
+
+SHARD = """
+CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE orders (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id)
+);
+"""
+
+
+def test_fleet_dedupes_identical_shards_and_reports_drift(make_sqlite_db) -> None:
+    urls: List[str] = [
+        make_sqlite_db(SHARD, "shard1.db"),
+        make_sqlite_db(SHARD, "shard2.db"),
+        make_sqlite_db(SHARD + "ALTER TABLE users ADD COLUMN email TEXT;", "shard3.db"),
+        "nosuchdialect://nowhere",
+    ]
+
+    result = analyze_fleet(urls, max_concurrency=2, timeout_s=30)
+
+    assert [t["status"] for t in result["targets"]] == ["ok", "ok", "ok", "error"]
+    assert len(result["distinct_schemas"]) == 2
+    baseline = result["distinct_schemas"][0]
+    assert baseline["digest"] == result["baseline_digest"]
+    assert len(baseline["targets"]) == 2
+    assert "insights" in baseline and baseline["mermaid"].startswith("erDiagram")
+    assert result["drifted"] == [urls[2]]
+    assert result["failed"] == [urls[3]]
+
+
+def test_fleet_times_out_slow_targets_without_blocking_others(monkeypatch) -> None:
+    def fake_collect_schema(connection_url: str, **_kwargs):
+        if "slow" in connection_url:
+            time.sleep(2)
+        return {"tables": [{"table": "t", "columns": []}], "foreign_keys": [], "views": []}
+
+    monkeypatch.setattr(fleet, "collect_schema", fake_collect_schema)
+    monkeypatch.setattr(fleet, "_ABANDON_GRACE_S", 0.1)
+
+    started = time.monotonic()
+    result = analyze_fleet(
+        ["sqlite:///slow.db", "sqlite:///fast1.db", "sqlite:///fast2.db"],
+        max_concurrency=2,
+        timeout_s=0.2,
+        include_diagrams=False,
+    )
+
+    assert time.monotonic() - started < 1.5
+    assert [t["status"] for t in result["targets"]] == ["timeout", "ok", "ok"]
+    assert len(result["distinct_schemas"]) == 1
+
+
+def test_fleet_abandoned_targets_keep_their_slot(monkeypatch) -> None:
+    lock = threading.Lock()
+    active = [0, 0]  # current, peak
+
+    def fake_collect_schema(connection_url: str, **_kwargs):
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        try:
+            time.sleep(0.45 if "slow" in connection_url else 5 if "stuck" in connection_url else 0)
+        finally:
+            with lock:
+                active[0] -= 1
+        return {"tables": [{"table": "t", "columns": []}], "foreign_keys": [], "views": []}
+
+    monkeypatch.setattr(fleet, "collect_schema", fake_collect_schema)
+    monkeypatch.setattr(fleet, "_ABANDON_GRACE_S", 0.1)
+
+    result = analyze_fleet(
+        ["sqlite:///slow.db", "sqlite:///fast.db"], max_concurrency=1, timeout_s=0.2, include_diagrams=False
+    )
+    assert [t["status"] for t in result["targets"]] == ["timeout", "ok"]
+    assert active[1] == 1
+
+    result = analyze_fleet(
+        ["sqlite:///stuck.db", "sqlite:///fast.db"], max_concurrency=1, timeout_s=0.2, include_diagrams=False
+    )
+    assert [t["status"] for t in result["targets"]] == ["timeout", "timeout"]
+    assert result["targets"][1]["error"].startswith("not started")
@@ -0,0 +1,73 @@
+from __future__ import annotations
+from mcp_db_analyzer.formats import project_fields, to_compact
+
+
+def _result() -> dict:
+    return {
+        "schema": None,
+        "tables": [
+            {
+                "table": "users",
+                "columns": [
+                    {"name": "id", "type": "INTEGER", "nullable": False, "default": None},
+                    {"name": "name", "type": "TEXT", "nullable": True, "default": "'x'"},
+                ],
+                "primary_key": ["id"],
+                "indexes": [{"name": "ix_name", "columns": ["name"], "unique": False}],
+                "unique_constraints": [],
+                "row_count": None,
+            },
+            {
+                "table": "orders",
+                "columns": [
+                    {"name": "id", "type": "INTEGER", "nullable": False, "default": None},
+                    {"name": "user_id", "type": "INTEGER", "nullable": False, "default": None},
+                ],
+                "primary_key": ["id"],
+                "indexes": [],
+                "unique_constraints": [],
+                "row_count": 3,
+            },
+        ],
+        "foreign_keys": [
+            {
+                "table": "orders",
+                "constrained_columns": ["user_id"],
+                "referred_table": "users",
+                "referred_columns": ["id"],
+            }
+        ],
+        "views": [],
+    }
+
+
+def test_to_compact_uses_parallel_arrays_and_type_dictionary() -> None:
+    compact = to_compact(_result())
+
+    assert compact["format"] == "compact"
+    assert compact["types"] == ["INTEGER", "TEXT"]
+    users, orders = compact["tables"]
+    assert users["columns"] == {
+        "name": ["id", "name"],
+        "type": [0, 1],
+        "nullable": [False, True],
+        "default": [None, "'x'"],
+    }
+    assert users["indexes"] == {"name": ["ix_name"], "columns": [["name"]], "unique": [False]}
+    assert "row_count" not in users
+    assert orders["columns"]["type"] == [0, 0]
+    assert orders["row_count"] == 3
+    assert compact["foreign_keys"]["referred_table"] == ["users"]
+
+
+def test_project_fields_drops_unrequested_parts() -> None:
+    projected = project_fields(_result(), frozenset({"columns", "primary_key"}))
+
+    users = projected["tables"][0]
+    assert set(users) == {"table", "columns", "primary_key", "row_count"}
+    assert users["columns"][1] == {"name": "name", "type": "TEXT", "nullable": True}
+    assert "foreign_keys" not in projected
+
+    compact = to_compact(projected)
+    assert "default" not in compact["tables"][0]["columns"]
+    assert "foreign_keys" not in compact
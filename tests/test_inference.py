@@ -0,0 +1,90 @@
+from __future__ import annotations
+import sqlite3
+import time
+from mcp_db_analyzer.cache import SnapshotCache
+from mcp_db_analyzer.deadline import Deadline
+from mcp_db_analyzer.graph import build_dot
+from mcp_db_analyzer.inference import infer_foreign_keys, propose_fk_candidates
+from mcp_db_analyzer.sketches import BloomFilter
+
+
+LEGACY = """
+CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE products (sku TEXT PRIMARY KEY);
+CREATE TABLE orders (id INTEGER PRIMARY KEY, customer_id INTEGER, sku TEXT);
+CREATE TABLE refunds (id INTEGER PRIMARY KEY, customer_id INTEGER);
+"""
+
+
+def _seed_legacy(conn: sqlite3.Connection) -> None:
+    conn.executemany("INSERT INTO customers (id, name) VALUES (?, ?)", [(i, f"c{i}") for i in range(1, 101)])
+    conn.executemany("INSERT INTO products (sku) VALUES (?)", [(f"sku{i}",) for i in range(20)])
+    conn.executemany(
+        "INSERT INTO orders (customer_id, sku) VALUES (?, ?)",
+        [(1 + i % 100, f"sku{i % 20}") for i in range(500)],
+    )
+    # Looks like a foreign key by name, but most values have no parent row.
+    conn.executemany("INSERT INTO refunds (customer_id) VALUES (?)", [(1000 + i,) for i in range(50)])
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(1_000)
+    for value in range(1_000):
+        bloom.add(value)
+
+    assert all(value in bloom for value in range(1_000))
+    assert sum(value in bloom for value in range(1_000, 11_000)) < 300
+
+
+def test_candidates_follow_names_types_and_skip_declared_fks() -> None:
+    tables = [
+        {"table": "users", "primary_key": ["id"], "columns": [{"name": "id", "type": "INTEGER"}]},
+        {
+            "table": "posts",
+            "primary_key": ["id"],
+            "columns": [
+                {"name": "id", "type": "INTEGER"},
+                {"name": "user_id", "type": "BIGINT"},
+                {"name": "editor_user_id", "type": "INTEGER"},
+                {"name": "userid", "type": "VARCHAR(10)"},
+            ],
+        },
+    ]
+    fks = [{"table": "posts", "constrained_columns": ["editor_user_id"], "referred_table": "users"}]
+
+    candidates = propose_fk_candidates(tables, fks)
+
+    assert [(c["column"], c["referred_table"], c["match"]) for c in candidates] == [("user_id", "users", "name_pattern")]
+
+
+def test_infer_foreign_keys_verifies_containment(make_sqlite_db) -> None:
+    url = make_sqlite_db(LEGACY, "legacy.db", _seed_legacy)
+
+    result = infer_foreign_keys(url, cache=SnapshotCache(ttl_s=60, max_entries=8))
+
+    inferred = {(e["table"], e["constrained_columns"][0], e["referred_table"]) for e in result["inferred"]}
+    assert inferred == {("orders", "customer_id", "customers"), ("orders", "sku", "products")}
+    assert all(e["containment"] == 1.0 and e["inferred"] for e in result["inferred"])
+    assert [(e["table"], e["containment"]) for e in result["rejected"]] == [("refunds", 0.0)]
+
+    dot = build_dot([{"table": "orders"}, {"table": "customers"}], result["inferred"])
+    assert '"orders" -> "customers" [label="customer_id -> id", style=dashed];' in dot
+
+
+def test_candidates_scale_to_large_schemas_and_stop_at_the_deadline() -> None:
+    tables = [
+        {
+            "table": f"t{i}",
+            "primary_key": ["id"],
+            "columns": [{"name": "id", "type": "INTEGER"}]
+            + [{"name": f"t{(i * 7 + j) % 2000}_id", "type": "INTEGER"} for j in range(9)],
+        }
+        for i in range(2000)
+    ]
+
+    started = time.monotonic()
+    candidates = propose_fk_candidates(tables, [])
+    assert time.monotonic() - started < 2
+    assert len(candidates) == 2000 * 9
+
+    assert propose_fk_candidates(tables, [], Deadline(0.000001)) == []
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from mcp_db_analyzer.insights import build_insights
+from mcp_db_analyzer.insights import build_insights, find_similar_tables
 
 
 def test_build_insights_detects_orphan_and_missing_index() -> None:
@@ -118,3 +118,74 @@ def test_build_insights_detects_likely_many_to_many() -> None:
             "extra_columns": ["created_at", "status"],
         }
     ]
+
+
+def test_find_redundant_indexes_uses_prefix_trie() -> None:
+    from mcp_db_analyzer.insights import find_redundant_indexes
+
+    tables = [
+        {
+            "table": "orders",
+            "primary_key": ["id"],
+            "indexes": [
+                {"name": "ix_user", "columns": ["user_id"], "unique": False},
+                {"name": "ix_user_created", "columns": ["user_id", "created_at"], "unique": False},
+                {"name": "ix_user_created_2", "columns": ["USER_ID", "created_at"], "unique": False},
+                {"name": "ux_code", "columns": ["code"], "unique": True},
+                {"name": "ux_code_region", "columns": ["code", "region"], "unique": True},
+            ],
+            "unique_constraints": [{"name": "uq_id", "columns": ["id"]}],
+        },
+        {
+            "table": "memberships",
+            "primary_key": ["group_id", "user_id"],
+            "indexes": [],
+            "unique_constraints": [{"name": "uq_user_group", "columns": ["user_id", "group_id"]}],
+        },
+    ]
+
+    findings = find_redundant_indexes(tables)
+
+    assert findings["duplicates"] == [
+        {
+            "table": "orders",
+            "columns": ["user_id", "created_at"],
+            "keep": "ix_user_created",
+            "duplicates": ["ix_user_created_2"],
+        }
+    ]
+    assert [(f["index"], f["covered_by"]) for f in findings["prefix_redundant"]] == [("ix_user", "ix_user_created")]
+    assert [(f["table"], f["name"]) for f in findings["shadowed_by_pk"]] == [
+        ("orders", "uq_id"),
+        ("memberships", "uq_user_group"),
+    ]
+
+
+def _copy_of(name: str, extra: int = 0) -> dict:
+    columns = [{"name": f"col_{i}", "type": "INTEGER"} for i in range(10)]
+    columns += [{"name": f"extra_{i}", "type": "TEXT"} for i in range(extra)]
+    return {"table": name, "columns": columns, "primary_key": ["id"]}
+
+
+def test_find_similar_tables_clusters_copies_with_minhash() -> None:
+    tables = [
+        _copy_of("orders_2021"),
+        _copy_of("orders_2022"),
+        _copy_of("orders_2023"),
+        _copy_of("invoices"),
+        _copy_of("invoices_backup", extra=1),
+        {"table": "users", "columns": [{"name": c, "type": "TEXT"} for c in ("id", "email", "name")]},
+    ]
+
+    similar = find_similar_tables(tables)
+
+    clusters = {tuple(c["tables"]): c["suggestion"] for c in similar["clusters"]}
+    assert clusters[("invoices", "invoices_backup", "orders_2021", "orders_2022", "orders_2023")] == "merge"
+    pair = next(p for p in similar["pairs"] if p["tables"] == ["invoices", "invoices_backup"])
+    assert pair["jaccard"] == round(10 / 11, 3) and not pair["identical"]
+    assert "users" not in {t for c in similar["clusters"] for t in c["tables"]}
+
+    partitions = find_similar_tables(tables[:3])["clusters"]
+    assert [(c["tables"], c["suggestion"]) for c in partitions] == [
+        (["orders_2021", "orders_2022", "orders_2023"], "partition")
+    ]
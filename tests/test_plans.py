@@ -0,0 +1,85 @@
+from __future__ import annotations
+import sqlite3
+from mcp_db_analyzer.plans import (
+    analyze_query,
+    find_plan_flags,
+    normalize_mysql_plan,
+    normalize_postgresql_plan,
+    single_statement,
+)
+
+
+SHOP = """
+CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, name TEXT);
+CREATE INDEX ix_users_name ON users (name);
+CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER REFERENCES users(id), total INTEGER);
+"""
+
+
+def test_sqlite_plan_flags_scans_and_unindexed_joins(make_sqlite_db) -> None:
+    url = make_sqlite_db(SHOP)
+
+    result = analyze_query(url, "SELECT * FROM users u, orders o WHERE o.total = u.name ORDER BY u.email")
+
+    assert result["plan"][0]["op"] == "Nested Loop"
+    flags = {flag["kind"]: flag for flag in result["flags"]}
+    join = flags["nested_loop_unindexed"]
+    assert join["table"] == "orders" and join["unindexed_columns"] == ["total"]
+    assert join["suggested_indexes"] == [{"table": "orders", "columns": ["total"]}]
+    assert flags["full_scan"]["indexed_columns"] == ["name"]
+    assert "temp_btree" in flags
+
+    qualified = analyze_query(url, "SELECT * FROM orders WHERE total > 5", schema="main")
+    assert qualified["flags"][0]["suggested_indexes"] == [{"table": "orders", "columns": ["total"]}]
+
+    indexed = analyze_query(url, "SELECT * FROM users WHERE name = :name", params={"name": "a"})
+    assert indexed["flags"] == []
+
+
+def test_analyze_query_rejects_multiple_statements_and_never_writes(make_sqlite_db) -> None:
+    url = make_sqlite_db(SHOP)
+    assert single_statement("SELECT ';' FROM users; -- trailing") == "SELECT ';' FROM users"
+    assert single_statement("SELECT 1; DROP TABLE users") is None
+    assert "error" in analyze_query(url, "DELETE FROM users; DROP TABLE users")
+
+    analyze_query(url, "DELETE FROM users")
+    conn = sqlite3.connect(url[len("sqlite:///"):])
+    assert conn.execute("SELECT count(*) FROM sqlite_master WHERE name = 'users'").fetchone() == (1,)
+    conn.close()
+
+
+def test_postgres_and_mysql_plans_normalize_to_same_flags() -> None:
+    pg_plan = [
+        {
+            "Plan": {
+                "Node Type": "Nested Loop",
+                "Plans": [
+                    {"Node Type": "Index Scan", "Relation Name": "users", "Alias": "u",
+                     "Index Name": "users_pkey", "Index Cond": "(id = 1)"},
+                    {"Node Type": "Seq Scan", "Relation Name": "orders", "Alias": "o",
+                     "Filter": "(o.user_id = u.id)"},
+                ],
+            }
+        }
+    ]
+    mysql_plan = {
+        "query_block": {
+            "ordering_operation": {
+                "using_filesort": True,
+                "nested_loop": [
+                    {"table": {"table_name": "users", "access_type": "const", "key": "PRIMARY"}},
+                    {"table": {"table_name": "orders", "access_type": "ALL",
+                               "attached_condition": "(`db`.`orders`.`user_id` = 1)"}},
+                ],
+            }
+        }
+    }
+
+    pg_flags = find_plan_flags(normalize_postgresql_plan(pg_plan))
+    assert [(f["kind"], f["node"]["table"]) for f in pg_flags] == [("nested_loop_unindexed", "orders")]
+
+    mysql_flags = find_plan_flags(normalize_mysql_plan(mysql_plan))
+    assert [(f["kind"], f["node"]["table"]) for f in mysql_flags] == [
+        ("nested_loop_unindexed", "orders"),
+        ("temp_btree", None),
+    ]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+import sqlite3
+from mcp_db_analyzer.sampling import collect_column_stats, sample_table_rows
+from mcp_db_analyzer.sketches import HyperLogLog
+
+
+def _events_db(make_sqlite_db, rows: int) -> str:
+    def seed(conn: sqlite3.Connection) -> None:
+        conn.executemany(
+            "INSERT INTO events (kind, note) VALUES (?, ?)",
+            [(f"kind{i % 3}", None if i % 2 else "x") for i in range(rows)],
+        )
+
+    return make_sqlite_db("CREATE TABLE events (id INTEGER PRIMARY KEY, kind TEXT, note TEXT);", "events.db", seed)
+
+
+def test_hyperloglog_estimate_is_close() -> None:
+    sketch = HyperLogLog()
+    sketch.add_many(range(50_000))
+    sketch.add_many(range(10_000))  # repeats do not count
+
+    assert abs(sketch.estimate() - 50_000) / 50_000 < 0.05
+
+
+def test_column_stats_reads_small_tables_in_full(make_sqlite_db) -> None:
+    result = collect_column_stats(_events_db(make_sqlite_db, 300), "events")
+
+    assert result["method"] == "full" and result["sampled_rows"] == 300
+    columns = {c["column"]: c for c in result["columns"]}
+    assert columns["id"]["distinct_estimate"] == 300 and columns["id"]["top_values"] == []
+    assert columns["kind"]["distinct_estimate"] == 3
+    assert columns["kind"]["top_values"][0] == {"value": "kind0", "count": 100}
+    assert columns["note"]["null_fraction"] == 0.5
+
+
+def test_column_stats_samples_rowid_ranges_within_budget(make_sqlite_db) -> None:
+    url = _events_db(make_sqlite_db, 5_000)
+
+    result = collect_column_stats(url, "events", columns=["kind"], max_rows=1_000)
+
+    assert result["method"] == "rowid_ranges" and result["rows_estimate"] == 5_000
+    assert result["sampled_rows"] == 1_000 and not result["truncated"]
+    assert [c["column"] for c in result["columns"]] == ["kind"]
+    assert "error" in collect_column_stats(url, "events", columns=["missing"])
+
+
+def test_sample_table_rows_truncates_values_and_respects_byte_cap(make_sqlite_db) -> None:
+    url = make_sqlite_db(
+        'CREATE TABLE "odd name" (id INTEGER PRIMARY KEY, body TEXT, data BLOB);',
+        "blobs.db",
+        lambda conn: conn.executemany(
+            'INSERT INTO "odd name" (body, data) VALUES (?, ?)',
+            [("y" * 5_000, bytes(range(256)) * 4) for _ in range(50)],
+        ),
+    )
+
+    result = sample_table_rows(url, ["odd name", "missing"], rows_per_table=5, max_value_chars=32)
+
+    sample, missing = result["samples"]
+    assert sample["columns"] == ["id", "body", "data"] and len(sample["rows"]) == 5
+    _, body, data = sample["rows"][0]
+    assert body == "y" * 32 + "..." and data == "0x" + bytes(range(16)).hex() + "..."
+    assert sample["truncated_values"] == 10
+    assert "error" in missing
+
+    capped = sample_table_rows(url, ["odd name", "odd name"], rows_per_table=50, max_bytes=2_048)
+    first, second = capped["samples"]
+    assert first["stopped"] == "max_bytes" and capped["bytes"] <= 2_048
+    assert second["rows"] == [] and second["stopped"] == "max_bytes"
+
+
+def test_sample_table_rows_reports_unreachable_database(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path / 'missing' / 'nowhere.db'}"
+    assert "error" in sample_table_rows(url, ["events"])
+    assert "error" in collect_column_stats(url, "events")
@@ -0,0 +1,35 @@
+from __future__ import annotations
+import threading
+import time
+import anyio
+from mcp_db_analyzer.scheduling import FairShareScheduler
+
+
+def test_scheduler_runs_off_loop_and_enforces_per_client_limit() -> None:
+    scheduler = FairShareScheduler(workers=4, per_client=2)
+    loop_thread = threading.get_ident()
+    active = 0
+    peak = 0
+    threads = set()
+    lock = threading.Lock()
+
+    def work() -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+            threads.add(threading.get_ident())
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    async def main() -> None:
+        async with anyio.create_task_group() as tg:
+            for _ in range(6):
+                tg.start_soon(scheduler.run, work)
+
+    anyio.run(main)
+
+    # Outside a request every call belongs to the same ("local") client.
+    assert peak == 2
+    assert loop_thread not in threads
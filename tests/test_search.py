@@ -0,0 +1,56 @@
+from __future__ import annotations
+from mcp_db_analyzer.cache import SnapshotCache, snapshot_key
+from mcp_db_analyzer.search import SEARCH_FIELDS, SchemaIndex, search_schema, tokenize
+
+RESULT = {
+    "tables": [
+        {
+            "table": "customers",
+            "columns": [{"name": "id", "type": "INTEGER"}, {"name": "externalRef", "type": "UUID"}],
+            "indexes": [],
+        },
+        {
+            "table": "orders",
+            "columns": [{"name": "id", "type": "INTEGER"}, {"name": "customer_id", "type": "INTEGER"}],
+            "indexes": [{"name": "ix_orders_customer_id", "columns": ["customer_id"]}],
+        },
+    ]
+}
+
+
+def test_tokenize_splits_snake_camel_and_dotted_names() -> None:
+    assert tokenize("public.orderItems_v2") == ["public", "order", "items", "v2"]
+
+
+def test_index_ranks_exact_prefix_and_fuzzy_matches() -> None:
+    index = SchemaIndex.from_result(RESULT)
+
+    exact = index.search("customer_id", kinds=["column"])
+    assert [(r["table"], r["name"]) for r in exact] == [("orders", "customer_id")]
+
+    by_prefix = index.search("cust", kinds=["table"])
+    assert [r["table"] for r in by_prefix] == ["customers"]
+
+    fuzzy = index.search("custmer", kinds=["table"])
+    assert [r["table"] for r in fuzzy] == ["customers"]
+    assert index.search("custmer", kinds=["table"], fuzzy=False) == []
+
+    by_type = index.search("uuid")
+    assert by_type[0]["name"] == "externalRef" and by_type[0]["type"] == "UUID"
+
+    by_index = index.search("ix_orders", kinds=["index"])
+    assert by_index[0]["columns"] == ["customer_id"]
+
+
+def test_search_schema_builds_index_once_per_snapshot(make_sqlite_db) -> None:
+    url = make_sqlite_db("CREATE TABLE orders (id INTEGER PRIMARY KEY, customer_id INTEGER);")
+    cache = SnapshotCache(ttl_s=60, max_entries=8)
+
+    first = search_schema(url, "customer", cache=cache)
+    assert first["results"][0]["name"] == "customer_id"
+
+    snapshot = cache.lookup(snapshot_key(url, None, None, None, False), SEARCH_FIELDS)
+    index = snapshot.derived["search_index"]
+    search_schema(url, "orders", cache=cache)
+    assert snapshot.derived["search_index"] is index
+    assert "error" in search_schema(url, "x", kinds=["view"], cache=cache)
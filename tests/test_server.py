@@ -0,0 +1,22 @@
+from __future__ import annotations
+import sys
+from pathlib import Path
+from mcp.server.transport_security import TransportSecurityMiddleware
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from server import parse_args, transport_security  # noqa: E402
+
+
+def test_non_loopback_bind_keeps_host_and_origin_checks() -> None:
+    args = parse_args(["--transport", "streamable-http", "--host", "10.0.0.5", "--allowed-host", "db.internal"])
+    middleware = TransportSecurityMiddleware(transport_security(args.host, args.allowed_host))
+
+    for host in ("10.0.0.5:8000", "db.internal", "localhost:8000"):
+        assert middleware._validate_host(host)
+    assert not middleware._validate_host("attacker.example:8000")
+    assert middleware._validate_origin("http://db.internal:8000")
+    assert not middleware._validate_origin("http://attacker.example")
+
+    wildcard = TransportSecurityMiddleware(transport_security("0.0.0.0"))
+    assert wildcard._validate_host("[::1]:8000") and not wildcard._validate_host("0.0.0.0:8000")
+    assert not transport_security("0.0.0.0", disable_host_check=True).enable_dns_rebinding_protection
@@ -0,0 +1,25 @@
+from __future__ import annotations
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+from startup_importtime import run_importtime, summarize  # noqa: E402
+
+# Self time of server.py plus this package's modules. Measured ~50 ms locally;
+# the budget leaves room for slow CI machines but catches eager heavy imports.
+STARTUP_BUDGET_MS = float(os.environ.get("MCP_DB_ANALYZER_STARTUP_BUDGET_MS", "250"))
+
+
+def test_server_import_is_lazy_and_within_budget() -> None:
+    entries = run_importtime("import server")
+    names = [name for name, _, _ in entries]
+
+    assert "server" in names
+    # Heavy dependencies and DB drivers load on first tool call, not at startup.
+    assert not [n for n in names if n == "sqlalchemy" or n.startswith("sqlalchemy.")]
+    # The package must be loaded under one name only.
+    assert not [n for n in names if n == "src" or n.startswith("src.")]
+
+    own_ms = summarize(entries)["own_self_us"] / 1000
+    assert own_ms < STARTUP_BUDGET_MS, f"startup import cost {own_ms:.1f} ms over budget"
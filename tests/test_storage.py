@@ -0,0 +1,39 @@
+from __future__ import annotations
+from mcp_db_analyzer.db import collect_schema
+from mcp_db_analyzer.storage import collect_storage_stats
+
+
+SIZES = """
+CREATE TABLE small (id INTEGER PRIMARY KEY);
+CREATE TABLE big (id INTEGER PRIMARY KEY, payload TEXT);
+CREATE INDEX ix_big_payload ON big (payload);
+"""
+
+
+def _sizes_db(make_sqlite_db) -> str:
+    return make_sqlite_db(
+        SIZES,
+        "sizes.db",
+        lambda conn: conn.executemany("INSERT INTO big (payload) VALUES (?)", [("x" * 200,) for _ in range(500)]),
+    )
+
+
+def test_storage_stats_orders_tables_by_size(make_sqlite_db) -> None:
+    result = collect_storage_stats(_sizes_db(make_sqlite_db))
+
+    assert [t["table"] for t in result["tables"]] == ["big", "small"]
+    big = result["tables"][0]
+    assert big["data_bytes"] > 0 and big["indexes"][0]["name"] == "ix_big_payload"
+    assert big["total_bytes"] == big["data_bytes"] + big["index_bytes"]
+    assert result["total_bytes"] == sum(t["total_bytes"] for t in result["tables"])
+
+
+def test_collect_schema_merges_storage_only_when_requested(make_sqlite_db) -> None:
+    url = _sizes_db(make_sqlite_db)
+
+    plain = collect_schema(url)
+    assert all("storage" not in t for t in plain["tables"])
+
+    with_storage = collect_schema(url, fields=frozenset({"columns", "storage"}))
+    sizes = {t["table"]: t["storage"] for t in with_storage["tables"]}
+    assert sizes["big"]["index_bytes"] > 0
@@ -0,0 +1,112 @@
+from __future__ import annotations
+from sqlalchemy.exc import OperationalError
+from mcp_db_analyzer import views
+from mcp_db_analyzer.cache import SnapshotCache, snapshot_key
+from mcp_db_analyzer.graph import build_dot, build_mermaid_er
+from mcp_db_analyzer.views import cached_view_dependencies, table_references
+
+
+VIEWS = """
+CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE orders (id INTEGER PRIMARY KEY, customer_id INTEGER, total REAL);
+CREATE VIEW customer_totals AS
+    SELECT c.id, c.name, SUM(o.total) AS total
+    FROM customers c JOIN orders AS o ON o.customer_id = c.id
+    GROUP BY c.id, c.name;
+CREATE VIEW big_customers AS
+    -- FROM orders is only mentioned in this comment
+    WITH ranked AS (SELECT id, total FROM customer_totals)
+    SELECT id FROM ranked WHERE total > 100;
+"""
+
+
+def test_table_references_ignore_comments_ctes_and_unknown_names() -> None:
+    known = {"orders": "orders", "customers": "customers"}
+    sql = "/* FROM customers */ WITH recent AS (SELECT * FROM orders) SELECT * FROM recent, missing"
+    assert table_references(sql, known) == ["orders"]
+
+
+# pg_get_viewdef and MySQL information_schema.VIEWS text for customer_totals.
+PG_VIEWDEF = """ SELECT c.id,
+    c.name,
+    sum(o.total) AS total
+   FROM (customers c
+     JOIN orders o ON ((o.customer_id = c.id)))
+  GROUP BY c.id, c.name;"""
+MYSQL_VIEW_DEFINITION = (
+    "select `c`.`id` AS `id`,`c`.`name` AS `name`,sum(`o`.`total`) AS `total` "
+    "from (`shop`.`customers` `c` join `shop`.`orders` `o` on((`o`.`customer_id` = `c`.`id`))) "
+    "group by `c`.`id`,`c`.`name`"
+)
+
+
+def test_table_references_read_parenthesized_catalog_joins() -> None:
+    known = {"orders": "orders", "customers": "customers"}
+    assert table_references(PG_VIEWDEF, known) == ["customers", "orders"]
+    assert table_references(MYSQL_VIEW_DEFINITION, known) == ["customers", "orders"]
+    nested = "SELECT * FROM ((customers c JOIN orders o ON o.customer_id = c.id) JOIN refunds r ON r.id = o.id)"
+    assert table_references(nested, {**known, "refunds": "refunds"}) == ["customers", "orders", "refunds"]
+    assert table_references(MYSQL_VIEW_DEFINITION, known, "shop") == ["customers", "orders"]
+
+
+def test_table_references_read_commas_only_in_from_lists() -> None:
+    known = {"orders": "orders", "status": "status", "users": "users", "refunds": "refunds"}
+    assert table_references("SELECT o.id, status FROM orders o", known) == ["orders"]
+    coalesced = "SELECT * FROM orders o JOIN refunds r ON r.id = COALESCE(o.id, users) WHERE o.id IN (1, status)"
+    assert table_references(coalesced, known) == ["orders", "refunds"]
+    subquery = "SELECT * FROM (SELECT id, status FROM orders, users) t, refunds ORDER BY id, status"
+    assert table_references(subquery, known) == ["orders", "users", "refunds"]
+
+
+def test_table_references_skip_names_in_other_schemas() -> None:
+    known = {"orders": "orders", "users": "users"}
+    sql = "SELECT * FROM other.orders JOIN shop.users u ON u.id = orders.user_id"
+    assert table_references(sql, known, "shop") == ["users"]
+    assert table_references(sql, known) == ["orders", "users"]
+
+
+def test_view_dependencies_edges_and_transitive_dependents(make_sqlite_db) -> None:
+    url = make_sqlite_db(VIEWS)
+    cache = SnapshotCache(ttl_s=60, max_entries=8)
+
+    dependencies = cached_view_dependencies(url, cache=cache)
+
+    edges = {(e["view"], e["references"], e["kind"]) for e in dependencies["edges"]}
+    assert edges == {
+        ("customer_totals", "customers", "table"),
+        ("customer_totals", "orders", "table"),
+        ("big_customers", "customer_totals", "view"),
+    }
+    assert dependencies["dependents"]["orders"] == ["big_customers", "customer_totals"]
+    assert dependencies["dependents"]["customer_totals"] == ["big_customers"]
+    assert dependencies["unparsed_views"] == []
+
+    snapshot = cache.lookup(snapshot_key(url, None, None, None, False), frozenset())
+    assert snapshot.derived["view_dependencies"] is dependencies
+    assert cached_view_dependencies(url, cache=cache) is dependencies
+
+
+def test_view_edges_in_diagrams() -> None:
+    tables = [{"table": "orders", "columns": []}]
+    edges = [{"view": "order_totals", "references": "orders", "kind": "table"}]
+
+    dot = build_dot(tables, [], edges)
+    assert '"order_totals" [shape=ellipse];' in dot
+    assert '"order_totals" -> "orders" [style=dotted, label="reads"];' in dot
+
+    mermaid = build_mermaid_er(tables, [], edges)["mermaid"]
+    assert "order_totals }o..o{ orders : reads" in mermaid
+
+
+def test_failed_view_read_is_not_cached(make_sqlite_db, monkeypatch) -> None:
+    url = make_sqlite_db(VIEWS)
+    cache = SnapshotCache(ttl_s=60, max_entries=8)
+
+    def cancelled(*_args, **_kwargs):
+        raise OperationalError("SELECT ...", {}, Exception("interrupted"))
+
+    with monkeypatch.context() as patch:
+        patch.setattr(views, "build_view_dependencies", cancelled)
+        assert "interrupted" in cached_view_dependencies(url, cache=cache)["error"]
+
+    assert len(cached_view_dependencies(url, cache=cache)["edges"]) == 3
@@ -0,0 +1,30 @@
+from __future__ import annotations
+import sqlite3
+from mcp_db_analyzer.cache import SnapshotCache, cached_collect_schema, snapshot_key
+from mcp_db_analyzer.watcher import SchemaWatcher, probe_fingerprint
+
+
+def test_watcher_refreshes_changed_schema_and_confirms_unchanged(make_sqlite_db) -> None:
+    url = make_sqlite_db("CREATE TABLE users (id INTEGER PRIMARY KEY);", "watched.db")
+    conn = sqlite3.connect(url[len("sqlite:///") :])
+
+    cache = SnapshotCache(ttl_s=60, max_entries=8)
+    watcher = SchemaWatcher(cache)
+    cache.fingerprinter = watcher._fingerprint_key
+    try:
+        cached_collect_schema(url, cache=cache)
+        assert watcher.poll_once() == {"schemas": 1, "confirmed": 1, "refreshed": 0}
+
+        conn.execute("ALTER TABLE users ADD COLUMN email TEXT")
+        conn.commit()
+        assert watcher.poll_once()["refreshed"] == 1
+
+        (snapshot,) = [s for k, s in cache.snapshots() if k == snapshot_key(url, None, None, None, False)]
+        columns = [c["name"] for c in snapshot.result["tables"][0]["columns"]]
+        assert columns == ["id", "email"]
+    finally:
+        conn.close()
+
+
+def test_probe_fingerprint_unsupported_dialect_returns_none() -> None:
+    assert probe_fingerprint("nosuchdialect://nowhere", None) is None
@@ -0,0 +1,92 @@
+from __future__ import annotations
+import hashlib
+import sqlite3
+from pathlib import Path
+from mcp_db_analyzer.whatif import simulate_indexes
+
+
+APP = """
+CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT);
+CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER REFERENCES users(id), total INTEGER);
+"""
+
+
+def _app_db(make_sqlite_db) -> str:
+    return make_sqlite_db(
+        APP,
+        "app.db",
+        lambda conn: conn.executemany(
+            "INSERT INTO orders (user_id, total) VALUES (?, ?)", [(i % 20, i) for i in range(200)]
+        ),
+    )
+
+
+def test_missing_fk_index_turns_scan_into_search_without_touching_source(make_sqlite_db) -> None:
+    url = _app_db(make_sqlite_db)
+    path = Path(url[len("sqlite:///") :])
+    before = hashlib.sha256(path.read_bytes()).hexdigest()
+
+    result = simulate_indexes(
+        url,
+        ["SELECT * FROM orders WHERE user_id = ?", "SELECT * FROM orders WHERE total > :t"],
+        sample_rows=50,
+    )
+
+    (candidate,) = result["candidates"]
+    assert (candidate["table"], candidate["columns"], candidate["used_by"]) == ("orders", ["user_id"], [0])
+    first, second = result["queries"]
+    assert first["improved"] and first["scan_to_search"][0]["index"] == candidate["name"]
+    assert not second["improved"]
+    assert result["statistics"] == "sampled"
+    assert hashlib.sha256(path.read_bytes()).hexdigest() == before
+
+
+def test_explicit_candidates_and_non_sqlite_error(make_sqlite_db) -> None:
+    url = _app_db(make_sqlite_db)
+    result = simulate_indexes(
+        url,
+        ["SELECT id FROM users WHERE email = 'a@b.c'"],
+        candidate_indexes=[{"table": "users", "columns": ["email"], "unique": True}],
+    )
+    assert result["summary"] == {"queries": 1, "improved": 1, "unused_candidates": []}
+    assert result["candidates"][0]["ddl"].startswith("CREATE UNIQUE INDEX")
+
+    assert "error" in simulate_indexes("nosuchdialect://nowhere", ["SELECT 1"])
+
+
+def test_improvement_found_when_the_planner_reorders_a_join(make_sqlite_db) -> None:
+    url = _app_db(make_sqlite_db)
+    result = simulate_indexes(url, ["SELECT * FROM users u JOIN orders o ON o.user_id = u.id WHERE u.email = 'x'"])
+
+    (query,) = result["queries"]
+    assert query["before"][0].startswith("SCAN o") and query["after"][0].startswith("SCAN u")
+    assert query["improved"]
+    assert [(change["table"], change["index"]) for change in query["scan_to_search"]] == [
+        ("orders", "whatif_orders_user_id")
+    ]
+
+
+def test_clone_failure_returns_error_and_closes_the_clone(make_sqlite_db, monkeypatch) -> None:
+    url = _app_db(make_sqlite_db)
+    closed = []
+
+    class FailingClone(sqlite3.Connection):
+        def executemany(self, *_args):
+            raise sqlite3.OperationalError("database or disk is full")
+
+        def close(self) -> None:
+            closed.append(True)
+            super().close()
+
+    connect = sqlite3.connect
+
+    def connect_clone(database, *args, **kwargs):
+        if database == ":memory:":
+            kwargs["factory"] = FailingClone
+        return connect(database, *args, **kwargs)
+
+    monkeypatch.setattr(sqlite3, "connect", connect_clone)
+    result = simulate_indexes(url, ["SELECT * FROM orders WHERE user_id = 1"], sample_rows=10)
+
+    assert result == {"error": "database or disk is full"}
+    assert closed == [True]